@@ -0,0 +1,330 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
+
+RESULTS_VERSION = 1
+
+
+def measure(fn, repeat: int, warmup: int = 1, setup=None) -> dict:
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+class BenchmarkSuite:
+    def __init__(self, ev_path, env_path, geojson_path, work_dir, repeat=5, only=None):
+        self.ev_path = ev_path
+        self.env_path = env_path
+        self.geojson_path = geojson_path
+        self.work_dir = work_dir
+        self.repeat = repeat
+        self.only = only
+        self.results = {}
+
+    def wanted(self, name: str) -> bool:
+        return not self.only or any(part in name for part in self.only)
+
+    def run_case(self, name, fn, repeat=None, warmup=1, setup=None):
+        if not self.wanted(name):
+            return
+        try:
+            result = measure(fn, repeat or self.repeat, warmup, setup)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+            print(f"❌ {name}: {result['error']}")
+        else:
+            print(f"⏱️ {name}: mediana {result['median_ms']} ms (min {result['min_ms']} ms)")
+        self.results[name] = result
+
+    def configure(self):
+        from common.config import Config
+        from data.geometry import NutsGeometryCache
+
+        config = Config()
+        config.ev_data_path = self.ev_path
+        config.env_data_path = self.env_path
+        config.nuts_geojson_path = self.geojson_path
+        config.cache_dir = os.path.join(self.work_dir, "snapshots")
+        config.geometry_cache_dir = os.path.join(self.work_dir, "geometry")
+        NutsGeometryCache._shared = None
+
+    def run(self) -> dict:
+        self.configure()
+        from PyQt5.QtWidgets import QApplication
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+
+        repository = self.bench_repository()
+        service = self.bench_service(repository)
+        self.bench_chart(service)
+        self.bench_maps(repository.catalog)
+        return self.results
+
+    def bench_repository(self):
+        from common.config import Config
+        from data.catalog import DataCatalog
+        from data.repository import ExcelVehicleDataRepository
+
+        def load(cache_dir):
+            catalog = DataCatalog(self.ev_path, self.env_path, cache_dir=cache_dir)
+            return ExcelVehicleDataRepository(self.ev_path, self.env_path, catalog=catalog)
+
+        self.run_case("repository_load_excel", lambda: load(""), repeat=max(1, self.repeat // 2))
+        self.run_case("repository_load_snapshot", lambda: load(Config().cache_dir))
+        return load(Config().cache_dir)
+
+    def bench_service(self, repository):
+        from data.data_service import VehicleDataService
+
+        service = VehicleDataService(repository)
+        geos = service.get_countries() + [
+            geo for geo in repository.catalog.table("ev_counts")["geo"].unique()
+            if len(geo) > 2
+        ]
+        years = service.get_years()
+        last_year = years[-1]
+        single = geos[:1]
+        clear = service.query_cache.clear
+
+        self.run_case(
+            "service_query_single",
+            lambda: service.query(single, mode="TOTAL", year=last_year),
+            setup=clear,
+        )
+        self.run_case(
+            "service_query_bulk_total",
+            lambda: service.query(geos, mode="TOTAL", year=last_year),
+            setup=clear,
+        )
+        self.run_case(
+            "service_query_bulk_ev",
+            lambda: service.query(geos, mode="EV", year=last_year),
+            setup=clear,
+        )
+        self.run_case(
+            "service_query_bulk_range_mean",
+            lambda: service.query(geos, year_range=(years[0], last_year), aggregate="mean"),
+            setup=clear,
+        )
+        self.run_case(
+            "service_query_bulk_cached",
+            lambda: service.query(geos, mode="TOTAL", year=last_year),
+        )
+        return service
+
+    def bench_chart(self, service):
+        if not any(self.wanted(f"chart_{kind}") for kind in ("redraw", "update")):
+            return
+        from gui.chart_view.chart_view import ChartView, CHART_COUNTRIES
+
+        view = ChartView(service)
+        view.resize(1200, 800)
+        view.show()
+        self.app.processEvents()
+        countries = service.get_countries()
+        years = view.years
+
+        for label, selection in (("1", countries[:1]), ("10", countries[:10]), ("all", countries)):
+            service.state.set(CHART_COUNTRIES, tuple(selection))
+            self.run_case(f"chart_redraw_{label}", view.redraw_chart, setup=view._reset_bars)
+
+            ends = iter(range(10 ** 9))
+
+            def update():
+                end = years[len(years) - 1 - next(ends) % len(years)]
+                view.draw_chart(view.compute_chart_data(years[0], end, list(selection)))
+
+            self.run_case(f"chart_update_{label}", update)
+            view.settle()
+        view.close()
+
+    def bench_maps(self, catalog):
+        tabs = (
+            ("map_regions", "gui.map_view.electric_vehicles_map_tab", "ElectricVehiclesMapTab"),
+            ("map_countries", "gui.map_view.electric_vehicles_countries_tab",
+             "ElectricVehiclesCountriesTab"),
+        )
+        for prefix, module_name, class_name in tabs:
+            if not any(self.wanted(f"{prefix}_{kind}") for kind in
+                       ("build", "frame", "figure", "html", "update_script")):
+                continue
+            try:
+                module = __import__(module_name, fromlist=[class_name])
+            except ImportError as e:
+                self.results[f"{prefix}_build"] = {"error": f"ImportError: {e}"}
+                print(f"❌ {prefix}: {e}")
+                continue
+            tab_class = getattr(module, class_name)
+            holder = {}
+            self.run_case(
+                f"{prefix}_build",
+                lambda: holder.__setitem__("tab", tab_class(catalog)),
+                repeat=max(1, self.repeat // 2),
+            )
+            tab = holder.get("tab")
+            if tab is None:
+                continue
+            self.app.processEvents()
+            args = [tab.years[0], tab.years[-1]]
+            if prefix == "map_regions":
+                args += ["EU", tab.level]
+            frame = tab.compute_frame(*args)
+            self.run_case(f"{prefix}_frame", lambda: tab.compute_frame(*args))
+            self.run_case(f"{prefix}_figure", lambda: tab.map_page.build_figure(frame))
+            self.run_case(f"{prefix}_html", lambda: tab.map_page.render_html(frame))
+            self.run_case(f"{prefix}_update_script", lambda: tab.map_page.update_script(frame))
+            tab.close()
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    comparison = {}
+    base_results = baseline.get("results", {})
+    for name, result in results.items():
+        base = base_results.get(name)
+        if "median_ms" not in result:
+            comparison[name] = {"status": "error"}
+            continue
+        if not base or "median_ms" not in base:
+            comparison[name] = {"status": "new", "median_ms": result["median_ms"]}
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {
+            "status": status,
+            "baseline_median_ms": base["median_ms"],
+            "median_ms": result["median_ms"],
+            "ratio": round(ratio, 3),
+        }
+    for name in base_results.keys() - results.keys():
+        comparison[name] = {"status": "missing"}
+    return comparison
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarki wczytywania danych, zapytań i renderowania widoków (bez okna)."
+    )
+    parser.add_argument("--real", action="store_true",
+                        help="użyj prawdziwych plików z Config zamiast danych syntetycznych")
+    parser.add_argument("--regions", type=int, default=300)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--countries", type=int, default=31)
+    parser.add_argument("--vertices-per-edge", type=int, default=8)
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=None)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = args.data_dir or tempfile.mkdtemp(prefix="ev-bench-")
+
+    if args.real:
+        from common.config import Config
+        config = Config()
+        paths = (config.ev_data_path, config.env_data_path, config.nuts_geojson_path)
+        dataset_meta = {"kind": "real"}
+    else:
+        from benchmarks.synthetic import generate_dataset
+        paths = generate_dataset(
+            work_dir, regions=args.regions, years=args.years, countries=args.countries,
+            vertices_per_edge=args.vertices_per_edge,
+        )
+        dataset_meta = {
+            "kind": "synthetic",
+            "regions": args.regions,
+            "years": args.years,
+            "countries": args.countries,
+            "vertices_per_edge": args.vertices_per_edge,
+        }
+
+    suite = BenchmarkSuite(*paths, work_dir=work_dir, repeat=args.repeat, only=args.only)
+    results = suite.run()
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dataset": dataset_meta,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("dataset") != dataset_meta:
+            print("⚠️ Baseline dotyczy innego zbioru danych – porównanie może być mylące")
+        report["baseline"] = {"path": args.baseline, "meta": baseline.get("meta")}
+        report["comparison"] = compare(results, baseline, args.threshold)
+        for name, entry in sorted(report["comparison"].items()):
+            if "ratio" in entry:
+                print(f"{entry['status']:>11}  {name}: {entry['baseline_median_ms']} → "
+                      f"{entry['median_ms']} ms (x{entry['ratio']})")
+            else:
+                print(f"{entry['status']:>11}  {name}")
+        regressions = [
+            name for name, entry in report["comparison"].items()
+            if entry["status"] == "regression"
+        ]
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✅ Wyniki zapisane do {args.output}")
+
+    if regressions and args.fail_on_regression:
+        print(f"❌ Regresje: {', '.join(sorted(regressions))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import json
+import math
+import os
+import random
+from collections import namedtuple
+
+from openpyxl import Workbook
+
+SyntheticDataset = namedtuple("SyntheticDataset", ["ev_path", "env_path", "geojson_path"])
+
+COUNTRIES = [
+    ("PL", "Poland"), ("DE", "Germany"), ("FR", "France"), ("IT", "Italy"),
+    ("ES", "Spain"), ("NL", "Netherlands"), ("BE", "Belgium"), ("SE", "Sweden"),
+    ("FI", "Finland"), ("AT", "Austria"), ("PT", "Portugal"), ("CZ", "Czechia"),
+    ("DK", "Denmark"), ("EL", "Greece"), ("HU", "Hungary"), ("IE", "Ireland"),
+    ("SK", "Slovakia"), ("SI", "Slovenia"), ("HR", "Croatia"), ("EE", "Estonia"),
+    ("LV", "Latvia"), ("LT", "Lithuania"), ("LU", "Luxembourg"), ("BG", "Bulgaria"),
+    ("RO", "Romania"), ("NO", "Norway"), ("CH", "Switzerland"), ("IS", "Iceland"),
+    ("CY", "Cyprus"), ("MT", "Malta"), ("LI", "Liechtenstein"), ("RS", "Serbia"),
+    ("BA", "Bosnia and Herzegovina"), ("TR", "Türkiye"),
+]
+_NUTS_DIGITS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LON_RANGE = (-25.0, 45.0)
+_LAT_RANGE = (34.0, 72.0)
+
+
+def _countries(count: int) -> list:
+    countries = list(COUNTRIES[:count])
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    taken = {code for code, _ in countries}
+    for first in letters:
+        for second in letters:
+            if len(countries) >= count:
+                return countries
+            code = f"{first}{second}"
+            if code not in taken:
+                taken.add(code)
+                countries.append((code, f"Synthetic country {code}"))
+    return countries
+
+
+def _regions(countries: list, regions: int) -> list:
+    per_country = max(1, math.ceil(regions / len(countries)))
+    per_country = min(per_country, len(_NUTS_DIGITS) ** 2)
+    nuts1_count = min(len(_NUTS_DIGITS), max(1, math.ceil(math.sqrt(per_country))))
+    nuts2_per_nuts1 = math.ceil(per_country / nuts1_count)
+    layout = []
+    remaining = regions
+    for code, name in countries:
+        nuts1 = []
+        budget = min(per_country, max(remaining, 1))
+        for i in range(nuts1_count):
+            if budget <= 0:
+                break
+            children = _NUTS_DIGITS[:min(nuts2_per_nuts1, budget)]
+            budget -= len(children)
+            nuts1_code = f"{code}{_NUTS_DIGITS[i]}"
+            nuts1.append((nuts1_code, [f"{nuts1_code}{c}" for c in children]))
+        remaining -= sum(len(children) for _, children in nuts1)
+        layout.append((code, name, nuts1))
+    return layout
+
+
+def _sheet_header(sheet, dataset: str, unit: str, columns: list):
+    sheet.append(["Data extracted on 01/01/2025 00:00:00 from [ESTAT]"])
+    sheet.append(["Dataset: ", dataset])
+    sheet.append(["Last updated: ", "01/01/2025 00:00"])
+    sheet.append([])
+    sheet.append(["Time frequency [FREQ]", None, "Annual [A]"])
+    sheet.append(["Vehicles [VEHICLE]", None, "Passenger cars [CAR]"])
+    sheet.append(["Unit of measure [UNIT]", None, unit])
+    sheet.append([])
+    sheet.append(columns)
+
+
+def _sheet_footer(sheet):
+    sheet.append([])
+    sheet.append(["Special value"])
+    sheet.append([":", "not available"])
+    sheet.append(["Observation flags:"])
+    sheet.append(["e", "estimated"])
+
+
+def _observations(rng, years, base, growth, missing_rate, flag_rate):
+    cells = []
+    value = base
+    for _ in years:
+        value *= growth
+        if rng.random() < missing_rate:
+            cells += [":", ""]
+        else:
+            cells += [round(value, 2), "e" if rng.random() < flag_rate else ""]
+    return cells
+
+
+def write_ev_workbook(path: str, layout: list, years: list, seed: int = 0,
+                      missing_rate: float = 0.02, flag_rate: float = 0.05):
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    workbook.create_sheet("Summary").append(["Synthetic Eurostat workbook"])
+    columns = ["TIME", "TIME"]
+    for year in years:
+        columns += [str(year), ""]
+
+    rows = []
+    for code, name, nuts1 in layout:
+        rows.append((code, name, 5.0))
+        for nuts1_code, children in nuts1:
+            rows.append((nuts1_code, f"{name} {nuts1_code}", 2.0))
+            rows.extend((child, f"{name} {child}", 1.0) for child in children)
+
+    for sheet_name, unit, scale in (
+        ("Sheet 3", "Number [NR]", 1000.0),
+        ("Sheet 4", "Percentage [PC]", 0.05),
+    ):
+        sheet = workbook.create_sheet(sheet_name)
+        _sheet_header(sheet, "Synthetic [tran_r_elvehst]", unit, columns)
+        sheet.append(["GEO (Codes)", "GEO (Labels)"] + [""] * (2 * len(years)))
+        for code, label, weight in rows:
+            base = scale * weight * rng.uniform(0.2, 2.0)
+            growth = rng.uniform(1.02, 1.25) if scale > 1 else rng.uniform(1.01, 1.1)
+            sheet.append([code, label] + _observations(
+                rng, years, base, growth, missing_rate, flag_rate
+            ))
+        _sheet_footer(sheet)
+    workbook.save(path)
+
+
+def write_env_workbook(path: str, countries: list, years: list, seed: int = 0):
+    rng = random.Random(seed + 1)
+    workbook = Workbook(write_only=True)
+    workbook.create_sheet("Summary").append(["Synthetic Eurostat workbook"])
+    sheet = workbook.create_sheet("Sheet 1")
+    columns = ["TIME"]
+    for year in years:
+        columns += [str(year), None]
+    _sheet_header(sheet, "Synthetic [env_waselvt]", "Number", columns)
+    sheet.append(["GEO (Labels)"] + [""] * (2 * len(years)))
+    sheet.append(["European Union - 27 countries (from 2020)"] + _observations(
+        rng, years, 5_000_000.0, 1.0, 0.0, 0.1
+    ))
+    for _, name in countries:
+        sheet.append([name] + _observations(
+            rng, years, rng.uniform(1_000, 200_000), rng.uniform(0.97, 1.03), 0.03, 0.05
+        ))
+    _sheet_footer(sheet)
+    workbook.save(path)
+
+
+def _rectangle(west, south, east, north, vertices_per_edge: int) -> list:
+    steps = max(1, vertices_per_edge)
+    ring = []
+    for i in range(steps):
+        ring.append([west + (east - west) * i / steps, south])
+    for i in range(steps):
+        ring.append([east, south + (north - south) * i / steps])
+    for i in range(steps):
+        ring.append([east - (east - west) * i / steps, north])
+    for i in range(steps):
+        ring.append([west, north - (north - south) * i / steps])
+    ring.append(ring[0])
+    return [[round(x, 6), round(y, 6)] for x, y in ring]
+
+
+def _feature(nuts_id, country, name, level, bounds, vertices_per_edge):
+    return {
+        "type": "Feature",
+        "properties": {
+            "NUTS_ID": nuts_id,
+            "LEVL_CODE": level,
+            "CNTR_CODE": country,
+            "NAME_LATN": name,
+            "NUTS_NAME": name,
+        },
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [_rectangle(*bounds, vertices_per_edge)],
+        },
+    }
+
+
+def write_geojson(path: str, layout: list, vertices_per_edge: int = 8):
+    grid = math.ceil(math.sqrt(len(layout)))
+    cell_w = (_LON_RANGE[1] - _LON_RANGE[0]) / grid
+    cell_h = (_LAT_RANGE[1] - _LAT_RANGE[0]) / grid
+    features = []
+    for index, (code, name, nuts1) in enumerate(layout):
+        west = _LON_RANGE[0] + (index % grid) * cell_w
+        south = _LAT_RANGE[0] + (index // grid) * cell_h
+        features.append(_feature(
+            code, code, name, 0, (west, south, west + cell_w, south + cell_h), vertices_per_edge
+        ))
+        strip_w = cell_w / max(1, len(nuts1))
+        for i, (nuts1_code, children) in enumerate(nuts1):
+            strip_west = west + i * strip_w
+            features.append(_feature(
+                nuts1_code, code, f"{name} {nuts1_code}", 1,
+                (strip_west, south, strip_west + strip_w, south + cell_h), vertices_per_edge,
+            ))
+            part_h = cell_h / max(1, len(children))
+            for j, child in enumerate(children):
+                part_south = south + j * part_h
+                features.append(_feature(
+                    child, code, f"{name} {child}", 2,
+                    (strip_west, part_south, strip_west + strip_w, part_south + part_h),
+                    vertices_per_edge,
+                ))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+
+
+def generate_dataset(out_dir: str, regions: int = 300, years: int = 5, countries: int = 31,
+                     end_year: int = 2022, vertices_per_edge: int = 8,
+                     seed: int = 0) -> SyntheticDataset:
+    os.makedirs(out_dir, exist_ok=True)
+    year_list = list(range(end_year - years + 1, end_year + 1))
+    country_list = _countries(countries)
+    layout = _regions(country_list, regions)
+    dataset = SyntheticDataset(
+        os.path.join(out_dir, "tran_r_elvehst_synthetic.xlsx"),
+        os.path.join(out_dir, "env_waselvt_synthetic.xlsx"),
+        os.path.join(out_dir, "nuts_synthetic.geojson"),
+    )
+    write_ev_workbook(dataset.ev_path, layout, year_list, seed)
+    write_env_workbook(dataset.env_path, country_list, year_list, seed)
+    write_geojson(dataset.geojson_path, layout, vertices_per_edge)
+    return dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generuje syntetyczne arkusze Eurostatu i GeoJSON NUTS do benchmarków."
+    )
+    parser.add_argument("out_dir")
+    parser.add_argument("--regions", type=int, default=300)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--countries", type=int, default=31)
+    parser.add_argument("--end-year", type=int, default=2022)
+    parser.add_argument("--vertices-per-edge", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    dataset = generate_dataset(
+        args.out_dir, args.regions, args.years, args.countries,
+        args.end_year, args.vertices_per_edge, args.seed,
+    )
+    print(f"✅ Zapisano {dataset.ev_path}, {dataset.env_path}, {dataset.geojson_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,3 +10,21 @@ class Config:
     def _initialize(self):
         self.env_data_path = "env_waselvt$defaultview_spreadsheet.xlsx"
         self.ev_data_path = "tran_r_elvehst$defaultview_spreadsheet.xlsx"
+        self.cache_dir = ".cache/snapshots"
+        self.nuts_geojson_path = "data/NUTS_RG_01M_2021_4326.geojson"
+        self.geometry_cache_dir = ".cache/geometry"
+        self.startup_budget_ms = 1500
+        self.query_cache_entries = 256
+        self.query_cache_bytes = 64 * 1024 * 1024
+        self.watch_data_files = True
+        self.reload_debounce_ms = 500
+        self.map_backend = "plotly"
+        self.static_map_tolerance = 0.01
+        self.topology_quantization = 10_000
+        self.topology_simplify = 1.0
+        self.data_source = "xlsx"
+        self.ev_bulk_path = "tran_r_elvehst.tsv.gz"
+        self.env_bulk_path = "env_waselvt.tsv.gz"
+        self.ev_bulk_filters = {"freq": "A", "vehicle": "CAR"}
+        self.ev_bulk_units = {"ev_counts": "NR", "ev_share": "PC"}
+        self.env_bulk_filters = {"freq": "A", "wst_oper": "GEN", "unit": "NR"}
@@ -0,0 +1,40 @@
+COUNTRY_NAMES = {
+    "AL": "Albania",
+    "AT": "Austria",
+    "BA": "Bośnia i Hercegowina",
+    "BE": "Belgia",
+    "BG": "Bułgaria",
+    "CH": "Szwajcaria",
+    "CY": "Cypr",
+    "CZ": "Czechy",
+    "DE": "Niemcy",
+    "DK": "Dania",
+    "EE": "Estonia",
+    "EL": "Grecja",
+    "ES": "Hiszpania",
+    "FI": "Finlandia",
+    "FR": "Francja",
+    "HR": "Chorwacja",
+    "HU": "Węgry",
+    "IE": "Irlandia",
+    "IS": "Islandia",
+    "IT": "Włochy",
+    "LI": "Liechtenstein",
+    "LT": "Litwa",
+    "LU": "Luksemburg",
+    "LV": "Łotwa",
+    "ME": "Czarnogóra",
+    "MK": "Macedonia Północna",
+    "MT": "Malta",
+    "NL": "Holandia",
+    "NO": "Norwegia",
+    "PL": "Polska",
+    "PT": "Portugalia",
+    "RO": "Rumunia",
+    "RS": "Serbia",
+    "SE": "Szwecja",
+    "SI": "Słowenia",
+    "SK": "Słowacja",
+    "TR": "Turcja",
+    "UK": "Wielka Brytania",
+}
@@ -1,10 +1,12 @@
+from core.state import YEAR, MODE, DATA
+
 class MainController:
     def __init__(self, service, exporter, chart_view, map_view):
         self.service = service
         self.exporter = exporter
         self.chart_view = chart_view
         self.map_view = map_view
-        self.service.dataUpdated.connect(self.update_views)
+        self.binding = self.service.state.bind([YEAR, MODE, DATA], self.update_views)
 
     def on_year_changed(self, year):
         self.service.set_year(year)
@@ -0,0 +1,124 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.tasks import background_executor
+
+
+class RenderCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        if self.cancelled:
+            raise RenderCancelled()
+
+
+class _WorkerSignals(QObject):
+    finished = pyqtSignal(object, int, object)
+    failed = pyqtSignal(object, int, str)
+
+
+class _RenderJob:
+    def __init__(self, key, generation, compute, token, signals):
+        self.key = key
+        self.generation = generation
+        self.compute = compute
+        self.token = token
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.token.check()
+            result = self.compute(self.token)
+            self.token.check()
+        except RenderCancelled:
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.key, self.generation, str(e))
+            return
+        self.signals.finished.emit(self.key, self.generation, result)
+
+
+class _Slot:
+    def __init__(self, scheduler, key):
+        self.timer = QTimer(scheduler)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(lambda: scheduler._submit(key))
+        self.generation = 0
+        self.compute = None
+        self.apply = None
+        self.token = None
+
+
+class RenderScheduler(QObject):
+    _instance = None
+
+    def __init__(self, delay_ms: int = 40, executor=None):
+        super().__init__()
+        self.delay_ms = delay_ms
+        # Renderowanie idzie na wątkach Pythona, a nie na QThreadPool: pyproj
+        # trzyma kontekst per wątek, który ginie razem ze stanem wątku tworzonym
+        # przez PyQt dla każdego QRunnable, co kończyło się segfaultem przy
+        # drugim wczytaniu geometrii.
+        self.executor = executor or background_executor()
+        self._slots = {}
+        self._signals = _WorkerSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    @classmethod
+    def shared(cls) -> "RenderScheduler":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def schedule(self, key, compute, apply):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot(self, key)
+        if slot.token is not None:
+            slot.token.cancel()
+            slot.token = None
+            slot.generation += 1
+        slot.compute = compute
+        slot.apply = apply
+        slot.timer.start(self.delay_ms)
+
+    def cancel(self, key):
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            slot.timer.stop()
+            if slot.token is not None:
+                slot.token.cancel()
+
+    def _submit(self, key):
+        slot = self._slots.get(key)
+        if slot is None or slot.compute is None:
+            return
+        slot.generation += 1
+        slot.token = CancelToken()
+        job = _RenderJob(key, slot.generation, slot.compute, slot.token, self._signals)
+        slot.compute = None
+        self.executor.submit(job.run)
+
+    def _on_finished(self, key, generation, result):
+        slot = self._slots.get(key)
+        if slot is None or generation != slot.generation:
+            return
+        slot.token = None
+        try:
+            slot.apply(result)
+        except Exception as e:
+            print(f"❌ Błąd przy odświeżaniu widoku: {e}")
+
+    def _on_failed(self, key, generation, message):
+        slot = self._slots.get(key)
+        if slot is None or generation != slot.generation:
+            return
+        slot.token = None
+        print(f"❌ Błąd w obliczeniach w tle: {message}")
@@ -0,0 +1,118 @@
+import builtins
+import json
+import sys
+import threading
+import time
+
+_active = None
+
+
+def active_profiler():
+    return _active
+
+
+def mark(name: str):
+    if _active is not None:
+        _active.mark(name)
+
+
+class StartupProfiler:
+    def __init__(self, output_path: str, budget_ms: float = None):
+        self.output_path = output_path
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter()
+        self.phases = []
+        self.imports = []
+        self._last_mark = self.started
+        self._local = threading.local()
+        self._original_import = None
+        self._lock = threading.Lock()
+        self._dumped = False
+
+    @classmethod
+    def install(cls, output_path: str, budget_ms: float = None) -> "StartupProfiler":
+        global _active
+        profiler = cls(output_path, budget_ms)
+        profiler._original_import = builtins.__import__
+        builtins.__import__ = profiler._timed_import
+        _active = profiler
+        return profiler
+
+    def uninstall(self):
+        global _active
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        if _active is self:
+            _active = None
+
+    def _elapsed_ms(self, since=None) -> float:
+        return (time.perf_counter() - (since or self.started)) * 1000.0
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append({
+                "name": name,
+                "at_ms": round((now - self.started) * 1000.0, 3),
+                "delta_ms": round((now - self._last_mark) * 1000.0, 3),
+                "thread": threading.current_thread().name,
+            })
+            self._last_mark = now
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level == 0 and name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        start = time.perf_counter()
+        stack.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if level:
+                package = (globals or {}).get("__package__") or ""
+                name = f"{package}:{'.' * level}{name}"
+            self.imports.append({
+                "module": name,
+                "inclusive_ms": round(elapsed * 1000.0, 3),
+                "self_ms": round((elapsed - nested) * 1000.0, 3),
+                "thread": threading.current_thread().name,
+            })
+
+    def report(self) -> dict:
+        total_ms = self._elapsed_ms()
+        window_ms = next(
+            (p["at_ms"] for p in self.phases if p["name"] == "window_shown"), None
+        )
+        imports = sorted(self.imports, key=lambda r: r["inclusive_ms"], reverse=True)
+        return {
+            "total_ms": round(total_ms, 3),
+            "time_to_window_ms": window_ms,
+            "budget_ms": self.budget_ms,
+            "over_budget": (
+                window_ms is not None and self.budget_ms is not None and window_ms > self.budget_ms
+            ),
+            "phases": list(self.phases),
+            "import_self_ms_total": round(sum(r["self_ms"] for r in imports), 3),
+            "imports": imports,
+        }
+
+    def dump(self):
+        if self._dumped:
+            return
+        self._dumped = True
+        report = self.report()
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"⏱️ Profil startu zapisany do {self.output_path} "
+              f"(okno po {report['time_to_window_ms']} ms)")
+        if report["over_budget"]:
+            print(f"⚠️ Start przekroczył budżet {self.budget_ms} ms")
@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+YEAR = "year"
+MODE = "mode"
+DATA = "data"
+
+_MISSING = object()
+
+
+class StateBinding:
+    def __init__(self, state, keys, callback):
+        self.state = state
+        self.keys = tuple(keys)
+        self.callback = callback
+        self.seen = state.versions(self.keys)
+
+    def is_stale(self) -> bool:
+        return self.state.versions(self.keys) != self.seen
+
+    def refresh(self):
+        self.seen = self.state.versions(self.keys)
+        self.callback()
+
+    def dispose(self):
+        self.state.unbind(self)
+
+
+class AppState(QObject):
+    changed = pyqtSignal(frozenset)
+
+    def __init__(self, **initial):
+        super().__init__()
+        self._values = dict(initial)
+        self._versions = {key: 0 for key in initial}
+        self.version = 0
+        self._bindings = []
+        self._batch_depth = 0
+        self._batch_undo = {}
+        self._dirty = set()
+        self._flush_pending = False
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def version_of(self, key) -> int:
+        return self._versions.get(key, 0)
+
+    def versions(self, keys) -> tuple:
+        return tuple(self._versions.get(key, 0) for key in keys)
+
+    def snapshot(self) -> dict:
+        return dict(self._values)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values=None, **kwargs):
+        values = {**(values or {}), **kwargs}
+        with self.batch():
+            for key, value in values.items():
+                old = self._values.get(key, _MISSING)
+                if old is not _MISSING and old == value:
+                    continue
+                self._batch_undo.setdefault(key, old)
+                self._values[key] = value
+
+    def touch(self, key):
+        with self.batch():
+            self._batch_undo.setdefault(key, self._values.get(key, _MISSING))
+
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._commit()
+
+    def _rollback(self):
+        for key, old in self._batch_undo.items():
+            if old is _MISSING:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = old
+        self._batch_undo = {}
+
+    def _commit(self):
+        keys = set(self._batch_undo)
+        self._batch_undo = {}
+        if not keys:
+            return
+        self.version += 1
+        for key in keys:
+            self._versions[key] = self.version
+        self._dirty |= keys
+        if not self._flush_pending:
+            self._flush_pending = True
+            QTimer.singleShot(0, self.flush)
+
+    def bind(self, keys, callback) -> StateBinding:
+        binding = StateBinding(self, keys, callback)
+        self._bindings.append(binding)
+        return binding
+
+    def unbind(self, binding: StateBinding):
+        if binding in self._bindings:
+            self._bindings.remove(binding)
+
+    def flush(self):
+        self._flush_pending = False
+        if not self._dirty:
+            return
+        dirty = frozenset(self._dirty)
+        self._dirty = set()
+        for binding in list(self._bindings):
+            if binding.is_stale():
+                try:
+                    binding.refresh()
+                except Exception as e:
+                    print(f"❌ Błąd odświeżania widoku: {e}")
+        self.changed.emit(dirty)
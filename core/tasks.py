@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+_executor = None
+_running = set()
+
+
+def background_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = max(2, min(4, os.cpu_count() or 2))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ev-worker")
+    return _executor
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BackgroundTask:
+    def __init__(self, fn):
+        self.fn = fn
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+def run_in_background(fn, on_finished=None, on_failed=None) -> BackgroundTask:
+    task = BackgroundTask(fn)
+    _running.add(task)
+
+    def _done(*_):
+        _running.discard(task)
+
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        task.signals.failed.connect(on_failed)
+    else:
+        task.signals.failed.connect(lambda message: print(f"❌ Błąd zadania w tle: {message}"))
+    task.signals.finished.connect(_done)
+    task.signals.failed.connect(_done)
+    background_executor().submit(task.run)
+    return task
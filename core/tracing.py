@@ -0,0 +1,158 @@
+from collections import deque
+import functools
+import json
+import os
+import threading
+import time
+
+_tracer = None
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def active_tracer():
+    return _tracer
+
+
+def enable_tracing(capacity: int = 50000, window: int = 512) -> "Tracer":
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(capacity, window)
+    return _tracer
+
+
+def disable_tracing():
+    global _tracer
+    _tracer = None
+
+
+def span(name: str, **args):
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
+
+
+def traced(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*a, **kw)
+            with _Span(tracer, name, None):
+                return fn(*a, **kw)
+        return wrapper
+    return decorator
+
+
+def now_us() -> float:
+    return time.perf_counter_ns() / 1000.0
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        self.tracer.record(self.name, self.start, now_us(), args)
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity: int = 50000, window: int = 512):
+        self.events = deque(maxlen=capacity)
+        self.window = window
+        self._durations = {}
+        self._lock = threading.Lock()
+        self.started_us = now_us()
+
+    def record(self, name: str, start_us: float, end_us: float, args=None):
+        thread = threading.current_thread()
+        duration = end_us - start_us
+        self.events.append((name, start_us, duration, thread.ident, thread.name, args))
+        with self._lock:
+            samples = self._durations.get(name)
+            if samples is None:
+                samples = self._durations[name] = deque(maxlen=self.window)
+            samples.append(duration / 1000.0)
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self._durations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._durations.items()}
+        return {
+            name: {
+                "count": len(samples),
+                "p50_ms": _percentile(samples, 0.50),
+                "p90_ms": _percentile(samples, 0.90),
+                "p99_ms": _percentile(samples, 0.99),
+                "max_ms": samples[-1],
+            }
+            for name, samples in snapshot.items() if samples
+        }
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for name, start, duration, tid, thread_name, args in list(self.events):
+            threads[tid] = thread_name
+            event = {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round(start - self.started_us, 3),
+                "dur": round(duration, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = {key: _json_value(value) for key, value in args.items()}
+            events.append(event)
+        for tid, thread_name in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": thread_name},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def _percentile(sorted_samples, q: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return round(sorted_samples[index], 3)
+
+
+def _json_value(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
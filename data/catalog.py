@@ -0,0 +1,113 @@
+import abc
+import copy
+import warnings
+
+import pandas as pd
+from common.config import Config
+from core.tracing import span
+from data.reshape import wide_to_long
+from data.snapshot import SnapshotCache
+
+warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+
+EV_COUNTS = "ev_counts"
+EV_SHARE = "ev_share"
+ENV = "env"
+
+SOURCES = ("ev", "env")
+
+
+class SnapshotCatalog(abc.ABC):
+    def __init__(self, cache_dir: str = None):
+        if cache_dir is None:
+            cache_dir = Config().cache_dir
+        self.snapshots = SnapshotCache(cache_dir) if cache_dir else None
+        self._tables = {}
+        self.name_to_code = {}
+        self._load()
+
+    def sources(self) -> dict:
+        return {"ev": self.ev_path, "env": self.env_path}
+
+    def reloaded(self, sources) -> "SnapshotCatalog":
+        catalog = copy.copy(self)
+        catalog._tables = dict(self._tables)
+        catalog._load(sources)
+        return catalog
+
+    def _snapshot_name(self, source: str) -> str:
+        return f"catalog_{source}"
+
+    def _load(self, sources=SOURCES):
+        for source in sources:
+            snapshot_key = None
+            if self.snapshots is not None:
+                try:
+                    snapshot_key = self.snapshots.make_key(
+                        self._snapshot_name(source), [self.sources()[source]]
+                    )
+                    cached = self.snapshots.load(snapshot_key)
+                except OSError as e:
+                    print(f"⚠️ Pominięto migawkę danych: {e}")
+                    cached = None
+                if cached is not None:
+                    tables, extra = cached
+                    self._tables.update(tables)
+                    if source == "ev":
+                        self.name_to_code = extra.get("name_to_code", {})
+                    continue
+
+            tables = self._parse_ev() if source == "ev" else self._parse_env()
+            self._tables.update(tables)
+            if snapshot_key is not None:
+                extra = {"name_to_code": self.name_to_code} if source == "ev" else None
+                self.snapshots.store(snapshot_key, tables, extra=extra)
+
+    @abc.abstractmethod
+    def _parse_ev(self) -> dict:
+        pass
+
+    @abc.abstractmethod
+    def _parse_env(self) -> dict:
+        pass
+
+    def table(self, name: str) -> pd.DataFrame:
+        return self._tables[name]
+
+    def table_names(self):
+        return list(self._tables)
+
+
+class DataCatalog(SnapshotCatalog):
+    def __init__(self, ev_path: str, env_path: str, cache_dir: str = None):
+        self.ev_path = ev_path
+        self.env_path = env_path
+        super().__init__(cache_dir)
+
+    def _parse_ev(self) -> dict:
+        ev_sheets = self._read_sheets(self.ev_path, ["Sheet 3", "Sheet 4"])
+        ev_counts_raw = ev_sheets["Sheet 3"].rename(columns={"TIME": "geo", "TIME.1": "name"})
+        ev_share_raw = ev_sheets["Sheet 4"].rename(columns={"TIME": "geo", "TIME.1": "name"})
+
+        codes = ev_counts_raw["geo"].astype(str).str.strip()
+        labels = ev_counts_raw["name"].astype(str).str.strip()
+        is_country = codes.str.len() == 2
+        self.name_to_code = dict(zip(labels[is_country], codes[is_country]))
+
+        return {
+            EV_COUNTS: wide_to_long(ev_counts_raw, ["geo", "name"]),
+            EV_SHARE: wide_to_long(ev_share_raw, ["geo", "name"]),
+        }
+
+    def _parse_env(self) -> dict:
+        env_sheets = self._read_sheets(self.env_path, ["Sheet 1"])
+        env_raw = env_sheets["Sheet 1"].rename(columns={"TIME": "name"})
+        return {ENV: wide_to_long(env_raw, ["name"])}
+
+    @staticmethod
+    def _read_sheets(path: str, sheet_names: list) -> dict:
+        with span("load.excel_parse", path=path), pd.ExcelFile(path, engine="openpyxl") as workbook:
+            return {
+                name: workbook.parse(name, skiprows=8).iloc[1:]
+                for name in sheet_names
+            }
@@ -1,19 +1,39 @@
+from collections import namedtuple
+
+import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal
+from common.config import Config
+from common.countries import COUNTRY_NAMES
+from core.state import AppState, YEAR, MODE, DATA
+from core.tracing import traced
+from data.query_cache import QueryCache
+
+BulkQueryResult = namedtuple("BulkQueryResult", ["codes", "values", "mask"])
 
 class VehicleDataService(QObject):
     dataUpdated = pyqtSignal()
     yearChanged = pyqtSignal(int)
 
-    def __init__(self, repository):
+    def __init__(self, repository, state=None):
         super().__init__()
         self.repository = repository
-        self.selected_year = None
-        self.data_mode = "TOTAL"            
+        self.state = state or AppState()
+        config = Config()
+        self.query_cache = QueryCache(config.query_cache_entries, config.query_cache_bytes)
+        self.state.update({YEAR: None, MODE: "TOTAL", DATA: 0})
+        self.state.bind([YEAR], lambda: self.yearChanged.emit(self.selected_year))
+        self.state.bind([YEAR, MODE, DATA], self.dataUpdated.emit)
+
+    @property
+    def selected_year(self):
+        return self.state.get(YEAR)
+
+    @property
+    def data_mode(self):
+        return self.state.get(MODE)
 
     def set_year(self, year):
-        self.selected_year = year
-        self.yearChanged.emit(year)
-        self.dataUpdated.emit()
+        self.state.set(YEAR, year)
 
     def get_current_year(self):
         return self.selected_year
@@ -21,8 +41,17 @@ class VehicleDataService(QObject):
     def set_mode(self, mode):
         if mode not in {"TOTAL", "EV"}:
             raise ValueError(f"Nieobsługiwany tryb danych: {mode}")
-        self.data_mode = mode
-        self.dataUpdated.emit()
+        self.state.set(MODE, mode)
+
+    def mark_data_changed(self):
+        self.state.touch(DATA)
+
+    def set_repository(self, repository):
+        self.repository = repository
+        self.mark_data_changed()
+
+    def cache_stats(self):
+        return self.query_cache.stats()
 
     def get_countries(self):
         return self.repository.get_all_countries()
@@ -30,65 +59,89 @@ class VehicleDataService(QObject):
     def get_years(self):
         return self.repository.get_available_years()
 
+    def query(self, geos, mode=None, year=None, year_range=None, aggregate="sum"):
+        mode = mode or self.data_mode
+        if mode not in {"TOTAL", "EV"}:
+            raise ValueError(f"Nieobsługiwany tryb danych: {mode}")
+        if aggregate not in {"sum", "mean"}:
+            raise ValueError(f"Nieobsługiwana agregacja: {aggregate}")
+        if year is None and year_range is None:
+            year = self.selected_year
+
+        geos = list(geos)
+        unique = tuple(sorted(set(geos)))
+        if year_range is not None:
+            key = ("range", mode, tuple(year_range), aggregate, unique)
+        elif year is None:
+            key = ("empty", mode, unique)
+        else:
+            key = ("year", mode, year, unique)
+        result = self.query_cache.get_or_compute(
+            key, lambda: self._compute_query(key), self.state.version_of(DATA)
+        )
+        return self._select(result, geos)
+
+    @staticmethod
+    def _select(result: BulkQueryResult, geos: list) -> BulkQueryResult:
+        codes = np.asarray(geos, dtype=object)
+        if len(codes) == len(result.codes) and (codes == result.codes).all():
+            return result
+        # Klucz w pamięci podręcznej ma posortowane, unikalne kody; wynik wraca
+        # w kolejności (i z duplikatami) podanej przez wywołującego.
+        positions = np.searchsorted(result.codes, codes)
+        selected = BulkQueryResult(codes, result.values[positions], result.mask[positions])
+        for array in selected:
+            array.setflags(write=False)
+        return selected
+
+    @traced("aggregate.service_query")
+    def _compute_query(self, key):
+        kind, mode = key[0], key[1]
+        index = self.repository.ev_index
+        codes = np.asarray(list(key[-1]), dtype=object)
+        rows = index.geo_codes(codes)
+        known = rows >= 0
+        values = np.full(len(codes), np.nan)
+        mask = np.zeros(len(codes), dtype=bool)
+
+        if kind == "range":
+            (start, end), aggregate = key[2], key[3]
+            counts = index.range_count(start, end, rows=rows[known])
+            if aggregate == "mean":
+                values[known] = index.range_mean(start, end, rows=rows[known])
+            else:
+                values[known] = index.range_sum(start, end, rows=rows[known])
+            mask[known] = counts > 0
+        elif kind == "empty":
+            pass
+        elif mode == "TOTAL":
+            column = index.year_index.get(key[2])
+            if column is not None:
+                values[known] = index.values[rows[known], column]
+                mask[known] = index.mask[rows[known], column]
+        else:
+            values[:] = 0.0
+            values[known] = index.range_sum(None, key[2], rows=rows[known])
+            mask[:] = True
+
+        for array in (codes, values, mask):
+            array.setflags(write=False)
+        return BulkQueryResult(codes, values, mask)
+
     def get_data_for_country(self, country):
-        if self.selected_year is None:
-            return None
-
-        if self.data_mode == "TOTAL":
-                                                          
-            return self.repository.get_vehicle_data(country, self.selected_year)
-        elif self.data_mode == "EV":
-                                                                    
-            years = self.repository.get_available_years()
-            years_to_sum = [y for y in years if y <= self.selected_year]
-            total_ev = 0
-            for y in years_to_sum:
-                val = self.repository.get_ev_share_data(country, y)
-                if val is not None:
-                    total_ev += val
-            return total_ev
-
-        return None
+        return self.get_bulk_data([country])[country]
 
     def get_bulk_data(self, countries):
+        if self.selected_year is None:
+            return {country: None for country in countries}
+        result = self.query(countries)
         return {
-            country: self.get_data_for_country(country)
-            for country in countries
+            code: (value if ok else None)
+            for code, value, ok in zip(result.codes, result.values, result.mask)
         }
 
+    def get_country_labels(self):
+        return {code: name for name, code in self.repository.name_to_code.items()}
+
     def get_country_names(self):
-        return {
-            "AT": "Austria",
-            "BA": "Bośnia i Hercegowina",
-            "BE": "Belgia",
-            "BG": "Bułgaria",
-            "CH": "Szwajcaria",
-            "CY": "Cypr",
-            "CZ": "Czechy",
-            "DE": "Niemcy",
-            "DK": "Dania",
-            "EE": "Estonia",
-            "EL": "Grecja",
-            "ES": "Hiszpania",
-            "FI": "Finlandia",
-            "FR": "Francja",
-            "HR": "Chorwacja",
-            "HU": "Węgry",
-            "IE": "Irlandia",
-            "IS": "Islandia",
-            "IT": "Włochy",
-            "LI": "Liechtenstein",
-            "LT": "Litwa",
-            "LU": "Luksemburg",
-            "LV": "Łotwa",
-            "MT": "Malta",
-            "NL": "Holandia",
-            "NO": "Norwegia",
-            "PL": "Polska",
-            "PT": "Portugalia",
-            "RO": "Rumunia",
-            "SE": "Szwecja",
-            "SI": "Słowenia",
-            "SK": "Słowacja",
-            "UK": "Wielka Brytania",
-        }
+        return dict(COUNTRY_NAMES)
@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+
+import pandas as pd
+from common.config import Config
+from core.tracing import span
+from data.catalog import ENV, EV_COUNTS, EV_SHARE, SnapshotCatalog
+from data.reshape import YEAR_COLUMN, parse_cells
+
+LONG_COLUMNS = ["geo", "name", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
+BULK_CHUNK_ROWS = 50_000
+
+
+def _open_text(path: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def detect_format(path: str) -> str:
+    with _open_text(path) as f:
+        header = f.readline()
+    if "\t" in header and "\\" in header.split("\t", 1)[0]:
+        return "tsv"
+    if "TIME_PERIOD" in header and "OBS_VALUE" in header:
+        return "sdmx-csv"
+    raise ValueError(f"Nieznany format pliku Eurostatu: {path}")
+
+
+def _split_label(series: pd.Series):
+    parts = series.astype(str).str.strip().str.split(":", n=1, expand=True)
+    codes = parts[0].str.strip()
+    labels = parts[1].str.strip() if parts.shape[1] > 1 else pd.Series(pd.NA, index=series.index)
+    return codes, labels
+
+
+def _filter_mask(dims: pd.DataFrame, filters: dict, geo_levels) -> pd.Series:
+    mask = pd.Series(True, index=dims.index)
+    for column, wanted in filters.items():
+        if column not in dims:
+            raise ValueError(f"Plik nie zawiera wymiaru {column!r}")
+        allowed = {wanted} if isinstance(wanted, str) else set(wanted)
+        mask &= dims[column].isin(allowed)
+    if geo_levels is not None:
+        mask &= (dims["geo"].str.len() - 2).isin(set(geo_levels))
+    return mask
+
+
+def _iter_tsv(path: str, filters: dict, geo_levels, chunk_rows: int, keep_dims=()):
+    reader = pd.read_csv(
+        path, sep="\t", dtype=str, chunksize=chunk_rows,
+        compression="infer", keep_default_na=False,
+    )
+    for chunk in reader:
+        key_column = chunk.columns[0]
+        names = key_column.split("\\", 1)[0].split(",")
+        dims = chunk[key_column].str.split(",", expand=True)
+        dims.columns = [name.strip() for name in names]
+        for column in dims:
+            dims[column] = dims[column].str.strip()
+        mask = _filter_mask(dims, filters, geo_levels)
+        if not mask.any():
+            continue
+
+        years = [col for col in chunk.columns[1:] if YEAR_COLUMN.match(col.strip())]
+        wide = chunk.loc[mask, years]
+        wide.columns = [col.strip() for col in years]
+        id_vars = ["geo", *keep_dims]
+        for position, column in enumerate(id_vars):
+            wide.insert(position, column, dims.loc[mask, column].to_numpy())
+        long = wide.melt(id_vars=id_vars, var_name="TIME_PERIOD", value_name="_cell")
+        values, flags = parse_cells(long.pop("_cell").replace("", pd.NA))
+        long["TIME_PERIOD"] = long["TIME_PERIOD"].astype(int)
+        long["name"] = pd.NA
+        long["OBS_VALUE"] = values.to_numpy(dtype=float)
+        long["OBS_FLAG"] = flags.fillna("").to_numpy(dtype=object)
+        yield long
+
+
+def _iter_sdmx_csv(path: str, filters: dict, geo_levels, chunk_rows: int, keep_dims=()):
+    reader = pd.read_csv(
+        path, dtype=str, chunksize=chunk_rows, compression="infer", keep_default_na=False,
+    )
+    for chunk in reader:
+        dims = pd.DataFrame(index=chunk.index)
+        labels = None
+        for column in dict.fromkeys([*filters, *keep_dims, "geo"]):
+            if column not in chunk:
+                raise ValueError(f"Plik nie zawiera wymiaru {column!r}")
+            codes, column_labels = _split_label(chunk[column])
+            dims[column] = codes
+            if column == "geo":
+                labels = column_labels
+        mask = _filter_mask(dims, filters, geo_levels)
+        time = chunk["TIME_PERIOD"].str.strip()
+        mask &= time.str.match(YEAR_COLUMN.pattern)
+        if not mask.any():
+            continue
+
+        values = pd.to_numeric(chunk.loc[mask, "OBS_VALUE"].str.strip(), errors="coerce")
+        flags = chunk["OBS_FLAG"] if "OBS_FLAG" in chunk else pd.Series("", index=chunk.index)
+        yield pd.DataFrame({
+            "geo": dims.loc[mask, "geo"].to_numpy(),
+            **{column: dims.loc[mask, column].to_numpy() for column in keep_dims},
+            "TIME_PERIOD": time[mask].astype(int).to_numpy(),
+            "name": labels[mask].to_numpy(),
+            "OBS_VALUE": values.to_numpy(dtype=float),
+            "OBS_FLAG": flags[mask].str.strip().to_numpy(dtype=object),
+        })
+
+
+def read_bulk(path: str, filters: dict, geo_levels=None, labels: dict = None,
+              chunk_rows: int = BULK_CHUNK_ROWS, keep_dims=()) -> pd.DataFrame:
+    keep_dims = list(keep_dims)
+    fmt = detect_format(path)
+    iterate = _iter_tsv if fmt == "tsv" else _iter_sdmx_csv
+    with span("load.bulk_parse", path=path, format=fmt):
+        parts = [
+            part[part["OBS_VALUE"].notna()]
+            for part in iterate(path, filters, geo_levels, chunk_rows, keep_dims)
+        ]
+    if not parts:
+        return pd.DataFrame(columns=LONG_COLUMNS + keep_dims)
+
+    long = pd.concat(parts, ignore_index=True)
+    long = long.drop_duplicates(subset=["geo", *keep_dims, "TIME_PERIOD"], keep="first")
+    names = long["name"].astype("object")
+    if labels:
+        names = long["geo"].map(labels).fillna(names)
+    long["name"] = names.fillna(long["geo"]).astype(str)
+    long = long.sort_values(["TIME_PERIOD", "geo"], kind="stable")
+    return long[LONG_COLUMNS + keep_dims].reset_index(drop=True)
+
+
+class BulkDataCatalog(SnapshotCatalog):
+    def __init__(self, ev_path: str, env_path: str, cache_dir: str = None,
+                 ev_filters: dict = None, ev_units: dict = None, env_filters: dict = None,
+                 geo_levels=(0, 1, 2), labels: dict = None):
+        cfg = Config()
+        self.ev_path = ev_path
+        self.env_path = env_path
+        self.ev_filters = dict(ev_filters if ev_filters is not None else cfg.ev_bulk_filters)
+        self.ev_units = dict(ev_units if ev_units is not None else cfg.ev_bulk_units)
+        self.env_filters = dict(env_filters if env_filters is not None else cfg.env_bulk_filters)
+        self.geo_levels = tuple(geo_levels) if geo_levels is not None else None
+        self.labels = labels or {}
+        super().__init__(cache_dir)
+
+    def _snapshot_name(self, source: str) -> str:
+        if source == "ev":
+            settings = {"filters": self.ev_filters, "units": self.ev_units}
+        else:
+            settings = {"filters": self.env_filters, "names": self.name_to_code}
+        payload = json.dumps(
+            {**settings, "levels": self.geo_levels, "labels": self.labels}, sort_keys=True
+        )
+        return f"bulk_{source}-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _parse_ev(self) -> dict:
+        # Obie jednostki w jednym przebiegu po pliku, podział po kolumnie "unit".
+        units = [self.ev_units[EV_COUNTS], self.ev_units[EV_SHARE]]
+        ev = read_bulk(
+            self.ev_path, {**self.ev_filters, "unit": units},
+            self.geo_levels, self.labels, keep_dims=["unit"],
+        )
+        ev_counts, ev_share = (
+            ev[ev["unit"] == unit].drop(columns=["unit"]).reset_index(drop=True)
+            for unit in units
+        )
+        countries = ev_counts.drop_duplicates("geo")
+        countries = countries[countries["geo"].str.len() == 2]
+        self.name_to_code = dict(zip(countries["name"], countries["geo"]))
+        return {EV_COUNTS: ev_counts, EV_SHARE: ev_share}
+
+    def _parse_env(self) -> dict:
+        code_to_name = {code: name for name, code in self.name_to_code.items()}
+        # Kolumna geo zostaje: bez etykiet w pliku TSV nazwy są kodami.
+        env = read_bulk(self.env_path, self.env_filters, None, {**code_to_name, **self.labels})
+        return {ENV: env}
+
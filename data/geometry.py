@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from common.config import Config
+from core.tracing import span, traced
+from data.nuts_hierarchy import HIERARCHY_COLUMNS, NUTS_LEVELS, NutsHierarchy
+from data.snapshot import file_fingerprint
+from data.topology import encode_topology
+
+NUTS_COLUMNS = ["NUTS_ID", "CNTR_CODE", "NAME_LATN", "LEVL_CODE", "geometry"]
+GEOMETRY_CACHE_VERSION = 1
+EUROPE = "EU"
+# Ramka (lon/lat) kontynentu; regiony zamorskie spoza niej nie poszerzają
+# zasięgu kraju, inaczej Francja obejmowałaby Gujanę i Reunion.
+EUROPE_FRAME = (-25.0, 27.0, 45.0, 72.0)
+BOUNDS_COLUMNS = ["minx", "miny", "maxx", "maxy"]
+
+
+class CountryPartitions:
+    def __init__(self, rows: dict, bounds: dict):
+        self._rows = rows
+        self._bounds = bounds
+
+    @classmethod
+    @traced("load.geometry_partitions")
+    def from_frame(cls, gdf: gpd.GeoDataFrame) -> "CountryPartitions":
+        if "CNTR_CODE" in gdf:
+            countries = gdf["CNTR_CODE"].astype(str)
+        else:
+            countries = gdf["NUTS_ID"].astype(str).str[:2]
+        bounds = pd.DataFrame(shapely.bounds(gdf.geometry.values), columns=BOUNDS_COLUMNS)
+        bounds["country"] = countries.to_numpy()
+
+        minx, miny, maxx, maxy = EUROPE_FRAME
+        center_x = (bounds["minx"] + bounds["maxx"]) / 2
+        center_y = (bounds["miny"] + bounds["maxy"]) / 2
+        in_frame = center_x.between(minx, maxx) & center_y.between(miny, maxy)
+        framed = bounds[in_frame]
+
+        aggregations = {"minx": "min", "miny": "min", "maxx": "max", "maxy": "max"}
+        per_country = bounds.groupby("country").agg(aggregations)
+        per_country.update(framed.groupby("country").agg(aggregations))
+
+        rows = {country: np.asarray(index) for country, index in bounds.groupby("country").indices.items()}
+        rows[EUROPE] = np.arange(len(bounds))
+        limits = {
+            country: tuple(float(v) for v in values)
+            for country, values in zip(per_country.index, per_country[BOUNDS_COLUMNS].to_numpy())
+            if np.isfinite(values).all()
+        }
+        total = framed[BOUNDS_COLUMNS].agg(["min", "max"])
+        limits[EUROPE] = (
+            (float(total.at["min", "minx"]), float(total.at["min", "miny"]),
+             float(total.at["max", "maxx"]), float(total.at["max", "maxy"]))
+            if len(framed) else EUROPE_FRAME
+        )
+        return cls(rows, limits)
+
+    def countries(self) -> list:
+        return sorted(code for code in self._rows if code != EUROPE and code in self._bounds)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._rows
+
+    def rows(self, code: str) -> np.ndarray:
+        return self._rows[code]
+
+    def bounds(self, code: str) -> tuple:
+        return self._bounds[code]
+
+
+class NutsGeometryCache:
+    _shared = None
+
+    def __init__(self, source_path: str = None, cache_dir: str = None):
+        cfg = Config()
+        self.source_path = source_path or cfg.nuts_geojson_path
+        self.cache_dir = cache_dir or cfg.geometry_cache_dir
+        self._key = None
+        self._levels = {}
+        self._partitions = {}
+        self._topologies = {}
+        self._hierarchy = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "NutsGeometryCache":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @classmethod
+    def set_shared(cls, cache: "NutsGeometryCache"):
+        cls._shared = cache
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            payload = json.dumps(
+                {"version": GEOMETRY_CACHE_VERSION, "source": file_fingerprint(self.source_path)},
+                sort_keys=True,
+            )
+            self._key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+        return self._key
+
+    def partitions(self, level: int) -> CountryPartitions:
+        with self._lock:
+            self._load_level(level)
+            return self._partitions[level]
+
+    def hierarchy(self) -> NutsHierarchy:
+        with self._lock:
+            if self._hierarchy is None:
+                self._hierarchy = NutsHierarchy.from_frames(
+                    [self._level_attributes(level) for level in NUTS_LEVELS]
+                )
+            return self._hierarchy
+
+    def _level_attributes(self, level: int) -> pd.DataFrame:
+        path = self._level_path(level)
+        if level not in self._levels and os.path.exists(path):
+            # Do hierarchii wystarczą kody i nazwy, bez wczytywania geometrii.
+            try:
+                return pd.read_feather(path, columns=HIERARCHY_COLUMNS)
+            except Exception as e:
+                print(f"⚠️ Nie udało się wczytać kodów NUTS z {path}: {e}")
+        return self._load_level(level)
+
+    def _level_path(self, level: int) -> str:
+        return os.path.join(self.cache_dir, f"nuts-{self.key}-L{level}.feather")
+
+    def _topology_path(self, level: int, region: str, quantization: int, simplify: float) -> str:
+        name = f"nuts-{self.key}-L{level}-{region}-q{quantization}-s{simplify:g}.topo.json"
+        return os.path.join(self.cache_dir, name)
+
+    def topology(self, level: int, region: str = EUROPE) -> str:
+        with self._lock:
+            key = (level, region)
+            if key not in self._topologies:
+                self._topologies[key] = self._load_topology(level, region)
+            return self._topologies[key]
+
+    def _load_topology(self, level: int, region: str) -> str:
+        cfg = Config()
+        path = self._topology_path(level, region, cfg.topology_quantization, cfg.topology_simplify)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read()
+            except OSError as e:
+                print(f"⚠️ Nie udało się wczytać topologii z {path}: {e}")
+
+        gdf = self._load_level(level)
+        rows = self._partitions[level].rows(region)
+        topology = json.dumps(encode_topology(
+            gdf["NUTS_ID"].to_numpy()[rows].tolist(), gdf.geometry.values[rows],
+            cfg.topology_quantization, cfg.topology_simplify,
+        ), separators=(",", ":"))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(topology)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"⚠️ Nie udało się zapisać topologii: {e}")
+        return topology
+
+    def level(self, level: int) -> gpd.GeoDataFrame:
+        with self._lock:
+            return self._load_level(level)
+
+    def _load_level(self, level: int) -> gpd.GeoDataFrame:
+        if level not in self._levels:
+            self._levels[level] = self._read_level(level)
+        if level not in self._partitions:
+            # Podział na kraje liczony raz przy wczytaniu geometrii, żeby
+            # przybliżenie kraju było tylko odczytem ze słownika.
+            self._partitions[level] = CountryPartitions.from_frame(self._levels[level])
+        return self._levels[level]
+
+    def _read_level(self, level: int) -> gpd.GeoDataFrame:
+        path = self._level_path(level)
+        gdf = None
+        if os.path.exists(path):
+            try:
+                with span("load.geometry_feather", level=level):
+                    gdf = gpd.read_feather(path)
+            except Exception as e:
+                print(f"⚠️ Nie udało się wczytać geometrii z {path}: {e}")
+
+        if gdf is None:
+            levels = self.preprocess()
+            self._levels.update(levels)
+            gdf = levels[level]
+        return gdf
+
+    @traced("load.geometry_preprocess")
+    def preprocess(self) -> dict:
+        source = gpd.read_file(self.source_path)
+        source = source[[col for col in NUTS_COLUMNS if col in source.columns]]
+        levels = {
+            level: source[source["LEVL_CODE"] == level].reset_index(drop=True)
+            for level in NUTS_LEVELS
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for level, gdf in levels.items():
+                tmp_path = self._level_path(level) + ".tmp"
+                gdf.to_feather(tmp_path)
+                os.replace(tmp_path, self._level_path(level))
+            self._prune()
+        except (ImportError, OSError) as e:
+            print(f"⚠️ Nie udało się zapisać pamięci podręcznej geometrii: {e}")
+        return levels
+
+    def _prune(self):
+        for entry in os.listdir(self.cache_dir):
+            if entry.startswith("nuts-") and not entry.startswith(f"nuts-{self.key}-"):
+                os.remove(os.path.join(self.cache_dir, entry))
+
+
+if __name__ == "__main__":
+    cache = NutsGeometryCache(*sys.argv[1:2])
+    for lvl, frame in cache.preprocess().items():
+        print(f"NUTS{lvl}: {len(frame)} regionów -> {cache._level_path(lvl)}")
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+class GeoYearMatrix:
+    def __init__(self, geos, years, values: np.ndarray):
+        self.geos = np.asarray(geos, dtype=object)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = values
+        self.mask = ~np.isnan(values)
+        self.geo_index = {geo: i for i, geo in enumerate(self.geos)}
+        self.year_index = {int(year): j for j, year in enumerate(self.years)}
+        filled = np.where(self.mask, values, 0.0)
+        zeros = np.zeros((len(self.geos), 1))
+        self.cum_sum = np.concatenate([zeros, np.cumsum(filled, axis=1)], axis=1)
+        self.cum_count = np.concatenate([zeros, np.cumsum(self.mask, axis=1)], axis=1)
+        for array in (self.values, self.mask, self.cum_sum, self.cum_count):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_long(
+        cls,
+        df: pd.DataFrame,
+        geo_col: str = "geo",
+        year_col: str = "TIME_PERIOD",
+        value_col: str = "OBS_VALUE",
+    ) -> "GeoYearMatrix":
+        geo_codes, geos = pd.factorize(df[geo_col], sort=True)
+        year_codes, years = pd.factorize(df[year_col], sort=True)
+        values = np.full((len(geos), len(years)), np.nan)
+        # Przy duplikatach wygrywa pierwszy wiersz, tak jak przy dawnym row.iloc[0];
+        # kolejność zapisu przy powtórzonych indeksach nie jest w numpy gwarantowana.
+        cells = geo_codes * len(years) + year_codes
+        _, first = np.unique(cells, return_index=True)
+        values.flat[cells[first]] = df[value_col].to_numpy(dtype=float)[first]
+        return cls(list(geos), [int(y) for y in years], values)
+
+    def __contains__(self, geo) -> bool:
+        return geo in self.geo_index
+
+    def geo_codes(self, geos) -> np.ndarray:
+        return np.array([self.geo_index.get(geo, -1) for geo in geos], dtype=np.int64)
+
+    def get(self, geo: str, year: int, default=None):
+        i = self.geo_index.get(geo)
+        j = self.year_index.get(year)
+        if i is None or j is None or not self.mask[i, j]:
+            return default
+        return self.values[i, j]
+
+    def row(self, geo: str):
+        i = self.geo_index.get(geo)
+        if i is None:
+            return None
+        return self.values[i]
+
+    def column(self, year: int):
+        j = self.year_index.get(year)
+        if j is None:
+            return None
+        return self.values[:, j]
+
+    def _year_span(self, start, end):
+        lo = 0 if start is None else int(np.searchsorted(self.years, start, side="left"))
+        hi = len(self.years) if end is None else int(np.searchsorted(self.years, end, side="right"))
+        return lo, max(lo, hi)
+
+    def range_sum(self, start=None, end=None, rows=None) -> np.ndarray:
+        lo, hi = self._year_span(start, end)
+        cum = self.cum_sum if rows is None else self.cum_sum[rows]
+        return cum[:, hi] - cum[:, lo]
+
+    def range_count(self, start=None, end=None, rows=None) -> np.ndarray:
+        lo, hi = self._year_span(start, end)
+        cum = self.cum_count if rows is None else self.cum_count[rows]
+        return cum[:, hi] - cum[:, lo]
+
+    def range_mean(self, start=None, end=None, rows=None) -> np.ndarray:
+        sums = self.range_sum(start, end, rows)
+        counts = self.range_count(start, end, rows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
@@ -0,0 +1,150 @@
+import os
+from collections import namedtuple
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from common.config import Config
+from core.tasks import run_in_background
+from core.tracing import span
+
+GEOMETRY = "geometry"
+
+ReloadResult = namedtuple("ReloadResult", ["sources", "repository", "geometry", "prepared"])
+
+
+def _stamp(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DataReloader(QObject):
+    reloaded = pyqtSignal(list)
+    reloadFailed = pyqtSignal(str)
+
+    def __init__(self, service, parent=None, debounce_ms: int = None):
+        super().__init__(parent)
+        self.service = service
+        self.consumers = []
+        self.paths = dict(service.repository.catalog.sources())
+        self.paths[GEOMETRY] = Config().nuts_geojson_path
+        self.paths = {source: os.path.abspath(path) for source, path in self.paths.items() if path}
+        self.stamps = {source: _stamp(path) for source, path in self.paths.items()}
+        self.pending = set()
+        self.running = False
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_path_changed)
+        self.watcher.directoryChanged.connect(self.on_path_changed)
+        self.watch()
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(debounce_ms if debounce_ms is not None else Config().reload_debounce_ms)
+        self.debounce.timeout.connect(self.check_changes)
+
+    def register(self, consumer):
+        if consumer not in self.consumers:
+            self.consumers.append(consumer)
+
+    def watch(self):
+        # ETL podmienia pliki przez rename, po którym watcher gubi ścieżkę pliku,
+        # dlatego obserwujemy też katalogi i dopinamy pliki ponownie.
+        files = set(self.watcher.files())
+        directories = set(self.watcher.directories())
+        for path in self.paths.values():
+            directory = os.path.dirname(path)
+            if directory not in directories and os.path.isdir(directory):
+                self.watcher.addPath(directory)
+                directories.add(directory)
+            if path not in files and os.path.exists(path):
+                self.watcher.addPath(path)
+
+    def on_path_changed(self, _path: str):
+        self.watch()
+        self.debounce.start()
+
+    def check_changes(self):
+        for source, path in self.paths.items():
+            stamp = _stamp(path)
+            if stamp is not None and stamp != self.stamps.get(source):
+                self.stamps[source] = stamp
+                self.pending.add(source)
+        self.start_reload()
+
+    def start_reload(self):
+        if self.running or not self.pending:
+            return
+        sources, self.pending = sorted(self.pending), set()
+        self.running = True
+        repository = self.service.repository
+        geometry = None
+        if GEOMETRY in sources:
+            from data.geometry import NutsGeometryCache
+            current = NutsGeometryCache.shared()
+            geometry = NutsGeometryCache(self.paths[GEOMETRY], current.cache_dir)
+        consumers = list(self.consumers)
+        print(f"⏱️ Przeładowywanie danych: {', '.join(sources)}")
+        run_in_background(
+            lambda: self._reload(sources, repository, geometry, consumers),
+            self._on_reloaded,
+            self._on_failed,
+        )
+
+    def _reload(self, sources, repository, geometry, consumers) -> ReloadResult:
+        from data.repository import ExcelVehicleDataRepository
+
+        with span("load.reload", sources=",".join(sources)):
+            data_sources = [source for source in sources if source != GEOMETRY]
+            if data_sources:
+                catalog = repository.catalog.reloaded(data_sources)
+                repository = ExcelVehicleDataRepository(None, None, catalog=catalog)
+            prepared = [
+                (consumer, consumer.prepare_reload(repository, geometry))
+                for consumer in consumers
+            ]
+        return ReloadResult(sources, repository, geometry, prepared)
+
+    def _on_reloaded(self, result: ReloadResult):
+        from data.geometry import NutsGeometryCache
+
+        self.running = False
+        prepared = dict(result.prepared)
+        try:
+            # Wszystkie nowe dane powstają przed podmianą; apply_reload tylko przestawia
+            # referencje, więc widoki nie zostaną z mieszanką starych i nowych danych.
+            payloads = [
+                (consumer, prepared[consumer] if consumer in prepared
+                 else consumer.prepare_reload(result.repository, result.geometry))
+                for consumer in self.consumers
+            ]
+        except Exception as e:
+            self._on_failed(str(e))
+            return
+
+        previous = [(consumer, consumer.reload_payload()) for consumer, _ in payloads]
+        previous_repository, previous_geometry = self.service.repository, NutsGeometryCache._shared
+        try:
+            with self.service.state.batch():
+                if result.geometry is not None:
+                    NutsGeometryCache.set_shared(result.geometry)
+                self.service.set_repository(result.repository)
+                for consumer, payload in payloads:
+                    consumer.apply_reload(payload)
+        except Exception as e:
+            self.service.repository = previous_repository
+            NutsGeometryCache.set_shared(previous_geometry)
+            for consumer, payload in previous:
+                consumer.apply_reload(payload)
+            self._on_failed(str(e))
+            return
+        print(f"✅ Przeładowano dane: {', '.join(result.sources)}")
+        self.reloaded.emit(list(result.sources))
+        self.start_reload()
+
+    def _on_failed(self, message: str):
+        self.running = False
+        print(f"⚠️ Nie udało się przeładować danych, zostają poprzednie: {message}")
+        self.reloadFailed.emit(message)
+        self.start_reload()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from core.tracing import traced
+
+NUTS_LEVELS = (0, 1, 2, 3)
+HIERARCHY_COLUMNS = ["NUTS_ID", "LEVL_CODE", "NAME_LATN"]
+
+
+class NutsHierarchy:
+    def __init__(self, codes, levels, names):
+        self.codes = np.asarray(codes, dtype=object)
+        self.levels = np.asarray(levels, dtype=np.int64)
+        self.names = np.asarray(names, dtype=object)
+        self.index = pd.Index(self.codes)
+
+        # Kod rodzica to kod bez ostatniego znaku (PL9 -> PL91 -> PL911).
+        parent_codes = pd.Series(self.codes).str[:-1].to_numpy(dtype=object)
+        self.parents = np.where(self.levels > 0, self.index.get_indexer(parent_codes), -1)
+
+        self.ancestors = np.full((len(NUTS_LEVELS), len(self.codes)), -1, dtype=np.int64)
+        nodes = np.arange(len(self.codes))
+        current = nodes.copy()
+        for depth in range(max(NUTS_LEVELS), -1, -1):
+            at_depth = (current >= 0) & (self.levels[np.maximum(current, 0)] == depth)
+            self.ancestors[depth, nodes[at_depth]] = current[at_depth]
+            current = np.where(at_depth, self.parents[np.maximum(current, 0)], current)
+
+    @classmethod
+    @traced("load.nuts_hierarchy")
+    def from_frames(cls, frames) -> "NutsHierarchy":
+        table = pd.concat([frame[HIERARCHY_COLUMNS] for frame in frames], ignore_index=True)
+        table = table.drop_duplicates("NUTS_ID").sort_values(["LEVL_CODE", "NUTS_ID"])
+        return cls(table["NUTS_ID"], table["LEVL_CODE"], table["NAME_LATN"].fillna(table["NUTS_ID"]))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def available_levels(self) -> list:
+        return sorted(int(level) for level in np.unique(self.levels))
+
+    def nodes(self, geos) -> np.ndarray:
+        return self.index.get_indexer(pd.Index(geos, dtype=object))
+
+    def at_level(self, level: int) -> np.ndarray:
+        return np.flatnonzero(self.levels == level)
+
+    def ancestor(self, nodes: np.ndarray, level: int) -> np.ndarray:
+        nodes = np.asarray(nodes)
+        return np.where(nodes >= 0, self.ancestors[level, np.maximum(nodes, 0)], -1)
+
+    def _frame(self, df: pd.DataFrame, value_col: str, year_col: str) -> pd.DataFrame:
+        nodes = self.nodes(df["geo"])
+        known = nodes >= 0
+        return pd.DataFrame({
+            "node": nodes[known],
+            "depth": self.levels[nodes[known]],
+            "year": df[year_col].to_numpy()[known],
+            "value": df[value_col].to_numpy(dtype=float)[known],
+        })
+
+    def _rollup(self, frame: pd.DataFrame, level: int, how: str) -> pd.DataFrame:
+        frame = frame[frame["depth"] > level]
+        nodes, years, depths = frame["node"].to_numpy(), frame["year"].to_numpy(), frame["depth"].to_numpy()
+        # Wiersz odpada, gdy jego przodek poniżej poziomu docelowego ma już
+        # wartość w tym roku - zostaje rozłączne pokrycie, więc NUTS2 i NUTS3
+        # nie liczą się podwójnie, a jedna redukcja grupowa daje agregat.
+        present = pd.MultiIndex.from_arrays([nodes, years])
+        covered = np.zeros(len(frame), dtype=bool)
+        for depth in range(level + 1, max(NUTS_LEVELS)):
+            above = self.ancestors[depth, nodes]
+            candidates = (depths > depth) & (above >= 0)
+            covered |= candidates & pd.MultiIndex.from_arrays([above, years]).isin(present)
+        frame = frame[~covered].assign(node=self.ancestors[level, nodes[~covered]])
+        frame = frame[frame["node"] >= 0]
+        grouped = frame.groupby(["node", "year"], sort=True).agg(
+            value=("value", how), depth=("depth", "min")
+        )
+        return grouped.reset_index()[["node", "year", "depth", "value"]]
+
+    def _fill_down(self, frame: pd.DataFrame, level: int) -> pd.DataFrame:
+        frame = frame[frame["depth"] < level]
+        targets = self.at_level(level)
+        links = pd.DataFrame({
+            "source": self.ancestors[:level, targets].ravel(),
+            "target": np.tile(targets, level),
+        })
+        filled = frame.merge(links, left_on="node", right_on="source")
+        filled = filled.sort_values(["target", "year", "depth"], ascending=[True, True, False])
+        filled = filled.drop_duplicates(["target", "year"], keep="first")
+        return filled.assign(node=filled["target"])[["node", "year", "depth", "value"]]
+
+    def _long(self, frame: pd.DataFrame) -> pd.DataFrame:
+        nodes = frame["node"].to_numpy()
+        return pd.DataFrame({
+            "geo": self.codes[nodes],
+            "year": frame["year"].to_numpy(),
+            "value": frame["value"].to_numpy(),
+            "source_level": frame["depth"].to_numpy(),
+        })
+
+    def rollup(self, df: pd.DataFrame, level: int, how: str = "sum",
+               value_col: str = "value", year_col: str = "year") -> pd.DataFrame:
+        return self._long(self._rollup(self._frame(df, value_col, year_col), level, how))
+
+    def fill_down(self, df: pd.DataFrame, level: int,
+                  value_col: str = "value", year_col: str = "year") -> pd.DataFrame:
+        return self._long(self._fill_down(self._frame(df, value_col, year_col), level))
+
+    @traced("aggregate.nuts_level")
+    def complete(self, df: pd.DataFrame, level: int, how: str = "mean",
+                 value_col: str = "value", year_col: str = "year") -> pd.DataFrame:
+        frame = self._frame(df, value_col, year_col)
+        own = frame[frame["depth"] == level]
+        combined = pd.concat(
+            [own, self._rollup(frame, level, how), self._fill_down(frame, level)],
+            ignore_index=True,
+        )
+        # Kolejność pierwszeństwa: własna wartość, agregat z dzieci, wartość przodka.
+        combined = combined.drop_duplicates(["node", "year"], keep="first")
+        return self._long(combined.sort_values(["node", "year"]))
@@ -1,147 +1,54 @@
-import pandas as pd
+from common.config import Config
+from core.tracing import traced
+from data.catalog import DataCatalog, ENV, EV_COUNTS
+from data.indexed_store import GeoYearMatrix
 
-class ExcelVehicleDataRepository:
-    def __init__(self, ev_path: str, env_path: str):
-
-        ev_raw = pd.read_excel(
-            ev_path,
-            sheet_name="Sheet 3",
-            skiprows=8,
-            engine="openpyxl",
-        )
-        ev_raw = ev_raw.rename(
-            columns={
-                "TIME": "GEO (Codes)",
-                "TIME.1": "GEO (Labels)",
-                "Unnamed: 3": "_drop1",
-                "Unnamed: 5": "_drop2",
-                "Unnamed: 7": "_drop3",
-                "Unnamed: 9": "_drop4",
-                "Unnamed: 11": "_drop5",
-            }
-        )
-        ev_raw = ev_raw.drop(columns=["_drop1", "_drop2", "_drop3", "_drop4", "_drop5"])\
-            .iloc[1:]
-        self.ev_data = ev_raw
-        self.name_to_code = {
-            str(row["GEO (Labels)"]).strip(): str(row["GEO (Codes)"]).strip()
-            for _, row in self.ev_data.iterrows()
-            if len(str(row["GEO (Codes)"]).strip()) == 2
-        }
-
-        self.records = []
-        year_columns_ev = {
-            "2018": 2018,
-            "2019": 2019,
-            "2020": 2020,
-            "2021": 2021,
-            "2022": 2022,
-        }
-
-        for _, row in self.ev_data.iterrows():
-            geo = str(row["GEO (Codes)"]).strip()
-            if len(geo) == 2:
-                for col_name, year in year_columns_ev.items():
-                    val = row.get(col_name)
-                    if pd.notna(val):
-                        try:
-                            numeric_val = float(val)
-                            self.records.append({
-                                "geo": geo,
-                                "TIME_PERIOD": year,
-                                "OBS_VALUE": numeric_val
-                            })
-                        except Exception:
-                            continue
+LONG_COLUMNS = ["geo", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
 
-        self.df = pd.DataFrame(self.records)
+class ExcelVehicleDataRepository:
+    def __init__(self, ev_path: str, env_path: str, cache_dir: str = None, catalog: DataCatalog = None):
+        if catalog is None:
+            catalog = DataCatalog(ev_path, env_path, cache_dir)
+        self.catalog = catalog
+        self.name_to_code = catalog.name_to_code
 
-        env_raw = pd.read_excel(
-            env_path,
-            sheet_name="Sheet 1",
-            skiprows=8,
-            engine="openpyxl",
-        )
-        env_raw = env_raw.rename(
-            columns={
-                "TIME": "GEO (Labels)",
-                "Unnamed: 2": "_drop1",
-                "Unnamed: 4": "_drop2",
-                "Unnamed: 6": "_drop3",
-                "Unnamed: 8": "_drop4",
-                "Unnamed: 10": "_drop5",
-                "Unnamed: 12": "_drop6",
-                "Unnamed: 14": "_drop7",
-                "Unnamed: 16": "_drop8",
-                "Unnamed: 18": "_drop9",
-                "Unnamed: 20": "_drop10",
-            }
-        )
-        env_raw = env_raw.drop(columns=[
-            "_drop1",
-            "_drop2",
-            "_drop3",
-            "_drop4",
-            "_drop5",
-            "_drop6",
-            "_drop7",
-            "_drop8",
-            "_drop9",
-            "_drop10",
-        ]).iloc[1:]
-        self.env_data = env_raw
+        ev_counts = catalog.table(EV_COUNTS)
+        self.df = ev_counts.loc[ev_counts["geo"].str.len() == 2, LONG_COLUMNS]\
+            .reset_index(drop=True)
 
-        self.env_records = []
-        year_columns_env = {
-            "2013": 2013,
-            "2014": 2014,
-            "2015": 2015,
-            "2016": 2016,
-            "2017": 2017,
-            "2018": 2018,
-            "2019": 2019,
-            "2020": 2020,
-            "2021": 2021,
-            "2022": 2022,
-        }
+        env = catalog.table(ENV)
+        codes = env["geo"] if "geo" in env else env["name"].map(self.name_to_code)
+        env = env.assign(geo=codes.where(codes.isin(set(self.name_to_code.values()))))
+        self.env_df = env.loc[env["geo"].notna(), LONG_COLUMNS].reset_index(drop=True)
 
-        for _, row in self.env_data.iterrows():
-            label = str(row["GEO (Labels)"]).strip()
-            geo = self.name_to_code.get(label)
-            if geo:
-                for col_name, year in year_columns_env.items():
-                    val = row.get(col_name)
-                    if pd.notna(val):
-                        try:
-                            numeric_val = float(val)
-                            self.env_records.append({
-                                "geo": geo,
-                                "TIME_PERIOD": year,
-                                "OBS_VALUE": numeric_val,
-                            })
-                        except Exception:
-                            continue
+        self._build_index()
 
-        self.env_df = pd.DataFrame(self.env_records)
+    @traced("load.index")
+    def _build_index(self):
+        self.ev_index = GeoYearMatrix.from_long(self.df)
+        self.env_index = GeoYearMatrix.from_long(self.env_df)
 
     def get_all_countries(self):
-        countries = self.df["geo"].dropna().unique()
-        return sorted(set(countries))
+        return list(self.ev_index.geos)
 
     def get_available_years(self):
-        return sorted(self.df["TIME_PERIOD"].unique())
+        return self.ev_index.years.tolist()
 
     def get_vehicle_data(self, country: str, year: int):
         return self.get_ev_share_data(country, year)
 
     def get_ev_share_data(self, country: str, year: int):
-        row = self.df[(self.df["geo"] == country) & (self.df["TIME_PERIOD"] == year)]
-        if not row.empty:
-            return row.iloc[0]["OBS_VALUE"]
-        return None
+        return self.ev_index.get(country, year)
 
     def get_env_data(self, country: str, year: int):
-        row = self.env_df[(self.env_df["geo"] == country) & (self.env_df["TIME_PERIOD"] == year)]
-        if not row.empty:
-            return row.iloc[0]["OBS_VALUE"]
-        return None
+        return self.env_index.get(country, year)
+
+
+def load_repository() -> ExcelVehicleDataRepository:
+    config = Config()
+    if config.data_source == "bulk":
+        from data.eurostat_bulk import BulkDataCatalog
+        catalog = BulkDataCatalog(config.ev_bulk_path, config.env_bulk_path)
+    else:
+        catalog = DataCatalog(config.ev_data_path, config.env_data_path)
+    return ExcelVehicleDataRepository(catalog.ev_path, catalog.env_path, catalog=catalog)
@@ -0,0 +1,81 @@
+import re
+
+import pandas as pd
+from core.tracing import traced
+
+YEAR_COLUMN = re.compile(r"^\d{4}$")
+MISSING_PLACEHOLDER = ":"
+_CELL_PATTERN = r"^(?P<number>[-+]?[\d\s.,]*\d)?\s*(?P<flag>:?\s*[a-z]*)$"
+
+
+def year_columns(raw: pd.DataFrame) -> list:
+    return [col for col in raw.columns if YEAR_COLUMN.match(str(col).strip())]
+
+
+def _flag_columns(raw: pd.DataFrame, years: list) -> list:
+    columns = list(raw.columns)
+    flags = []
+    for col in years:
+        pos = columns.index(col) + 1
+        if pos < len(columns) and str(columns[pos]).startswith("Unnamed:"):
+            flags.append(columns[pos])
+        else:
+            flags.append(None)
+    return flags
+
+
+def parse_cells(cells: pd.Series):
+    values = pd.to_numeric(cells, errors="coerce")
+    flags = pd.Series(pd.NA, index=values.index, dtype="string")
+
+    text_mask = values.isna() & cells.notna()
+    if text_mask.any():
+        text = cells[text_mask].astype("string").str.strip().str.lower()
+        parts = text.str.extract(_CELL_PATTERN)
+        # Spacje rozdzielają tysiące, przecinek jest separatorem dziesiętnym;
+        # kilka przecinków daje wartość niejednoznaczną, więc pozostaje pusta.
+        numbers = pd.to_numeric(
+            parts["number"].str.replace(r"\s", "", regex=True).str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
+        inline = parts["flag"].str.replace(r"\s+", "", regex=True).replace("", pd.NA)
+        values.loc[text_mask] = numbers.to_numpy()
+        flags.loc[text_mask] = inline.to_numpy()
+    return values, flags
+
+
+@traced("load.reshape")
+def wide_to_long(
+    raw: pd.DataFrame,
+    id_columns: list,
+    year_name: str = "TIME_PERIOD",
+    value_name: str = "OBS_VALUE",
+    flag_name: str = "OBS_FLAG",
+    keep_missing: bool = False,
+) -> pd.DataFrame:
+    years = year_columns(raw)
+    flag_cols = _flag_columns(raw, years)
+
+    frame = raw[years].copy()
+    for col in id_columns:
+        frame[col] = raw[col].astype(str).str.strip()
+    long = frame.melt(
+        id_vars=id_columns, value_vars=years, var_name=year_name, value_name="_cell"
+    )
+    long[year_name] = long[year_name].astype(str).str.strip().astype(int)
+    cells = long.pop("_cell")
+
+    side = pd.DataFrame(
+        {year: raw[col] if col is not None else None for year, col in zip(years, flag_cols)},
+        index=raw.index,
+    )
+    side_flags = side.melt(value_vars=years)["value"].astype("string").str.strip()
+
+    values, flags = parse_cells(cells)
+    flags = flags.fillna(side_flags.replace("", pd.NA).set_axis(flags.index))
+    long[value_name] = values.astype(float).to_numpy()
+    long[flag_name] = flags.fillna("").to_numpy(dtype=object)
+
+    if not keep_missing:
+        long = long[long[value_name].notna()]
+    return long.reset_index(drop=True)
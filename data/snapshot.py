@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from core.tracing import traced
+
+SNAPSHOT_VERSION = 3
+
+
+def file_fingerprint(path: str) -> dict:
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+class SnapshotCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def make_key(self, name: str, source_paths) -> str:
+        fingerprints = [file_fingerprint(p) for p in source_paths]
+        payload = json.dumps(
+            {"name": name, "version": SNAPSHOT_VERSION, "sources": fingerprints},
+            sort_keys=True,
+        )
+        return f"{name}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]}"
+
+    def _snapshot_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    @traced("load.snapshot_read")
+    def load(self, key: str):
+        directory = self._snapshot_dir(key)
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != SNAPSHOT_VERSION:
+                return None
+            tables = {}
+            for table_name, columns in meta["tables"].items():
+                data = {
+                    column: np.load(
+                        os.path.join(directory, f"{table_name}.{column}.npy"),
+                        mmap_mode="r",
+                    ).view(np.ndarray)
+                    for column in columns
+                }
+                # copy=False zostawia kolumny liczbowe na mapowanym pliku; tylko
+                # tekst jest konwertowany, bo pandas nie trzyma napisów stałej długości.
+                tables[table_name] = pd.DataFrame(data, copy=False)
+            return tables, meta.get("extra", {})
+        except Exception as e:
+            print(f"⚠️ Nie udało się wczytać migawki {key}: {e}")
+            return None
+
+    @traced("load.snapshot_write")
+    def store(self, key: str, tables: dict, extra: dict = None) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            meta = {"version": SNAPSHOT_VERSION, "tables": {}, "extra": extra or {}}
+            for table_name, df in tables.items():
+                meta["tables"][table_name] = list(df.columns)
+                for column in df.columns:
+                    values = df[column].to_numpy()
+                    if values.dtype == object:
+                        values = values.astype(str)
+                    np.save(os.path.join(tmp_dir, f"{table_name}.{column}.npy"), values)
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            target = self._snapshot_dir(key)
+            if os.path.exists(target):
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(tmp_dir, target)
+            self._prune(key)
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            print(f"⚠️ Nie udało się zapisać migawki {key}: {e}")
+
+    def _prune(self, current_key: str) -> None:
+        prefix = current_key.rsplit("-", 1)[0] + "-"
+        for entry in os.listdir(self.cache_dir):
+            if entry.startswith(prefix) and entry != current_key:
+                shutil.rmtree(os.path.join(self.cache_dir, entry), ignore_errors=True)
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import shapely
+from core.tracing import traced
+
+DEFAULT_QUANTIZATION = 10_000
+OBJECT_NAME = "regions"
+
+
+def _quantize(coords: np.ndarray, quantization: int):
+    if len(coords):
+        low, high = coords.min(axis=0), coords.max(axis=0)
+    else:
+        low, high = np.zeros(2), np.ones(2)
+    scale = np.where(high > low, (high - low) / (quantization - 1), 1.0)
+    return np.rint((coords - low) / scale).astype(np.int64), scale, low
+
+
+def _ring_points(geometries, quantization: int):
+    parts, part_feature = shapely.get_parts(geometries, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    points, scale, translate = _quantize(coords, quantization)
+
+    # Zamknięcie pierścienia i punkty sklejone przez kwantyzację nie niosą informacji.
+    ring_start = np.r_[True, coord_ring[1:] != coord_ring[:-1]]
+    ring_end = np.r_[ring_start[1:], True]
+    same_as_prev = np.r_[False, (points[1:] == points[:-1]).all(axis=1)]
+    keep = ~ring_end & ~(same_as_prev & ~ring_start)
+    points, coord_ring = points[keep], coord_ring[keep]
+
+    starts = np.flatnonzero(np.r_[True, coord_ring[1:] != coord_ring[:-1]])
+    ends = np.r_[starts[1:], len(coord_ring)]
+    wraps = (points[ends - 1] == points[starts]).all(axis=1) & (ends - starts > 1)
+    if wraps.any():
+        drop = np.zeros(len(points), dtype=bool)
+        drop[ends[wraps] - 1] = True
+        points, coord_ring = points[~drop], coord_ring[~drop]
+        starts = np.flatnonzero(np.r_[True, coord_ring[1:] != coord_ring[:-1]])
+        ends = np.r_[starts[1:], len(coord_ring)]
+
+    ring_ids = coord_ring[starts]
+    return (points, starts, ends, ring_ids, ring_part, part_feature,
+            len(rings), scale, translate)
+
+
+def _junctions(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    lengths = ends - starts
+    prev = np.roll(keys, 1)
+    prev[starts] = keys[ends - 1]
+    following = np.roll(keys, -1)
+    following[ends - 1] = keys[starts]
+    # Punkt jest węzłem, gdy w różnych pierścieniach ma różnych sąsiadów -
+    # tam zaczyna się lub kończy wspólna granica.
+    neighbours = pd.DataFrame({
+        "key": keys,
+        "low": np.minimum(prev, following),
+        "high": np.maximum(prev, following),
+    }).drop_duplicates()
+    counts = neighbours["key"].value_counts()
+    is_junction = np.isin(keys, counts.index[counts > 1].to_numpy())
+    is_junction[np.repeat(lengths < 3, lengths)] = False
+    return is_junction
+
+
+class _ArcIndex:
+    def __init__(self):
+        self.arcs = []
+        self._lookup = {}
+
+    def add(self, keys: np.ndarray, points: np.ndarray) -> int:
+        forward = keys.tobytes()
+        index = self._lookup.get(forward)
+        if index is not None:
+            return index
+        index = self._lookup.get(keys[::-1].tobytes())
+        if index is not None:
+            return ~index
+        self._lookup[forward] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+
+def _ring_arcs(arc_index: _ArcIndex, keys, points, is_junction) -> list:
+    cuts = np.flatnonzero(is_junction)
+    if not len(cuts):
+        # Pierścień bez węzłów (wyspa, enklawa) zaczyna się od najmniejszego
+        # punktu, żeby ta sama granica opisana przez sąsiada dała ten sam łuk.
+        first = int(np.argmin(keys))
+        keys, points = np.roll(keys, -first), np.roll(points, -first, axis=0)
+        keys, points = np.r_[keys, keys[:1]], np.r_[points, points[:1]]
+        return [arc_index.add(keys, points)]
+
+    keys = np.r_[np.roll(keys, -cuts[0]), keys[cuts[0]]]
+    points = np.roll(points, -cuts[0], axis=0)
+    points = np.r_[points, points[:1]]
+    bounds = np.r_[cuts - cuts[0], len(keys) - 1]
+    return [
+        arc_index.add(keys[a:b + 1], points[a:b + 1])
+        for a, b in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def _simplify(arcs: list, tolerance: float) -> list:
+    lengths = np.array([len(arc) for arc in arcs])
+    lines = shapely.linestrings(np.concatenate(arcs).astype(float), indices=np.repeat(np.arange(len(arcs)), lengths))
+    simplified = shapely.simplify(lines, tolerance, preserve_topology=False)
+    coords, index = shapely.get_coordinates(simplified, return_index=True)
+    coords = np.rint(coords).astype(np.int64)
+    splits = np.flatnonzero(index[1:] != index[:-1]) + 1
+    result = []
+    for original, reduced in zip(arcs, np.split(coords, splits)):
+        closed = (original[0] == original[-1]).all()
+        result.append(original if closed and len(reduced) < 4 else reduced)
+    return result
+
+
+@traced("serialize.topology")
+def encode_topology(ids, geometries, quantization: int = DEFAULT_QUANTIZATION,
+                    simplify: float = 0.0) -> dict:
+    geometries = np.asarray(geometries, dtype=object)
+    (points, starts, ends, ring_ids, ring_part, part_feature,
+     ring_count, scale, translate) = _ring_points(geometries, quantization)
+    keys = points[:, 0] * quantization + points[:, 1]
+    is_junction = _junctions(keys, starts, ends)
+
+    arc_index = _ArcIndex()
+    ring_arcs = [None] * ring_count
+    for ring, a, b in zip(ring_ids, starts, ends):
+        if b - a >= 3:
+            ring_arcs[ring] = _ring_arcs(arc_index, keys[a:b], points[a:b], is_junction[a:b])
+
+    features = [[] for _ in range(len(geometries))]
+    polygons = {}
+    for ring, part in enumerate(ring_part):
+        arcs = ring_arcs[ring]
+        if part not in polygons:
+            # Bez zewnętrznego pierścienia cały wielokąt przepada.
+            polygons[part] = [] if arcs is not None else None
+            if arcs is not None:
+                features[part_feature[part]].append(polygons[part])
+        if arcs is not None and polygons[part] is not None:
+            polygons[part].append(arcs)
+
+    arcs = arc_index.arcs
+    if simplify and arcs:
+        arcs = _simplify(arcs, simplify)
+
+    objects = []
+    for geo, parts in zip(ids, features):
+        if not parts:
+            geometry = {"type": None}
+        elif len(parts) == 1:
+            geometry = {"type": "Polygon", "arcs": parts[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "arcs": parts}
+        geometry["properties"] = {"geo": geo}
+        objects.append(geometry)
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": scale.tolist(), "translate": translate.tolist()},
+        "objects": {OBJECT_NAME: {"type": "GeometryCollection", "geometries": objects}},
+        "arcs": [np.r_[arc[:1], np.diff(arc, axis=0)].tolist() for arc in arcs],
+    }
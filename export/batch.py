@@ -0,0 +1,365 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+ExportJob = namedtuple(
+    "ExportJob",
+    ["kind", "countries", "year_range", "region", "formats", "stem", "level", "mode"],
+    defaults=(None, None),
+)
+JobResult = namedtuple("JobResult", ["stem", "paths", "error", "elapsed_ms"])
+
+JOB_FORMATS = {
+    "chart": ("pdf", "png", "svg"),
+    "regions_map": ("html", "pdf", "png", "svg"),
+    "countries_map": ("html", "pdf", "png", "svg"),
+}
+DEFAULT_FORMATS = {"chart": ["pdf"], "regions_map": ["html"], "countries_map": ["html"]}
+DEFAULT_REGIONS_LEVEL = 2
+CHART_MODES = ("TOTAL", "EV")
+DEFAULT_CHART_MODE = "TOTAL"
+REGION_MODE = re.compile(r"^(EU|[A-Z]{2})$")
+CHART_SIZE = (8, 5)
+
+_worker = None
+
+
+def load_manifest(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest.get("jobs"), list) or not manifest["jobs"]:
+        raise ValueError("Manifest musi zawierać niepustą listę 'jobs'")
+    return manifest
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_-]+", "-", text).strip("-") or "x"
+
+
+def _group_label(codes: tuple) -> str:
+    if len(codes) <= 5:
+        return "-".join(codes)
+    digest = hashlib.sha1(",".join(codes).encode("utf-8")).hexdigest()[:6]
+    return f"{len(codes)}krajow-{digest}"
+
+
+def _resolve_groups(spec: dict, groups: dict) -> list:
+    if "countries" in spec:
+        entries = [spec["countries"]]
+    else:
+        entries = spec.get("groups", [])
+        if entries == "*":
+            entries = list(groups)
+    resolved = []
+    for entry in entries:
+        if isinstance(entry, str):
+            if entry not in groups:
+                raise ValueError(f"Nieznana grupa krajów: {entry!r}")
+            resolved.append((entry, tuple(groups[entry])))
+        else:
+            codes = tuple(sorted({str(code).upper() for code in entry}))
+            resolved.append((_group_label(codes), codes))
+    if not resolved:
+        raise ValueError("Zadanie 'chart' wymaga 'countries' albo 'groups'")
+    return resolved
+
+
+def _resolve_ranges(spec: dict) -> list:
+    ranges = spec.get("ranges", [spec.get("range")])
+    resolved = []
+    for entry in ranges:
+        if entry is None or entry == "all":
+            resolved.append(None)
+        elif len(entry) == 2 and int(entry[0]) <= int(entry[1]):
+            resolved.append((int(entry[0]), int(entry[1])))
+        else:
+            raise ValueError(f"Niepoprawny zakres lat: {entry!r}")
+    return resolved
+
+
+def expand_jobs(manifest: dict) -> list:
+    groups = manifest.get("groups", {})
+    jobs = []
+    seen = set()
+    for index, spec in enumerate(manifest["jobs"]):
+        kind = spec.get("type")
+        if kind not in JOB_FORMATS:
+            raise ValueError(f"Zadanie {index}: nieznany typ {kind!r}")
+        formats = [fmt.lower() for fmt in spec.get("formats", DEFAULT_FORMATS[kind])]
+        unsupported = sorted(set(formats) - set(JOB_FORMATS[kind]))
+        if unsupported:
+            raise ValueError(f"Zadanie {index}: format {', '.join(unsupported)} nieobsługiwany dla {kind}")
+
+        country_sets = _resolve_groups(spec, groups) if kind == "chart" else [(None, ())]
+        regions = spec.get("regions", ["EU"]) if kind == "regions_map" else [None]
+        for region in regions:
+            if region is not None and not REGION_MODE.match(str(region)):
+                raise ValueError(f"Zadanie {index}: nieznany obszar {region!r}")
+        levels = spec.get("levels", [DEFAULT_REGIONS_LEVEL]) if kind == "regions_map" else [None]
+        for level in levels:
+            if level is not None and level not in (0, 1, 2, 3):
+                raise ValueError(f"Zadanie {index}: nieznany poziom NUTS {level!r}")
+        # Tryb TOTAL/EV dotyczy tylko wykresów; mapy pokazują udział i sumę ENV.
+        if kind == "chart":
+            modes = [str(mode).upper() for mode in spec.get("modes", [DEFAULT_CHART_MODE])]
+        elif "modes" in spec:
+            raise ValueError(f"Zadanie {index}: 'modes' dotyczy tylko zadań 'chart'")
+        else:
+            modes = [None]
+        for mode in modes:
+            if mode is not None and mode not in CHART_MODES:
+                raise ValueError(f"Zadanie {index}: nieznany tryb {mode!r}")
+        prefix = spec.get("name", kind)
+
+        for (label, codes), year_range, region, level, mode in (
+            (group, year_range, region, level, mode)
+            for group in country_sets
+            for year_range in _resolve_ranges(spec)
+            for region in regions
+            for level in levels
+            for mode in modes
+        ):
+            parts = [prefix]
+            if label:
+                parts.append(label)
+            if mode not in (None, DEFAULT_CHART_MODE):
+                parts.append(mode)
+            if region:
+                parts.append(region)
+            if level not in (None, DEFAULT_REGIONS_LEVEL):
+                parts.append(f"NUTS{level}")
+            parts.append(f"{year_range[0]}-{year_range[1]}" if year_range else "all")
+            stem = "_".join(_slug(part) for part in parts)
+            if stem in seen:
+                continue
+            seen.add(stem)
+            jobs.append(ExportJob(kind, codes, year_range, region, formats, stem, level, mode))
+    return jobs
+
+
+def apply_config(overrides: dict):
+    from common.config import Config
+
+    config = Config()
+    for key, value in (overrides or {}).items():
+        if not hasattr(config, key):
+            raise ValueError(f"Nieznane ustawienie konfiguracji: {key!r}")
+        setattr(config, key, value)
+
+
+class _WorkerContext:
+    def __init__(self, output_dir: str, dpi: int):
+        from data.repository import load_repository
+
+        self.output_dir = output_dir
+        self.dpi = dpi
+        self.repository = load_repository()
+        self._service = None
+        self._models = {}
+
+    @property
+    def service(self):
+        if self._service is None:
+            from data.data_service import VehicleDataService
+            self._service = VehicleDataService(self.repository)
+        return self._service
+
+    def model(self, kind: str, level: int = None):
+        model = self._models.get((kind, level))
+        if model is not None:
+            return model
+        from gui.map_view.map_models import CountryEnvModel, RegionShareModel
+        if kind != "regions_map":
+            model = CountryEnvModel(self.repository.catalog)
+        else:
+            base = next((m for (k, _), m in self._models.items() if k == kind), None)
+            if base is None:
+                model = RegionShareModel(self.repository.catalog, level=level)
+            else:
+                model = base.at_level(level)
+        self._models[(kind, level)] = model
+        return model
+
+    def run(self, job: ExportJob) -> list:
+        if job.kind == "chart":
+            return self.export_chart(job)
+        return self.export_map(job)
+
+    def _paths(self, job: ExportJob) -> list:
+        return [os.path.join(self.output_dir, f"{job.stem}.{fmt}") for fmt in job.formats]
+
+    def export_chart(self, job: ExportJob) -> list:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from export.pdf_exporter import PDFExportStrategy
+        from gui.chart_view.chart_figure import (
+            compute_chart_data, draw_bar_chart, draw_message, max_value, scale_axis
+        )
+
+        years = self.repository.get_available_years()
+        start, end = job.year_range or (years[0], years[-1])
+        data = compute_chart_data(
+            self.service, start, end, list(job.countries), mode=job.mode or DEFAULT_CHART_MODE
+        )
+
+        figure = Figure(figsize=CHART_SIZE)
+        FigureCanvasAgg(figure)
+        if data.message:
+            draw_message(figure, data.message)
+        else:
+            ax, bars, labels = draw_bar_chart(figure, data, self.service.get_country_names())
+            scale_axis(ax, bars, labels, max_value(data.values))
+
+        paths = self._paths(job)
+        for fmt, path in zip(job.formats, paths):
+            if fmt == "pdf":
+                PDFExportStrategy().export(figure, path)
+            else:
+                figure.savefig(path, dpi=self.dpi)
+        return paths
+
+    def export_map(self, job: ExportJob) -> list:
+        from export.pdf_exporter import PDFExportStrategy
+        from gui.map_view.map_figure import build_choropleth_figure, choropleth_html
+        from gui.map_view.static_map import render_static_map
+
+        model = self.model(job.kind, job.level)
+        if job.region is not None and job.region not in model.partitions:
+            raise ValueError(f"Brak regionów NUTS{job.level} dla obszaru {job.region!r}")
+        start, end = job.year_range or (model.years[0], model.years[-1])
+        args = (start, end, job.region) if job.kind == "regions_map" else (start, end)
+        frame = model.compute_frame(*args)
+        if frame is None:
+            raise ValueError("Brak danych w wybranym zakresie lat")
+
+        paths = self._paths(job)
+        static_figure = None
+        for fmt, path in zip(job.formats, paths):
+            if fmt == "html":
+                figure = build_choropleth_figure(frame, None, **model.figure_style)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(choropleth_html(figure, model.topology(frame.region), "plotly.min.js"))
+                continue
+            if static_figure is None:
+                static_figure = render_static_map(frame, model.static_paths(), model.figure_style)
+            if fmt == "pdf":
+                PDFExportStrategy().export(static_figure, path)
+            else:
+                static_figure.savefig(path, dpi=self.dpi)
+        return paths
+
+
+def _init_worker(overrides: dict, output_dir: str, dpi: int):
+    global _worker
+    apply_config(overrides)
+    _worker = _WorkerContext(output_dir, dpi)
+
+
+def _run_job(job: ExportJob) -> JobResult:
+    started = time.perf_counter()
+    try:
+        paths = _worker.run(job)
+        error = None
+    except Exception as e:
+        paths, error = [], f"{type(e).__name__}: {e}"
+    return JobResult(job.stem, paths, error, round((time.perf_counter() - started) * 1000.0, 1))
+
+
+def _prepare_shared_caches(jobs: list, output_dir: str):
+    from data.repository import load_repository
+
+    load_repository()
+    levels = {job.level for job in jobs if job.kind == "regions_map"} | \
+             {0 for job in jobs if job.kind == "countries_map"}
+    if levels:
+        from data.geometry import EUROPE, NutsGeometryCache
+        cache = NutsGeometryCache.shared()
+        for level in sorted(levels):
+            cache.level(level)
+        topologies = {
+            (job.level, job.region) if job.kind == "regions_map" else (0, EUROPE)
+            for job in jobs if job.kind != "chart" and "html" in job.formats
+        }
+        for level, region in sorted(topologies):
+            if region in cache.partitions(level):
+                cache.topology(level, region)
+    if any("html" in job.formats for job in jobs if job.kind != "chart"):
+        from plotly.offline import get_plotlyjs
+        bundle = os.path.join(output_dir, "plotly.min.js")
+        if not os.path.exists(bundle):
+            with open(bundle, "w", encoding="utf-8") as f:
+                f.write(get_plotlyjs())
+
+
+def run_batch(manifest: dict, workers: int = None, output_dir: str = None) -> list:
+    overrides = manifest.get("config", {})
+    output_dir = output_dir or manifest.get("output_dir", "eksport")
+    dpi = int(manifest.get("dpi", 150))
+    workers = workers or manifest.get("workers") or os.cpu_count() or 1
+
+    apply_config(overrides)
+    jobs = expand_jobs(manifest)
+    os.makedirs(output_dir, exist_ok=True)
+    # Migawki danych i geometrii powstają raz w procesie głównym, a procesy
+    # robocze tylko je mapują, zamiast każdy z osobna parsować Excela i GeoJSON.
+    _prepare_shared_caches(jobs, output_dir)
+
+    jobs.sort(key=lambda job: job.kind)
+    workers = max(1, min(workers, len(jobs)))
+    print(f"⏱️ Eksport {len(jobs)} zadań w {workers} procesach → {output_dir}")
+    if workers == 1:
+        _init_worker(overrides, output_dir, dpi)
+        results = map(_run_job, jobs)
+        return _report(results, len(jobs))
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(overrides, output_dir, dpi),
+    ) as pool:
+        return _report(pool.map(_run_job, jobs, chunksize=chunksize), len(jobs))
+
+
+def _report(results, total: int) -> list:
+    collected = []
+    for done, result in enumerate(results, start=1):
+        collected.append(result)
+        if result.error:
+            print(f"❌ [{done}/{total}] {result.stem}: {result.error}")
+        else:
+            print(f"✅ [{done}/{total}] {result.stem} ({result.elapsed_ms} ms)")
+    return collected
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Wsadowy eksport wykresów i map według manifestu JSON (bez okien)."
+    )
+    parser.add_argument("manifest")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args(argv)
+    return run_manifest(args.manifest, args.workers, args.output_dir)
+
+
+def run_manifest(path: str, workers: int = None, output_dir: str = None) -> int:
+    started = time.perf_counter()
+    try:
+        results = run_batch(load_manifest(path), workers, output_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Eksport przerwany: {e}")
+        return 2
+    failed = [result for result in results if result.error]
+    elapsed = time.perf_counter() - started
+    print(f"⏱️ Wyeksportowano {len(results) - len(failed)}/{len(results)} zadań w {elapsed:.1f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
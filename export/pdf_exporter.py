@@ -1,6 +1,6 @@
-from matplotlib.backends.backend_pdf import PdfPages
-
 class PDFExportStrategy:
     def export(self, figure, filename):
+        from matplotlib.backends.backend_pdf import PdfPages
+
         with PdfPages(filename) as pdf:
             pdf.savefig(figure)
@@ -0,0 +1,115 @@
+from collections import namedtuple
+
+import numpy as np
+from matplotlib import colormaps
+from core.tracing import traced
+
+ChartData = namedtuple(
+    "ChartData", ["codes", "values", "start_year", "end_year", "message", "mode"],
+    defaults=("TOTAL",),
+)
+
+
+@traced("aggregate.chart")
+def compute_chart_data(service, start_year, end_year, countries, token=None,
+                       mode: str = "TOTAL") -> ChartData:
+    if not countries:
+        return ChartData([], [], start_year, end_year, "Zaznacz przynajmniej jeden kraj", mode)
+
+    country_codes = sorted(set(countries))
+    if mode == "EV":
+        result = service.query(country_codes, mode="EV", year=end_year)
+    else:
+        result = service.query(country_codes, mode=mode, year_range=(start_year, end_year))
+    if not result.mask.any():
+        return ChartData([], [], start_year, end_year, "Brak danych w wybranym zakresie lat", mode)
+    if token is not None:
+        token.check()
+
+    values = np.nan_to_num(result.values, nan=0.0).tolist()
+    return ChartData(country_codes, values, start_year, end_year, None, mode)
+
+
+def chart_title(data: ChartData) -> str:
+    if data.mode == "EV":
+        return f"Wybrane kraje – EV łącznie do {data.end_year}"
+    return f"Wybrane kraje – suma EV ({data.start_year}–{data.end_year})"
+
+
+def draw_message(figure, message: str):
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.text(
+        0.5, 0.5,
+        message,
+        ha='center', va='center', fontsize=12
+    )
+    ax.set_xticks([])
+    ax.set_yticks([])
+    return ax
+
+
+def draw_bar_chart(figure, data: ChartData, country_names: dict):
+    country_codes = data.codes
+    values = data.values
+
+    figure.clear()
+    ax = figure.add_subplot(111)
+
+    cmap = colormaps["tab20"].resampled(len(values))
+    colors = [cmap(i) for i in range(len(values))]
+    bars = ax.bar(country_codes, values, color=colors)
+
+    fontsize = 8 if len(values) <= 10 else 6
+    labels = [
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            0.0,
+            f"{int(val):,}",
+            ha='center', va='bottom',
+            fontsize=fontsize, rotation='vertical'
+        )
+        for bar, val in zip(bars, values)
+    ]
+    ax.set_title(chart_title(data))
+    ax.set_ylabel("Liczba ENV")
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.ticklabel_format(style='plain', axis='y')
+
+    figure.subplots_adjust(bottom=0.28)
+
+    legend_entries = [
+        f"{code} – {country_names.get(code, code)}"
+        for code in country_codes
+    ]
+    n_per_row = 4
+    lines = [
+        ", ".join(legend_entries[i:i + n_per_row])
+        for i in range(0, len(legend_entries), n_per_row)
+    ]
+    legend_text = "\n".join(lines)
+
+    figure.text(
+        0.5, 0.08,
+        legend_text,
+        ha='center',
+        va='top',
+        fontsize=8
+    )
+    return ax, list(bars), labels
+
+
+def max_value(values) -> float:
+    max_val = float(max(values)) if len(values) else 0.0
+    return max_val if max_val > 0 else 1.0
+
+
+def place_labels(bars, labels, scale: float):
+    offset = 0.03 * scale
+    for bar, label in zip(bars, labels):
+        label.set_y(float(bar.get_height()) + offset)
+
+
+def scale_axis(ax, bars, labels, scale: float):
+    ax.set_ylim(0, scale * 1.2)
+    place_labels(bars, labels, scale)
@@ -2,22 +2,32 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QSlider
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from gui.country_list_widget.country_list_widget import CountryListWidget
-import matplotlib.pyplot as plt
-import pandas as pd
+from core.scheduler import RenderScheduler
+from core.state import DATA
+from core.tracing import traced
+from gui.chart_view.chart_figure import (
+    chart_title, compute_chart_data, draw_bar_chart, draw_message,
+    max_value, place_labels, scale_axis
+)
+
+CHART_RANGE = "chart.range"
+CHART_COUNTRIES = "chart.countries"
 
 class ChartView(QWidget):
     def __init__(self, service):
         super().__init__()
         self.service = service
-        self.repo_df = self.service.repository.df.copy()
-        self.years = sorted(self.repo_df["TIME_PERIOD"].unique())
-        self.start_year = self.years[0]
-        self.end_year = self.years[-1]
-        self.selected_countries = []
+        self.ev_index = self.service.repository.ev_index
+        self.years = self.ev_index.years.tolist()
+        self.state = self.service.state
+        self.state.update({
+            CHART_RANGE: (self.years[0], self.years[-1]),
+            CHART_COUNTRIES: (),
+        })
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
@@ -53,18 +63,74 @@ class ChartView(QWidget):
         self.figure = Figure(figsize=(8, 5))
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
-        self.service.dataUpdated.connect(self.redraw_chart)
+        self._ax = None
+        self._bars = []
+        self._labels = []
+        self._bar_codes = None
+        self._scale = 1.0
+        self._animated = False
+        self._background = None
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(250)
+        self._settle_timer.timeout.connect(self.settle)
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
+        self.scheduler = RenderScheduler.shared()
+        self.data_binding = self.state.bind([DATA], self.on_data_reloaded)
+        self.binding = self.state.bind([CHART_RANGE, CHART_COUNTRIES, DATA], self.request_redraw)
         self.redraw_chart()
 
+    @property
+    def start_year(self):
+        return self.state.get(CHART_RANGE)[0]
+
+    @property
+    def end_year(self):
+        return self.state.get(CHART_RANGE)[1]
+
+    @property
+    def selected_countries(self):
+        return list(self.state.get(CHART_COUNTRIES))
+
+    def set_years(self, years: list):
+        if years == self.years:
+            return
+        self.years = years
+        start, end = self.start_year, self.end_year
+        if start not in years or end not in years:
+            start, end = years[0], years[-1]
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(True)
+            slider.setMaximum(len(years) - 1)
+        self.slider_start.setValue(years.index(start))
+        self.slider_end.setValue(years.index(end))
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(False)
+        self.state.set(CHART_RANGE, (start, end))
+        self.label_start.setText(f"Od roku: {start}")
+        self.label_end.setText(f"Do roku: {end}")
+
+    def prepare_reload(self, repository, geometry=None):
+        return repository.ev_index
+
+    def reload_payload(self):
+        return self.ev_index
+
+    def apply_reload(self, ev_index):
+        self.ev_index = ev_index
+
+    def on_data_reloaded(self):
+        self.set_years(self.ev_index.years.tolist())
+        self.country_list_widget.repopulate()
+
     def on_start_changed(self, index: int):
 
         year = self.years[index]
         if year > self.end_year:
             self.slider_end.setValue(index)
             return
-        self.start_year = year
+        self.state.set(CHART_RANGE, (year, self.end_year))
         self.label_start.setText(f"Od roku: {self.start_year}")
-        self.redraw_chart()
 
     def on_end_changed(self, index: int):
 
@@ -72,122 +138,126 @@ class ChartView(QWidget):
         if year < self.start_year:
             self.slider_start.setValue(index)
             return
-        self.end_year = year
+        self.state.set(CHART_RANGE, (self.start_year, year))
         self.label_end.setText(f"Do roku: {self.end_year}")
-        self.redraw_chart()
 
     def update_countries(self, countries: list):
 
-        self.selected_countries = countries
-        self.redraw_chart()
-
-    def redraw_chart(self):
+        self.state.set(CHART_COUNTRIES, tuple(countries))
 
-        try:
+    def request_redraw(self):
+        start, end = self.start_year, self.end_year
+        countries = list(self.selected_countries)
+        self.scheduler.schedule(
+            self,
+            lambda token: self.compute_chart_data(start, end, countries, token),
+            self.draw_chart,
+        )
 
-            if not self.selected_countries:
-                self.figure.clear()
-                ax = self.figure.add_subplot(111)
-                ax.text(
-                    0.5, 0.5,
-                    "Zaznacz przynajmniej jeden kraj",
-                    ha='center', va='center', fontsize=12
-                )
-                ax.set_xticks([])
-                ax.set_yticks([])
-                self.canvas.draw()
-                return
-
-            mask = (
-                (self.repo_df["TIME_PERIOD"] >= self.start_year) &
-                (self.repo_df["TIME_PERIOD"] <= self.end_year) &
-                (self.repo_df["geo"].isin(self.selected_countries))
-            )
-            df_range = self.repo_df[mask]
+    def compute_chart_data(self, start_year, end_year, countries, token=None):
+        return compute_chart_data(self.service, start_year, end_year, countries, token)
 
-            cum_df = (
-                df_range
-                .groupby("geo", as_index=False)["OBS_VALUE"]
-                .sum()
-                .rename(columns={"OBS_VALUE": "cumulative_value"})
-            )
-            if cum_df.empty:
-                self.figure.clear()
-                ax = self.figure.add_subplot(111)
-                ax.text(
-                    0.5, 0.5,
-                    "Brak danych w wybranym zakresie lat",
-                    ha='center', va='center', fontsize=12
-                )
-                ax.set_xticks([])
-                ax.set_yticks([])
-                self.canvas.draw()
-                return
-
-            missing = set(self.selected_countries) - set(cum_df["geo"])
-            if missing:
-                rows = [{"geo": geo_code, "cumulative_value": 0} for geo_code in missing]
-                missing_df = pd.DataFrame(rows, columns=["geo", "cumulative_value"])
-                cum_df = pd.concat([cum_df, missing_df], ignore_index=True)
-
-            cum_df = cum_df.sort_values("geo")
-            country_codes = cum_df["geo"].tolist()
-
-            values = []
-            for x in cum_df["cumulative_value"].tolist():
-                try:
-                    f = float(x)
-                except Exception:
-                    f = 0.0
-                values.append(f)
-
-            self.figure.clear()
-            ax = self.figure.add_subplot(111)
-
-            cmap = plt.get_cmap('tab20', len(values))
-            colors = [cmap(i) for i in range(len(values))]
-            bars = ax.bar(country_codes, values, color=colors)
-            max_val = max(values) if values else 1.0
-            max_val = float(max_val)
-            ax.set_ylim(0, max_val * 1.2)
-
-            fontsize = 8 if len(values) <= 10 else 6
-            for bar, val in zip(bars, values):
-                h = float(bar.get_height())
-                offset = 0.03 * max_val
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2,
-                    h + offset,
-                    f"{int(val):,}",
-                    ha='center', va='bottom',
-                    fontsize=fontsize, rotation='vertical'
-                )
-            ax.set_title(f"Wybrane kraje – suma EV ({self.start_year}–{self.end_year})")
-            ax.set_ylabel("Liczba ENV")
-            ax.tick_params(axis='x', labelrotation=45)
-            ax.ticklabel_format(style='plain', axis='y')
-
-            self.figure.subplots_adjust(bottom=0.28)
-
-            country_names_dict = self.service.get_country_names()
-            legend_entries = [
-                f"{code} – {country_names_dict.get(code, code)}"
-                for code in country_codes
-            ]
-            n_per_row = 4
-            lines = [
-                ", ".join(legend_entries[i:i + n_per_row])
-                for i in range(0, len(legend_entries), n_per_row)
-            ]
-            legend_text = "\n".join(lines)
-
-            self.figure.text(
-                0.5, 0.08,                                                      
-                legend_text,
-                ha='center',
-                va='top',
-                fontsize=8
+    def redraw_chart(self):
+        try:
+            self.draw_chart(
+                self.compute_chart_data(self.start_year, self.end_year, self.selected_countries)
             )
-            self.canvas.draw()
         except Exception as e:
             print(f"❌ Błąd w redraw_chart(): {e}")
+
+    def draw_chart(self, data):
+
+        if data.message:
+            self._reset_bars()
+            draw_message(self.figure, data.message)
+            self.canvas.draw()
+            return
+
+        if self._bar_codes == tuple(data.codes):
+            self.update_bars(data)
+        else:
+            self.build_bars(data)
+
+    @traced("render.chart_build")
+    def build_bars(self, data):
+        self._reset_bars()
+        self._ax, self._bars, self._labels = draw_bar_chart(
+            self.figure, data, self.service.get_country_names()
+        )
+        self._bar_codes = tuple(data.codes)
+        self._rescale(max_value(data.values))
+        self.canvas.draw()
+
+    @traced("render.chart_update")
+    def update_bars(self, data):
+        for bar, label, val in zip(self._bars, self._labels, data.values):
+            bar.set_height(val)
+            label.set_text(f"{int(val):,}")
+        self._ax.title.set_text(chart_title(data))
+
+        # Podczas przesuwania suwaków skala osi Y zmienia się tylko wtedy, gdy
+        # słupki wychodzą poza wykres albo zajmują mniej niż połowę jego wysokości –
+        # wtedy wystarczy podmienić słupki na zapamiętanym tle (blitting).
+        max_val = max_value(data.values)
+        full = max_val > self._scale or max_val < 0.5 * self._scale
+        if full:
+            self._rescale(max_val)
+        else:
+            self._place_labels()
+        self._blit(full)
+
+    def settle(self):
+        self._settle_timer.stop()
+        if not self._animated:
+            return
+        self._set_animated(False)
+        self._rescale(max_value([bar.get_height() for bar in self._bars]))
+        self.canvas.draw_idle()
+
+    def _rescale(self, max_val: float):
+        self._scale = max_val
+        scale_axis(self._ax, self._bars, self._labels, max_val)
+
+    def _place_labels(self):
+        place_labels(self._bars, self._labels, self._scale)
+
+    def _dynamic_artists(self):
+        return [*self._bars, *self._labels, self._ax.title]
+
+    def _set_animated(self, animated: bool):
+        self._animated = animated
+        for artist in self._dynamic_artists():
+            artist.set_animated(animated)
+        if not animated:
+            self._background = None
+
+    def _blit(self, full: bool):
+        if not self._animated:
+            self._set_animated(True)
+            full = True
+        if full or self._background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_dynamic()
+            self.canvas.blit(self.figure.bbox)
+        self._settle_timer.start()
+
+    def _draw_dynamic(self):
+        for artist in self._dynamic_artists():
+            self.figure.draw_artist(artist)
+
+    def _on_canvas_draw(self, _event):
+        if self._animated:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self._draw_dynamic()
+
+    def _reset_bars(self):
+        self._settle_timer.stop()
+        if self._animated:
+            self._set_animated(False)
+        self._ax = None
+        self._bars = []
+        self._labels = []
+        self._bar_codes = None
+        self._scale = 1.0
@@ -0,0 +1,41 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from gui.country_list_widget.search_index import SearchIndex
+
+
+class CountryListModel(QAbstractListModel):
+    def __init__(self, codes, names=None, labels=None, parent=None):
+        super().__init__(parent)
+        names = names or {}
+        labels = labels or {}
+        self.codes = list(codes)
+        self.display = [f"{names.get(code, code)} ({code})" for code in self.codes]
+        self.search_index = SearchIndex(
+            (code, names.get(code), labels.get(code)) for code in self.codes
+        )
+        self.visible = list(range(len(self.codes)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.visible[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display[entry]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.codes[entry]
+        return None
+
+    def code_at(self, row: int) -> str:
+        return self.codes[self.visible[row]]
+
+    def set_filter(self, text: str):
+        visible = self.search_index.search(text)
+        if visible == self.visible:
+            return False
+        self.beginResetModel()
+        self.visible = visible
+        self.endResetModel()
+        return True
@@ -1,53 +1,94 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLineEdit
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QListView, QLineEdit, QAbstractItemView
+from PyQt5.QtCore import pyqtSignal, QItemSelection, QItemSelectionModel, QTimer
+from gui.country_list_widget.country_list_model import CountryListModel
 
 class CountryListWidget(QWidget):
     countriesSelected = pyqtSignal(list)
 
-    def __init__(self, service):
+    def __init__(self, service, filter_delay_ms: int = 150):
         super().__init__()
         self.service = service
         self.country_names = self.service.get_country_names()
+        self.selected_codes = set()
+        self._restoring_selection = False
 
         layout = QVBoxLayout()
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Szukaj kraju lub skrótu...")
-        self.search_box.textChanged[str].connect(self.filter_list)
+        self.search_box.textChanged[str].connect(self.schedule_filter)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
-        self.list_widget.itemSelectionChanged.connect(self.emit_selection)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(filter_delay_ms)
+        self.filter_timer.timeout.connect(lambda: self.filter_list(self.search_box.text()))
+
+        self.emit_timer = QTimer(self)
+        self.emit_timer.setSingleShot(True)
+        self.emit_timer.setInterval(0)
+        self.emit_timer.timeout.connect(self.emit_selection)
+
+        self.list_view = QListView()
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.list_view.setUniformItemSizes(True)
 
         layout.addWidget(self.search_box)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
         self.setLayout(layout)
         self.populate_list()
 
     def populate_list(self):
-        self.list_widget.clear()
-        for code in self.service.get_countries():
-            full_name = self.country_names.get(code, code)
-            display_text = f"{full_name} ({code})"
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.ItemDataRole.UserRole, code)
-            self.list_widget.addItem(item)
+        self.model = CountryListModel(
+            self.service.get_countries(),
+            names=self.country_names,
+            labels=self.service.get_country_labels(),
+            parent=self,
+        )
+        self.selected_codes.clear()
+        self.list_view.setModel(self.model)
+        self.list_view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+
+    def repopulate(self):
+        # Po przeładowaniu danych lista i indeks wyszukiwania powstają od nowa;
+        # zaznaczenie zostaje dla krajów, które nadal są w danych.
+        selected = set(self.selected_codes)
+        self.populate_list()
+        self.selected_codes = selected & set(self.model.codes)
+        self.model.set_filter(self.search_box.text())
+        self.restore_selection()
+        if self.selected_codes != selected:
+            self.emit_timer.start()
+
+    def schedule_filter(self, _text=None):
+        self.filter_timer.start()
 
     def filter_list(self, text):
-        text = text.lower()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            visible = text in item.text().lower()
-            item.setHidden(not visible)
+        self.filter_timer.stop()
+        if self.model.set_filter(text):
+            self.restore_selection()
+
+    def restore_selection(self):
+        selection = QItemSelection()
+        for row in range(self.model.rowCount()):
+            if self.model.code_at(row) in self.selected_codes:
+                index = self.model.index(row)
+                selection.select(index, index)
+        self._restoring_selection = True
+        try:
+            self.list_view.selectionModel().select(selection, QItemSelectionModel.Select)
+        finally:
+            self._restoring_selection = False
+
+    def on_selection_changed(self, selected, deselected):
+        if self._restoring_selection:
+            return
+        for index in deselected.indexes():
+            self.selected_codes.discard(self.model.code_at(index.row()))
+        for index in selected.indexes():
+            self.selected_codes.add(self.model.code_at(index.row()))
+        self.emit_timer.start()
 
     def emit_selection(self):
-        selected = [
-            item.data(Qt.ItemDataRole.UserRole)
-            for item in self.list_widget.selectedItems()
-        ]
-        self.countriesSelected.emit(selected)
+        self.countriesSelected.emit(self.get_selected_country_codes())
 
     def get_selected_country_codes(self):
-        return [
-            item.data(Qt.ItemDataRole.UserRole)
-            for item in self.list_widget.selectedItems()
-        ]
+        return [code for code in self.model.codes if code in self.selected_codes]
@@ -0,0 +1,77 @@
+from bisect import bisect_left
+import re
+import unicodedata
+
+# Litery bez rozkładu NFKD (np. "ł") trzeba zamienić ręcznie.
+_FOLD = str.maketrans({
+    "ł": "l", "đ": "d", "ø": "o", "ß": "ss", "æ": "ae", "œ": "oe", "ı": "i",
+})
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKD", str(text).lower().translate(_FOLD))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_WORD_SPLIT.split(text)).strip()
+
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, documents):
+        self.size = 0
+        self._haystacks = []
+        self._words = []
+        self._trigrams = {}
+        for document in documents:
+            self._add(document)
+        self._words.sort()
+
+    def _add(self, fields):
+        doc_id = self.size
+        self.size += 1
+        haystack = " ".join(normalize_text(field) for field in fields if field)
+        self._haystacks.append(haystack)
+        for word in set(haystack.split()):
+            self._words.append((word, doc_id))
+        for gram in trigrams(haystack):
+            self._trigrams.setdefault(gram, set()).add(doc_id)
+
+    def search(self, query: str) -> list:
+        terms = normalize_text(query).split()
+        if not terms:
+            return list(range(self.size))
+
+        matches = None
+        for term in sorted(terms, key=len, reverse=True):
+            found = self._match_term(term, matches)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(matches)
+
+    def _match_term(self, term: str, candidates=None) -> set:
+        if len(term) < 3:
+            return self._match_prefix(term)
+
+        postings = sorted(
+            (self._trigrams.get(gram, set()) for gram in trigrams(term)), key=len
+        )
+        found = set(postings[0])
+        if candidates is not None:
+            found &= candidates
+        for posting in postings[1:]:
+            found &= posting
+            if not found:
+                return found
+        return {doc_id for doc_id in found if term in self._haystacks[doc_id]}
+
+    def _match_prefix(self, term: str) -> set:
+        found = set()
+        position = bisect_left(self._words, (term, -1))
+        while position < len(self._words) and self._words[position][0].startswith(term):
+            found.add(self._words[position][1])
+            position += 1
+        return found
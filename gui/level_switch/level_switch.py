@@ -0,0 +1,35 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QComboBox
+from data.nuts_hierarchy import NUTS_LEVELS
+
+LEVEL_LABELS = {0: "NUTS 0 (kraje)", 1: "NUTS 1", 2: "NUTS 2", 3: "NUTS 3"}
+
+class LevelSwitch(QWidget):
+    def __init__(self, callback=None, level: int = 2, levels=NUTS_LEVELS):
+        super().__init__()
+        self.callback = callback
+
+        layout = QHBoxLayout()
+        layout.addWidget(QLabel("Poziom:"))
+
+        self.combo = QComboBox()
+        for value in levels:
+            self.combo.addItem(LEVEL_LABELS.get(value, f"NUTS {value}"), value)
+        self.combo.setCurrentIndex(max(self.combo.findData(level), 0))
+        self.combo.currentIndexChanged.connect(self.on_changed)
+
+        layout.addWidget(self.combo)
+        layout.addStretch()
+        self.setLayout(layout)
+
+    @property
+    def level(self) -> int:
+        return self.combo.currentData()
+
+    def set_level(self, level: int):
+        index = self.combo.findData(level)
+        if index >= 0:
+            self.combo.setCurrentIndex(index)
+
+    def on_changed(self, _index: int):
+        if self.callback:
+            self.callback(self.level)
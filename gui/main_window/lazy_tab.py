@@ -0,0 +1,87 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
+from PyQt5.QtCore import Qt, pyqtSignal
+from core.startup_profile import mark
+from core.tasks import run_in_background
+
+
+class LazyTab(QWidget):
+    built = pyqtSignal()
+
+    def __init__(self, title: str, factory, prefetch=None):
+        super().__init__()
+        self.title = title
+        self.factory = factory
+        self.prefetch = prefetch
+        self.content = None
+        self.prepared = None
+        self.prefetched = prefetch is None
+        self._prefetching = False
+        self._build_when_ready = False
+
+        self.layout = QVBoxLayout()
+        self.setLayout(self.layout)
+
+        self.status_label = QLabel("Wczytywanie danych…")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setMaximumWidth(300)
+
+        self.layout.addStretch()
+        self.layout.addWidget(self.status_label)
+        self.layout.addWidget(self.progress, alignment=Qt.AlignHCenter)
+        self.layout.addStretch()
+
+    @property
+    def is_built(self) -> bool:
+        return self.content is not None
+
+    def start_prefetch(self):
+        if self.prefetched or self._prefetching:
+            return
+        self._prefetching = True
+        self.status_label.setText("Wczytywanie danych…")
+        run_in_background(self.prefetch, self._on_prefetched, self.show_error)
+
+    def ensure_built(self):
+        if self.is_built:
+            return
+        if not self.prefetched:
+            self._build_when_ready = True
+            self.start_prefetch()
+            return
+        self._build()
+
+    def _on_prefetched(self, prepared):
+        mark(f"prefetched:{self.title}")
+        self.prepared = prepared
+        self._prefetching = False
+        self.prefetched = True
+        if self._build_when_ready:
+            self._build()
+        else:
+            self.status_label.setText("Dane gotowe – widok zostanie utworzony po otwarciu karty")
+
+    def show_error(self, message: str):
+        self._prefetching = False
+        self.progress.hide()
+        self.status_label.setText(f"❌ Nie udało się wczytać danych: {message}")
+
+    def _build(self):
+        self._build_when_ready = False
+        self.status_label.setText("Przygotowywanie widoku…")
+        try:
+            # Model przygotował wątek roboczy; tu powstają tylko widżety.
+            prepared, self.prepared = self.prepared, None
+            self.content = self.factory(prepared)
+        except Exception as e:
+            print(f"❌ Błąd przy {self.title}: {e}")
+            self.show_error(str(e))
+            return
+        while self.layout.count():
+            item = self.layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+        self.layout.addWidget(self.content)
+        mark(f"tab_built:{self.title}")
+        self.built.emit()
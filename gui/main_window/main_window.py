@@ -2,74 +2,193 @@ from PyQt5.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout,
     QPushButton, QFileDialog
 )
-from config.config import Config
-from gui.map_view.electric_vehicles_map_tab import ElectricVehiclesMapTab
-from gui.map_view.electric_vehicles_countries_tab import ElectricVehiclesCountriesTab
-from gui.chart_view.chart_view import ChartView
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from core.startup_profile import mark
+from core.tasks import run_in_background
+from gui.main_window.lazy_tab import LazyTab
 
 class MainWindow(QMainWindow):
-    def __init__(self, service, exporter=None):
+    firstTabReady = pyqtSignal()
+
+    def __init__(self, service=None, exporter=None, repository_loader=None):
         super().__init__()
         self.setWindowTitle("Wizualizacja pojazdów elektrycznych")
         self.setMinimumSize(1200, 800)
-        self.service = service
+        self.service = None
+        self.reloader = None
         self.exporter = exporter
 
-        cfg = Config()
-        region_csv = cfg.ev_data_path
-        country_xlsx = cfg.env_data_path
-
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        self.init_tabs(region_csv, country_xlsx)
+        self.init_tabs()
+        self.init_performance_panel()
+
+        if service is not None:
+            self.on_service_ready(service)
+        elif repository_loader is not None:
+            run_in_background(repository_loader, self.on_repository_loaded, self.on_load_failed)
+
+    def init_tabs(self):
+        self.lazy_tabs = [
+            LazyTab(
+                "ev_map_tab",
+                self._build_ev_map_tab,
+                prefetch=self._prepare_ev_map_tab,
+            ),
+            LazyTab(
+                "ev_countries_tab",
+                self._build_ev_countries_tab,
+                prefetch=self._prepare_ev_countries_tab,
+            ),
+            LazyTab("chart_tab", self._build_chart_tab),
+        ]
+        self.tabs.addTab(self.lazy_tabs[0], "Mapa – regiony")
+        self.tabs.addTab(self.lazy_tabs[1], "Mapa – kraje")
+        self.tabs.addTab(self.lazy_tabs[2], "Porównanie krajów")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        for tab in self.lazy_tabs:
+            tab.built.connect(self._on_tab_built)
+        self._first_tab_ready = False
+
+    def _on_tab_built(self):
+        if not self._first_tab_ready:
+            self._first_tab_ready = True
+            self.firstTabReady.emit()
+
+    def init_performance_panel(self):
+        from gui.performance_panel.performance_panel import PerformancePanel
+
+        self.performance_panel = PerformancePanel(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.performance_panel)
+        self.performance_panel.hide()
+
+        toggle = self.performance_panel.toggleViewAction()
+        toggle.setText("Panel wydajności")
+        toggle.setShortcut("Ctrl+Shift+P")
+        self.menuBar().addMenu("Widok").addAction(toggle)
+
+    def on_repository_loaded(self, repository):
+        from data.data_service import VehicleDataService
+
+        mark("repository_loaded")
+        self.on_service_ready(VehicleDataService(repository))
+
+    def on_load_failed(self, message: str):
+        print(f"❌ Błąd przy wczytywaniu danych: {message}")
+        for tab in self.lazy_tabs:
+            tab.show_error(message)
+
+    def on_service_ready(self, service):
+        from common.config import Config
+
+        self.service = service
+        if Config().watch_data_files:
+            from data.live_reload import DataReloader
+            self.reloader = DataReloader(service, self)
+        self.on_tab_changed(self.tabs.currentIndex())
+
+    def on_tab_changed(self, index: int):
+        if self.service is None or index < 0:
+            return
+        self.lazy_tabs[index].ensure_built()
+        QTimer.singleShot(0, lambda: self.prefetch_next(index))
+
+    def prefetch_next(self, index: int):
+        for offset in range(1, len(self.lazy_tabs)):
+            tab = self.lazy_tabs[(index + offset) % len(self.lazy_tabs)]
+            if not tab.is_built and not tab.prefetched:
+                tab.start_prefetch()
+                return
+
+    def _current_prepared(self, prepared):
+        # Przeładowanie w trakcie przygotowania unieważnia gotowy model.
+        if prepared is not None and prepared.catalog is self.service.repository.catalog:
+            return prepared
+        return None
+
+    def _prepare_ev_map_tab(self):
+        from gui.map_view.electric_vehicles_map_tab import ElectricVehiclesMapTab
+        return ElectricVehiclesMapTab.prepare(self.service.repository.catalog)
 
-    def init_tabs(self, region_csv, country_xlsx):
-        print("start")
+    def _prepare_ev_countries_tab(self):
+        from gui.map_view.electric_vehicles_countries_tab import ElectricVehiclesCountriesTab
+        return ElectricVehiclesCountriesTab.prepare(self.service.repository.catalog)
 
-        try:
-            ev_map_widget = QWidget()
-            ev_map_layout = QVBoxLayout()
+    def _build_ev_map_tab(self, prepared=None):
+        from gui.map_view.electric_vehicles_map_tab import ElectricVehiclesMapTab
 
-            self.ev_map_tab = ElectricVehiclesMapTab(region_csv)
-            ev_map_layout.addWidget(self.ev_map_tab)
+        ev_map_widget = QWidget()
+        ev_map_layout = QVBoxLayout()
 
-            ev_map_widget.setLayout(ev_map_layout)
-            self.tabs.addTab(ev_map_widget, "Mapa – regiony")
-        except Exception as e:
-            print(f"❌ Błąd przy ev_map_tab: {e}")
+        self.ev_map_tab = ElectricVehiclesMapTab(
+            self.service.repository.catalog, self.service.state, self._current_prepared(prepared)
+        )
+        ev_map_layout.addWidget(self.ev_map_tab)
+        self._watch_reloads(self.ev_map_tab)
 
-        try:
-            ev_countries_widget = QWidget()
-            ev_countries_layout = QVBoxLayout()
+        if self.exporter:
+            export_button = QPushButton("Eksportuj mapę do PDF")
+            export_button.clicked.connect(lambda: self.export_map_pdf(self.ev_map_tab))
+            ev_map_layout.addWidget(export_button)
 
-            self.ev_countries_tab = ElectricVehiclesCountriesTab(country_xlsx)
-            ev_countries_layout.addWidget(self.ev_countries_tab)
+        ev_map_widget.setLayout(ev_map_layout)
+        return ev_map_widget
 
-            ev_countries_widget.setLayout(ev_countries_layout)
-            self.tabs.addTab(ev_countries_widget, "Mapa – kraje")
-        except Exception as e:
-            print(f"❌ Błąd przy ev_countries_tab: {e}")
+    def _build_ev_countries_tab(self, prepared=None):
+        from gui.map_view.electric_vehicles_countries_tab import ElectricVehiclesCountriesTab
 
-        try:
-            chart_tab = QWidget()
-            layout = QVBoxLayout()
+        ev_countries_widget = QWidget()
+        ev_countries_layout = QVBoxLayout()
 
-            self.chart_view = ChartView(self.service)
+        self.ev_countries_tab = ElectricVehiclesCountriesTab(
+            self.service.repository.catalog, self.service.state, self._current_prepared(prepared)
+        )
+        ev_countries_layout.addWidget(self.ev_countries_tab)
+        self._watch_reloads(self.ev_countries_tab)
 
-            layout.addWidget(self.chart_view)
+        if self.exporter:
+            export_button = QPushButton("Eksportuj mapę do PDF")
+            export_button.clicked.connect(lambda: self.export_map_pdf(self.ev_countries_tab))
+            ev_countries_layout.addWidget(export_button)
 
-            if self.exporter:
-                export_button = QPushButton("Eksportuj wykres do PDF")
-                export_button.clicked.connect(self.export_pdf)
-                layout.addWidget(export_button)
+        ev_countries_widget.setLayout(ev_countries_layout)
+        return ev_countries_widget
 
-            chart_tab.setLayout(layout)
-            self.tabs.addTab(chart_tab, "Porównanie krajów")
-        except Exception as e:
-            print(f"❌ Błąd przy chart_tab: {e}")
+    def _build_chart_tab(self, _prepared=None):
+        from gui.chart_view.chart_view import ChartView
+
+        chart_tab = QWidget()
+        layout = QVBoxLayout()
+
+        self.chart_view = ChartView(self.service)
+        self._watch_reloads(self.chart_view)
+
+        layout.addWidget(self.chart_view)
+
+        if self.exporter:
+            export_button = QPushButton("Eksportuj wykres do PDF")
+            export_button.clicked.connect(self.export_pdf)
+            layout.addWidget(export_button)
+
+        chart_tab.setLayout(layout)
+        return chart_tab
+
+    def _watch_reloads(self, view):
+        if self.reloader is not None:
+            self.reloader.register(view)
 
     def export_pdf(self):
         file_name, _ = QFileDialog.getSaveFileName(self, "Zapisz PDF", "", "PDF files (*.pdf)")
         if file_name:
+            self.chart_view.settle()
             self.exporter.export(self.chart_view.figure, file_name)
+
+    def export_map_pdf(self, map_tab):
+        figure = map_tab.export_figure()
+        if figure is None:
+            print("⚠️ Brak danych do eksportu mapy")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Zapisz PDF", "", "PDF files (*.pdf)")
+        if file_name:
+            self.exporter.export(figure, file_name)
@@ -1,56 +1,23 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider
 from PyQt5.QtCore import Qt
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl
-import pandas as pd
-import geopandas as gpd
-import plotly.graph_objects as go
-import plotly.io as pio
-import json
-import tempfile
+from data.catalog import DataCatalog
+from core.scheduler import RenderScheduler
+from core.state import AppState, DATA
+from data.query_cache import QueryCache
+from gui.map_view.map_models import CountryEnvModel
+from gui.map_view.map_page import PreparedMap, create_map_page, warm_map_model
+from gui.map_view.static_map import render_static_map
+
+EV_COUNTRIES_RANGE = "ev_countries.range"
 
 class ElectricVehiclesCountriesTab(QWidget):
-    def __init__(self, data_path: str):
+    def __init__(self, catalog: DataCatalog, state: AppState = None, prepared: PreparedMap = None):
         super().__init__()
+        self.state = state or AppState()
 
-        self.country_name_to_code = {
-            "Germany": "DE",
-            "France": "FR",
-            "Italy": "IT",
-            "Spain": "ES",
-            "Poland": "PL",
-            "Netherlands": "NL",
-            "Belgium": "BE",
-            "Sweden": "SE",
-            "Finland": "FI",
-            "Austria": "AT",
-            "Portugal": "PT",
-            "Czechia": "CZ",
-            "Denmark": "DK",
-            "Greece": "EL",
-            "Hungary": "HU",
-            "Ireland": "IE",
-            "Slovakia": "SK",
-            "Slovenia": "SI",
-            "Croatia": "HR",
-            "Estonia": "EE",
-            "Latvia": "LV",
-            "Lithuania": "LT",
-            "Luxembourg": "LU",
-            "Bulgaria": "BG",
-            "Romania": "RO",
-            "Norway": "NO",
-            "Switzerland": "CH",
-            "Iceland": "IS",
-            "Cyprus": "CY",
-        }
-
-        self.env_data = self.load_env_data(data_path)
-        self.years = sorted(self.env_data["year"].unique())
-        self.start_year = self.years[0]
-        self.end_year = self.years[-1]
-
-        self.map_data = self.load_map_data()
+        self.model = prepared.model if prepared is not None else CountryEnvModel(catalog)
+        self.years = self.model.years
+        self.state.set(EV_COUNTRIES_RANGE, (self.years[0], self.years[-1]))
 
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
@@ -82,127 +49,105 @@ class ElectricVehiclesCountriesTab(QWidget):
         sliders_layout.addWidget(self.slider_end)
         self.layout.addLayout(sliders_layout)
 
-        self.web_view = QWebEngineView()
-        self.web_view.setMinimumSize(1200, 800)
-        self.layout.addWidget(self.web_view)
+        self.map_page = create_map_page(self.model, self.layout)
+
+        self.scheduler = RenderScheduler.shared()
+        self.frame_cache = QueryCache(max_entries=64)
+        self.data_binding = self.state.bind([DATA], self.on_data_reloaded)
+        self.binding = self.state.bind([EV_COUNTRIES_RANGE], self.request_render)
+        self.render_map(prepared.frame if prepared is not None else None)
+
+    @staticmethod
+    def prepare(catalog: DataCatalog) -> PreparedMap:
+        model = CountryEnvModel(catalog)
+        warm_map_model(model)
+        frame = model.compute_frame(model.years[0], model.years[-1])
+        return PreparedMap(catalog, model, frame)
+
+    @property
+    def start_year(self):
+        return self.state.get(EV_COUNTRIES_RANGE)[0]
+
+    @property
+    def end_year(self):
+        return self.state.get(EV_COUNTRIES_RANGE)[1]
 
-        self.render_map()
+    def set_years(self, years: list):
+        if years == self.years:
+            return
+        self.years = years
+        start, end = self.start_year, self.end_year
+        if start not in years or end not in years:
+            start, end = years[0], years[-1]
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(True)
+            slider.setMaximum(len(years) - 1)
+        self.slider_start.setValue(years.index(start))
+        self.slider_end.setValue(years.index(end))
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(False)
+        self.state.set(EV_COUNTRIES_RANGE, (start, end))
+        self.label_start.setText(f"Od roku: {start}")
+        self.label_end.setText(f"Do roku: {end}")
+
+    def prepare_reload(self, repository, geometry=None):
+        model = CountryEnvModel(repository.catalog, geometry, base=self.model)
+        self.map_page.warm(model)
+        return model
+
+    def reload_payload(self):
+        return self.model
+
+    def apply_reload(self, model: CountryEnvModel):
+        self.model = model
+        self.map_page.set_model(model)
+        self.frame_cache.clear()
+
+    def on_data_reloaded(self):
+        self.set_years(self.model.years)
+        self.request_render()
 
     def on_start_changed(self, index: int):
         year = self.years[index]
         if year > self.end_year:
             self.slider_end.setValue(index)
             return
-        self.start_year = year
+        self.state.set(EV_COUNTRIES_RANGE, (year, self.end_year))
         self.label_start.setText(f"Od roku: {self.start_year}")
-        self.render_map()
 
     def on_end_changed(self, index: int):
         year = self.years[index]
         if year < self.start_year:
             self.slider_start.setValue(index)
             return
-        self.end_year = year
+        self.state.set(EV_COUNTRIES_RANGE, (self.start_year, year))
         self.label_end.setText(f"Do roku: {self.end_year}")
-        self.render_map()
-
-    def load_env_data(self, data_path: str) -> pd.DataFrame:
-        df_raw = (
-            pd.read_excel(
-                data_path,
-                sheet_name="Sheet 1",
-                skiprows=8,
-                engine="openpyxl",
-            )
-            .iloc[1:]
-        )
 
-        year_columns = {
-            "2013": 2013,
-            "2014": 2014,
-            "2015": 2015,
-            "2016": 2016,
-            "2017": 2017,
-            "2018": 2018,
-            "2019": 2019,
-            "2020": 2020,
-            "2021": 2021,
-            "2022": 2022,
-        }
-        records = []
-        for _, row in df_raw.iterrows():
-            name = str(row.get("TIME", "")).strip()
-            geo = self.country_name_to_code.get(name)
-            if not geo:
-                continue
-            for col_name, rok in year_columns.items():
-                val = row.get(col_name)
-                if pd.notna(val) and isinstance(val, (int, float)):
-                    records.append({
-                        "geo": geo,
-                        "name": name,
-                        "year": rok,
-                        "value": val
-                    })
-        return pd.DataFrame(records)
-
-    def load_map_data(self) -> gpd.GeoDataFrame:
-        gdf = gpd.read_file("data/NUTS_RG_01M_2021_4326.geojson")
-        gdf = gdf[gdf["LEVL_CODE"] == 0]
-        gdf = gdf[["CNTR_CODE", "NAME_LATN", "geometry"]].copy()
-        return gdf.rename(columns={"CNTR_CODE": "geo", "NAME_LATN": "name"})
-
-    def render_map(self):
-                                                            
-        df_range = self.env_data[
-            (self.env_data["year"] >= self.start_year) &
-            (self.env_data["year"] <= self.end_year)
-        ]
-        cum_env = (
-            df_range
-            .groupby("geo", as_index=False)["value"]
-            .sum()
-            .rename(columns={"value": "cumulative_env"})
+    def request_render(self):
+        start, end = self.start_year, self.end_year
+        self.scheduler.schedule(
+            self,
+            lambda token: self.cached_frame(start, end, token=token),
+            self.show_frame,
         )
-        merged = self.map_data.merge(cum_env, on="geo", how="left")
-        merged = merged[merged["cumulative_env"].notna()]
 
-        if merged.empty or merged.geometry.isnull().all():
-            return
+    def render_map(self, frame=None):
+        self.show_frame(frame if frame is not None else self.cached_frame(self.start_year, self.end_year))
 
-        geojson = json.loads(merged.to_json())
-        fig = go.Figure(go.Choropleth(
-            geojson=geojson,
-            locations=merged["geo"],
-            z=merged["cumulative_env"],
-            featureidkey="properties.geo",
-            text=merged["name"],
-            colorscale="RdPu",
-            marker_line_width=0.5,
-            colorbar=dict(
-                title=f"Suma ENV ({self.start_year}–{self.end_year})",
-                x=1.02,
-                len=0.75,
-                thickness=15
-            )
-        ))
-        fig.update_traces(hovertemplate="%{text}<br>%{z}<extra></extra>")
-
-        fig.update_geos(
-            projection_type="mercator",
-            fitbounds="locations",
-            lataxis_range=[34, 72],
-            lonaxis_range=[-25, 45],
-            visible=True
+    def cached_frame(self, *key, token=None):
+        return self.frame_cache.get_or_compute(
+            key, lambda: self.compute_frame(*key, token), self.state.version_of(DATA)
         )
 
-        fig.update_layout(
-            title=f"Pojazdy elektryczne – Europa ({self.start_year}–{self.end_year})",
-            margin={"r": 0, "t": 50, "l": 0, "b": 0},
-            height=800,
-            width=1200
-        )
+    def show_frame(self, frame):
+        if frame is not None:
+            self.map_page.show(frame)
+
+    def export_figure(self):
+        frame = self.cached_frame(self.start_year, self.end_year)
+        if frame is None:
+            return None
+        return render_static_map(frame, self.model.static_paths(), self.model.figure_style)
 
-        html_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        pio.write_html(fig, file=html_file.name, full_html=True, include_plotlyjs="cdn")
-        self.web_view.load(QUrl.fromLocalFile(html_file.name))
+    def compute_frame(self, start_year, end_year, token=None):
+        return self.model.compute_frame(start_year, end_year, token)
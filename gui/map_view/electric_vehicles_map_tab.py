@@ -1,32 +1,44 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider
-from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-import pandas as pd
-import geopandas as gpd
-import plotly.graph_objects as go
-import plotly.io as pio
-import json
-import tempfile
-import warnings
-warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+from PyQt5.QtCore import Qt
+from gui.level_switch.level_switch import LevelSwitch
 from gui.region_switch.region_switch import RegionSwitch
+from data.catalog import DataCatalog
+from core.scheduler import RenderScheduler
+from core.state import AppState, DATA
+from data.geometry import EUROPE
+from data.query_cache import QueryCache
+from gui.map_view.map_models import RegionShareModel
+from gui.map_view.map_page import PreparedMap, create_map_page, warm_map_model
+from gui.map_view.static_map import render_static_map
+
+EV_MAP_RANGE = "ev_map.range"
+EV_MAP_REGION = "ev_map.region"
+EV_MAP_LEVEL = "ev_map.level"
 
 class ElectricVehiclesMapTab(QWidget):
-    def __init__(self, data_path: str):
+    def __init__(self, catalog: DataCatalog, state: AppState = None, prepared: PreparedMap = None):
         super().__init__()
-
-        self.ev_data = self.load_ev_data(data_path)
-        self.years = sorted(self.ev_data["year"].unique())
-        self.start_year = self.years[0]
-        self.end_year = self.years[-1]
-        self.map_data = self.load_map_data()
-        self._complete_ev_data()
-        self.region_mode = "EU"
+        self.state = state or AppState()
+
+        self.model = prepared.model if prepared is not None else RegionShareModel(catalog)
+        self.models = {self.model.level: self.model}
+        self.years = self.model.years
+        self.state.update({
+            EV_MAP_RANGE: (self.years[0], self.years[-1]),
+            EV_MAP_REGION: EUROPE,
+            EV_MAP_LEVEL: self.model.level,
+        })
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
-        self.region_switch = RegionSwitch(self.on_region_changed)
-        self.layout.addWidget(self.region_switch)
+        switches_layout = QHBoxLayout()
+        self.region_switch = RegionSwitch(self.on_region_changed, self.model.countries())
+        self.level_switch = LevelSwitch(
+            self.on_level_changed, self.model.level, self.model.hierarchy.available_levels()
+        )
+        switches_layout.addWidget(self.region_switch)
+        switches_layout.addWidget(self.level_switch)
+        self.layout.addLayout(switches_layout)
 
         sliders_layout = QHBoxLayout()
 
@@ -55,169 +67,145 @@ class ElectricVehiclesMapTab(QWidget):
         sliders_layout.addWidget(self.slider_end)
         self.layout.addLayout(sliders_layout)
 
-        self.web_view = QWebEngineView()
-        self.web_view.setMinimumSize(1200, 800)
-        self.layout.addWidget(self.web_view)
-
-        self.render_map()
+        self.map_page = create_map_page(self.model, self.layout)
+
+        self.scheduler = RenderScheduler.shared()
+        self.frame_cache = QueryCache(max_entries=64)
+        self.data_binding = self.state.bind([DATA], self.on_data_reloaded)
+        self.binding = self.state.bind([EV_MAP_RANGE, EV_MAP_REGION, EV_MAP_LEVEL], self.request_render)
+        self.render_map(prepared.frame if prepared is not None else None)
+
+    @staticmethod
+    def prepare(catalog: DataCatalog) -> PreparedMap:
+        model = RegionShareModel(catalog)
+        warm_map_model(model)
+        frame = model.compute_frame(model.years[0], model.years[-1], EUROPE)
+        return PreparedMap(catalog, model, frame)
+
+    @property
+    def start_year(self):
+        return self.state.get(EV_MAP_RANGE)[0]
+
+    @property
+    def end_year(self):
+        return self.state.get(EV_MAP_RANGE)[1]
+
+    @property
+    def region_mode(self):
+        return self.state.get(EV_MAP_REGION)
+
+    @property
+    def level(self):
+        return self.state.get(EV_MAP_LEVEL)
+
+    def model_at(self, level: int) -> RegionShareModel:
+        # Wywoływane też z wątku roboczego; po przeładowaniu słownik jest
+        # podmieniany, więc spóźniony model trafia do starego słownika.
+        models, base = self.models, self.model
+        model = models.get(level)
+        if model is None:
+            model = models.setdefault(level, base.at_level(level))
+        return model
+
+    def set_years(self, years: list):
+        if years == self.years:
+            return
+        self.years = years
+        start, end = self.start_year, self.end_year
+        if start not in years or end not in years:
+            start, end = years[0], years[-1]
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(True)
+            slider.setMaximum(len(years) - 1)
+        self.slider_start.setValue(years.index(start))
+        self.slider_end.setValue(years.index(end))
+        for slider in (self.slider_start, self.slider_end):
+            slider.blockSignals(False)
+        self.state.set(EV_MAP_RANGE, (start, end))
+        self.label_start.setText(f"Od roku: {start}")
+        self.label_end.setText(f"Do roku: {end}")
+
+    def prepare_reload(self, repository, geometry=None):
+        model = RegionShareModel(repository.catalog, geometry, base=self.model, level=self.level)
+        self.map_page.warm(model)
+        return model
+
+    def reload_payload(self):
+        return self.model
+
+    def apply_reload(self, model: RegionShareModel):
+        self.model = model
+        self.models = {model.level: model}
+        self.map_page.set_model(model)
+        self.frame_cache.clear()
+
+    def on_data_reloaded(self):
+        self.region_switch.set_countries(self.model.countries())
+        self.set_years(self.model.years)
+        self.request_render()
 
     def on_start_changed(self, index: int):
         year = self.years[index]
         if year > self.end_year:
             self.slider_end.setValue(index)
             return
-        self.start_year = year
+        self.state.set(EV_MAP_RANGE, (year, self.end_year))
         self.label_start.setText(f"Od roku: {self.start_year}")
-        self.render_map()
 
     def on_end_changed(self, index: int):
         year = self.years[index]
         if year < self.start_year:
             self.slider_start.setValue(index)
             return
-        self.end_year = year
+        self.state.set(EV_MAP_RANGE, (self.start_year, year))
         self.label_end.setText(f"Do roku: {self.end_year}")
-        self.render_map()
 
     def on_region_changed(self, mode: str):
-        self.region_mode = mode
-        self.render_map()
-
-    def load_ev_data(self, data_path: str) -> pd.DataFrame:
-
-        df_raw = (
-            pd.read_excel(
-                data_path,
-                sheet_name="Sheet 4",                   
-                skiprows=8,
-                engine="openpyxl",
-            )
-            .iloc[1:]
-        )
-        year_columns = {
-            "2018": 2018,
-            "2019": 2019,
-            "2020": 2020,
-            "2021": 2021,
-            "2022": 2022,
-        }
-        records = []
-        for _, row in df_raw.iterrows():
-            geo = str(row["TIME"]).strip()
-            name = str(row["TIME.1"]).strip()
-                                                                        
-            for col_name, rok in year_columns.items():
-                val = row.get(col_name)
-                if pd.notna(val) and isinstance(val, (int, float)):
-                    records.append({
-                        "geo": geo,
-                        "name": name,
-                        "year": rok,
-                        "value": val
-                    })
-        return pd.DataFrame(records)
-
-    def load_map_data(self) -> gpd.GeoDataFrame:
-        gdf = gpd.read_file("data/NUTS_RG_01M_2021_4326.geojson")
-        gdf = gdf[gdf["LEVL_CODE"] == 2]         
-        gdf = gdf[["NUTS_ID", "geometry"]].copy()
-        return gdf.rename(columns={"NUTS_ID": "geo"})
-
-    def _complete_ev_data(self) -> None:
-        nuts1_to_nuts2 = {}
-        for geo in self.map_data["geo"]:
-            prefix = geo[:3] if not geo.startswith("FRY") else "FRY"
-            nuts1_to_nuts2.setdefault(prefix, set()).add(geo)
-
-        new_rows = []
-        df = self.ev_data
-        for prefix, group in df[df["geo"].str.len() == 3].groupby("geo"):
-            if prefix in nuts1_to_nuts2:
-                has_nuts2 = any(df["geo"].str.startswith(prefix) & (df["geo"].str.len() == 4))
-                if not has_nuts2:
-                    for _, row in group.iterrows():
-                        for geo in nuts1_to_nuts2[prefix]:
-                            new_rows.append({
-                                "geo": geo,
-                                "name": row["name"],
-                                "year": row["year"],
-                                "value": row["value"],
-                            })
-
-        if new_rows:
-            self.ev_data = pd.concat([self.ev_data, pd.DataFrame(new_rows)], ignore_index=True)
-                            
-        self.ev_data = self.ev_data[self.ev_data["geo"].str.len() == 4]
-
-    def render_map(self):
-        df_range = self.ev_data[
-            (self.ev_data["year"] >= self.start_year) &
-            (self.ev_data["year"] <= self.end_year)
-        ]
-
-        avg_share = (
-            df_range
-            .groupby("geo", as_index=False)["value"]
-            .mean()
-            .rename(columns={"value": "avg_share"})
-        )
-        region_names = df_range[["geo", "name"]].drop_duplicates(subset="geo")
-        avg_share = avg_share.merge(region_names, on="geo", how="left")
+        self.state.set(EV_MAP_REGION, mode)
 
-        merged = self.map_data.merge(avg_share, on="geo", how="left")
-        if self.region_mode == "PL":
-            merged = merged[merged["geo"].str.startswith("PL")]
-        merged = merged[merged["avg_share"].notna()]
+    def on_level_changed(self, level: int):
+        self.state.set(EV_MAP_LEVEL, level)
 
-        if merged.empty or merged.geometry.isnull().all():
+    def use_model(self, model: RegionShareModel):
+        if model is self.model:
             return
+        previous, self.model = self.model, model
+        self.map_page.set_model(model)
+        if model.partitions is not previous.partitions:
+            self.region_switch.set_countries(model.countries())
+
+    def request_render(self):
+        key = self.frame_key()
+        self.scheduler.schedule(
+            self,
+            lambda token: self.cached_frame(*key, token=token),
+            lambda frame: self.show_frame(frame, key[-1]),
+        )
+
+    def render_map(self, frame=None):
+        key = self.frame_key()
+        self.show_frame(frame if frame is not None else self.cached_frame(*key), key[-1])
 
-        geojson = json.loads(merged.to_json())
-        fig = go.Figure(go.Choropleth(
-            geojson=geojson,
-            locations=merged["geo"],
-            z=merged["avg_share"],
-            featureidkey="properties.geo",
-            text=merged["name"],
-            colorscale="Viridis",
-            marker_line_width=0.5,
-            colorbar=dict(
-                title=f"Średni udział ({self.start_year}–{self.end_year})",
-                x=1.02,
-                len=0.75,
-                thickness=15,
-                ticksuffix="%"
-            )
-        ))
-        fig.update_traces(hovertemplate="%{text}<br>%{z}%<extra></extra>")
-
-        if self.region_mode == "PL":
-            minx, miny, maxx, maxy = merged.geometry.total_bounds
-            margin = 1
-            lat_range = [miny - margin, maxy + margin]
-            lon_range = [minx - margin, maxx + margin]
-            fig.update_geos(
-                projection_type="mercator",
-                fitbounds="locations",
-                lataxis_range=lat_range,
-                lonaxis_range=lon_range,
-                visible=True
-            )
-        else:
-            fig.update_geos(
-                projection_type="mercator",
-                fitbounds="locations",
-                lataxis_range=[34, 72],
-                lonaxis_range=[-25, 45],
-                visible=True
-            )
-        title_region = "Polska" if self.region_mode == "PL" else "Regiony NUTS2"
-        fig.update_layout(
-            title=f"Udział pojazdów elektrycznych – {title_region} ({self.start_year}–{self.end_year})",
-            margin={"r": 0, "t": 50, "l": 0, "b": 0},
-            height=800,
-            width=1200
+    def frame_key(self) -> tuple:
+        return self.start_year, self.end_year, self.region_mode, self.level
+
+    def cached_frame(self, *key, token=None):
+        return self.frame_cache.get_or_compute(
+            key, lambda: self.compute_frame(*key, token), self.state.version_of(DATA)
         )
-        html_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        pio.write_html(fig, file=html_file.name, full_html=True, include_plotlyjs="cdn")
-        self.web_view.load(QUrl.fromLocalFile(html_file.name))
+
+    def show_frame(self, frame, level: int = None):
+        if level is not None:
+            self.use_model(self.model_at(level))
+        if frame is not None:
+            self.map_page.show(frame)
+
+    def export_figure(self):
+        frame = self.cached_frame(*self.frame_key())
+        if frame is None:
+            return None
+        model = self.model_at(self.level)
+        return render_static_map(frame, model.static_paths(), model.figure_style)
+
+    def compute_frame(self, start_year, end_year, region_mode, level, token=None):
+        return self.model_at(level).compute_frame(start_year, end_year, region_mode, token)
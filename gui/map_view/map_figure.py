@@ -0,0 +1,92 @@
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from core.tracing import traced
+from data.geometry import EUROPE
+
+MapFrame = namedtuple(
+    "MapFrame",
+    ["locations", "z", "text", "colorbar_title", "title", "lat_range", "lon_range", "region"],
+    defaults=(EUROPE,),
+)
+
+MAP_DIV_ID = "choropleth-map"
+TOPOLOGY_JS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "topology.js")
+MAP_HTML_TEMPLATE = """<html>
+<head><meta charset="utf-8" /></head>
+<body>
+<div id="{div_id}" style="height:{height}px; width:{width}px;"></div>
+<script src="{plotly_src}"></script>
+{decoder}
+<script>
+var figure = {figure};
+figure.data[0].geojson = topologyFeatures({topology});
+Plotly.newPlot("{div_id}", figure.data, figure.layout, {{"responsive": true}});
+</script>
+</body>
+</html>
+"""
+
+
+@traced("render.figure")
+def build_choropleth_figure(frame: MapFrame, geojson: dict, colorscale: str, hovertemplate: str,
+                            colorbar: dict = None, height: int = 800,
+                            width: int = 1200) -> go.Figure:
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson,
+        locations=list(frame.locations),
+        z=list(frame.z),
+        featureidkey="properties.geo",
+        text=list(frame.text),
+        colorscale=colorscale,
+        marker_line_width=0.5,
+        colorbar=dict(title=frame.colorbar_title, **(colorbar or {})),
+    ))
+    fig.update_traces(hovertemplate=hovertemplate)
+    fig.update_geos(
+        projection_type="mercator",
+        fitbounds="locations",
+        lataxis_range=list(frame.lat_range),
+        lonaxis_range=list(frame.lon_range),
+        visible=True
+    )
+    fig.update_layout(
+        title=frame.title,
+        margin={"r": 0, "t": 50, "l": 0, "b": 0},
+        height=height,
+        width=width
+    )
+    return fig
+
+
+@lru_cache(maxsize=1)
+def topology_script() -> str:
+    with open(TOPOLOGY_JS_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _script_safe(text: str) -> str:
+    return text.replace("</", "<\\/")
+
+
+@traced("serialize.html")
+def choropleth_html(figure: go.Figure, topology: str, plotly_src: str,
+                    decoder_src: str = None, div_id: str = MAP_DIV_ID) -> str:
+    # Geometria trafia na stronę jako skwantowana topologia i jest dekodowana
+    # do GeoJSON w przeglądarce, zamiast wysyłać pełne współrzędne każdego regionu.
+    if decoder_src:
+        decoder = f'<script src="{decoder_src}"></script>'
+    else:
+        decoder = f"<script>{topology_script()}</script>"
+    return MAP_HTML_TEMPLATE.format(
+        div_id=div_id,
+        height=figure.layout.height or 800,
+        width=figure.layout.width or 1200,
+        plotly_src=plotly_src,
+        decoder=decoder,
+        figure=_script_safe(pio.to_json(figure, validate=False)),
+        topology=_script_safe(topology),
+    )
@@ -0,0 +1,231 @@
+import copy
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from common.countries import COUNTRY_NAMES
+from core.tracing import traced
+from data.catalog import ENV, EV_SHARE
+from data.geometry import EUROPE, NutsGeometryCache
+from data.indexed_store import GeoYearMatrix
+from gui.map_view.map_figure import MapFrame
+from gui.map_view.static_map import ProjectedPaths
+
+COUNTRY_NAME_TO_CODE = {
+    "Germany": "DE",
+    "France": "FR",
+    "Italy": "IT",
+    "Spain": "ES",
+    "Poland": "PL",
+    "Netherlands": "NL",
+    "Belgium": "BE",
+    "Sweden": "SE",
+    "Finland": "FI",
+    "Austria": "AT",
+    "Portugal": "PT",
+    "Czechia": "CZ",
+    "Denmark": "DK",
+    "Greece": "EL",
+    "Hungary": "HU",
+    "Ireland": "IE",
+    "Slovakia": "SK",
+    "Slovenia": "SI",
+    "Croatia": "HR",
+    "Estonia": "EE",
+    "Latvia": "LV",
+    "Lithuania": "LT",
+    "Luxembourg": "LU",
+    "Bulgaria": "BG",
+    "Romania": "RO",
+    "Norway": "NO",
+    "Switzerland": "CH",
+    "Iceland": "IS",
+    "Cyprus": "CY",
+}
+
+
+class _GeometryMixin:
+    level = None
+
+    def _init_geometry(self, geometry: NutsGeometryCache, base):
+        if base is not None and geometry is None and base.level == self.level:
+            self.geometry, self.map_data = base.geometry, base.map_data
+            self.partitions, self._static_paths = base.partitions, base._static_paths
+        else:
+            if geometry is None:
+                geometry = base.geometry if base is not None else NutsGeometryCache.shared()
+            self.geometry = geometry
+            self.map_data = self.load_map_data(self.geometry)
+            self.partitions = self.geometry.partitions(self.level)
+            self._static_paths = None
+
+    def countries(self) -> list:
+        return self.partitions.countries()
+
+    def view_ranges(self, region: str, margin: float = 1.0) -> tuple:
+        minx, miny, maxx, maxy = self.partitions.bounds(region)
+        return [miny - margin, maxy + margin], [minx - margin, maxx + margin]
+
+    def topology(self, region: str = EUROPE) -> str:
+        return self.geometry.topology(self.level, region)
+
+    def static_paths(self) -> ProjectedPaths:
+        if self._static_paths is None:
+            self._static_paths = ProjectedPaths.from_frame(self.map_data)
+        return self._static_paths
+
+
+class RegionShareModel(_GeometryMixin):
+    level = 2
+    figure_style = dict(
+        colorscale="Viridis",
+        hovertemplate="%{text}<br>%{z}%<extra></extra>",
+        colorbar=dict(x=1.02, len=0.75, thickness=15, ticksuffix="%"),
+    )
+
+    def __init__(self, catalog, geometry: NutsGeometryCache = None,
+                 base: "RegionShareModel" = None, level: int = None):
+        if level is not None:
+            self.level = level
+        elif base is not None:
+            self.level = base.level
+        self._init_geometry(geometry, base)
+        self.hierarchy = self.geometry.hierarchy()
+        self.ev_data = self.load_ev_data(catalog)
+        self.years = sorted(self.ev_data["year"].unique())
+        self._init_level()
+
+    def at_level(self, level: int) -> "RegionShareModel":
+        if level == self.level:
+            return self
+        model = copy.copy(self)
+        model.level = level
+        model._init_geometry(self.geometry, None)
+        model._init_level()
+        return model
+
+    def _init_level(self):
+        level_data = self.hierarchy.complete(self.ev_data, self.level, how="mean")
+        self.ev_index = GeoYearMatrix.from_long(level_data, year_col="year", value_col="value")
+        self.region_codes = self.map_data["geo"].to_numpy()
+        self.index_rows = self.ev_index.geo_codes(self.region_codes)
+        self.index_rows[self.map_data.geometry.isna().to_numpy()] = -1
+
+        names = self.ev_data.drop_duplicates("geo").set_index("geo")["name"]
+        fallback = self.hierarchy.names[self.hierarchy.nodes(self.region_codes)]
+        self.region_names = (
+            names.reindex(self.region_codes).fillna(pd.Series(fallback, index=self.region_codes))
+            .to_numpy(dtype=object)
+        )
+
+    def load_ev_data(self, catalog) -> pd.DataFrame:
+        return catalog.table(EV_SHARE).rename(
+            columns={"TIME_PERIOD": "year", "OBS_VALUE": "value", "OBS_FLAG": "flag"}
+        )
+
+    def load_map_data(self, geometry: NutsGeometryCache = None) -> gpd.GeoDataFrame:
+        gdf = (geometry or NutsGeometryCache.shared()).level(self.level)
+        gdf = gdf[["NUTS_ID", "geometry"]].copy()
+        return gdf.rename(columns={"NUTS_ID": "geo"})
+
+    @traced("aggregate.map_regions")
+    def compute_frame(self, start_year, end_year, region_mode, token=None):
+        if region_mode not in self.partitions:
+            return None
+        rows = self.partitions.rows(region_mode)
+        rows = rows[self.index_rows[rows] >= 0]
+        avg_share = self.ev_index.range_mean(start_year, end_year, rows=self.index_rows[rows])
+        if token is not None:
+            token.check()
+        has_data = ~np.isnan(avg_share)
+        rows = rows[has_data]
+
+        if not len(rows):
+            return None
+
+        lat_range, lon_range = self.view_ranges(region_mode)
+        if region_mode == EUROPE:
+            title_region = f"Regiony NUTS{self.level}"
+        else:
+            title_region = COUNTRY_NAMES.get(region_mode, region_mode)
+        return MapFrame(
+            locations=self.region_codes[rows].tolist(),
+            z=avg_share[has_data].tolist(),
+            text=self.region_names[rows].tolist(),
+            colorbar_title=f"Średni udział ({start_year}–{end_year})",
+            title=f"Udział pojazdów elektrycznych – {title_region} ({start_year}–{end_year})",
+            lat_range=lat_range,
+            lon_range=lon_range,
+            region=region_mode,
+        )
+
+
+class CountryEnvModel(_GeometryMixin):
+    level = 0
+    figure_style = dict(
+        colorscale="RdPu",
+        hovertemplate="%{text}<br>%{z}<extra></extra>",
+        colorbar=dict(x=1.02, len=0.75, thickness=15),
+    )
+
+    def __init__(self, catalog, geometry: NutsGeometryCache = None, base: "CountryEnvModel" = None):
+        self.country_name_to_code = COUNTRY_NAME_TO_CODE
+        self.env_data = self.load_env_data(catalog)
+        self.env_index = GeoYearMatrix.from_long(
+            self.env_data, year_col="year", value_col="value"
+        )
+        self.years = self.env_index.years.tolist()
+
+        self._init_geometry(geometry, base)
+        self.map_regions = self.map_data.loc[
+            self.map_data.geometry.notna(), ["geo", "name"]
+        ]
+
+    def load_env_data(self, catalog) -> pd.DataFrame:
+        env = catalog.table(ENV)
+        if "geo" in env:
+            # Źródło bulk ma kody; zostają tylko kraje znane także z nazw w Excelu.
+            codes = env["geo"].where(env["geo"].isin(set(self.country_name_to_code.values())))
+        else:
+            codes = env["name"].map(self.country_name_to_code)
+        records = pd.DataFrame({
+            "geo": codes,
+            "name": env["name"],
+            "year": env["TIME_PERIOD"],
+            "value": env["OBS_VALUE"],
+            "flag": env["OBS_FLAG"],
+        })
+        return records[records["geo"].notna()].reset_index(drop=True)
+
+    def load_map_data(self, geometry: NutsGeometryCache = None) -> gpd.GeoDataFrame:
+        gdf = (geometry or NutsGeometryCache.shared()).level(0)
+        gdf = gdf[["CNTR_CODE", "NAME_LATN", "geometry"]].copy()
+        return gdf.rename(columns={"CNTR_CODE": "geo", "NAME_LATN": "name"})
+
+    @traced("aggregate.map_countries")
+    def compute_frame(self, start_year, end_year, token=None):
+        counts = self.env_index.range_count(start_year, end_year)
+        sums = self.env_index.range_sum(start_year, end_year)
+        has_data = counts > 0
+        cum_env = pd.DataFrame({
+            "geo": self.env_index.geos[has_data],
+            "cumulative_env": sums[has_data],
+        })
+        if token is not None:
+            token.check()
+        merged = self.map_regions.merge(cum_env, on="geo", how="left")
+        merged = merged[merged["cumulative_env"].notna()]
+
+        if merged.empty:
+            return None
+
+        lat_range, lon_range = self.view_ranges(EUROPE)
+        return MapFrame(
+            locations=merged["geo"].tolist(),
+            z=merged["cumulative_env"].tolist(),
+            text=merged["name"].tolist(),
+            colorbar_title=f"Suma ENV ({start_year}–{end_year})",
+            title=f"Pojazdy elektryczne – Europa ({start_year}–{end_year})",
+            lat_range=lat_range,
+            lon_range=lon_range,
+        )
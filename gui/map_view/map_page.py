@@ -0,0 +1,160 @@
+import itertools
+import json
+import math
+from collections import namedtuple
+
+import plotly.graph_objects as go
+from core.tracing import active_tracer, now_us, traced
+from gui.map_view.map_figure import MAP_DIV_ID, MapFrame, build_choropleth_figure, choropleth_html
+
+_page_ids = itertools.count(1)
+
+PreparedMap = namedtuple("PreparedMap", ["catalog", "model", "frame"])
+
+
+def _json_safe(values):
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+
+class ChoroplethMapPage:
+    def __init__(self, web_view, model, colorscale: str, hovertemplate: str,
+                 colorbar: dict = None, height: int = 800, width: int = 1200):
+        self.web_view = web_view
+        self.model = model
+        self.topology_key = None
+        self.colorscale = colorscale
+        self.hovertemplate = hovertemplate
+        self.colorbar = colorbar or {}
+        self.height = height
+        self.width = width
+        self.page_name = f"map-{next(_page_ids)}"
+        self._published = False
+        self._loaded = False
+        self._pending = None
+        self._load_started = None
+        self.web_view.loadFinished.connect(self._on_load_finished)
+
+    def show(self, frame: MapFrame):
+        if not self._published:
+            self._load_page(frame)
+        elif not self._loaded:
+            self._pending = frame
+        else:
+            self._apply(frame)
+
+    def warm(self, model):
+        model.topology()
+
+    def set_model(self, model):
+        geometry_changed = model.geometry is not self.model.geometry
+        self.model = model
+        if geometry_changed:
+            self._published = False
+            self._pending = None
+
+    def build_figure(self, frame: MapFrame) -> go.Figure:
+        return build_choropleth_figure(
+            frame, None, self.colorscale, self.hovertemplate,
+            self.colorbar, self.height, self.width,
+        )
+
+    def render_html(self, frame: MapFrame) -> str:
+        from gui.map_view.page_scheme import PLOTLY_JS_URL, TOPOLOGY_JS_URL
+
+        return choropleth_html(
+            self.build_figure(frame), self.model.topology(frame.region),
+            PLOTLY_JS_URL, TOPOLOGY_JS_URL,
+        )
+
+    @traced("serialize.update_script")
+    def update_script(self, frame: MapFrame) -> str:
+        data_update = {
+            "locations": [list(frame.locations)],
+            "z": [_json_safe(float(v) for v in frame.z)],
+            "text": [list(frame.text)],
+            "colorbar.title.text": frame.colorbar_title,
+        }
+        layout_update = {
+            "title.text": frame.title,
+            "geo.lataxis.range": [float(v) for v in frame.lat_range],
+            "geo.lonaxis.range": [float(v) for v in frame.lon_range],
+        }
+        data = json.dumps(data_update)
+        topology_key = (self.model.level, frame.region)
+        if topology_key != self.topology_key:
+            # Zmiana obszaru lub poziomu NUTS podmienia tylko topologię na stronie.
+            data = (
+                f"Object.assign({{geojson: [topologyFeatures({self.model.topology(frame.region)})]}}, "
+                f"{data})"
+            )
+            self.topology_key = topology_key
+        return (
+            f"Plotly.update(document.getElementById({json.dumps(MAP_DIV_ID)}), "
+            f"{data}, {json.dumps(layout_update)});"
+        )
+
+    def _load_page(self, frame: MapFrame):
+        from gui.map_view.page_scheme import MapPageSchemeHandler
+
+        html = self.render_html(frame)
+        url = MapPageSchemeHandler.instance().publish(self.page_name, html)
+        self._published = True
+        self._loaded = False
+        self.topology_key = (self.model.level, frame.region)
+        self._load_started = now_us()
+        self.web_view.load(url)
+
+    def _on_load_finished(self, ok: bool):
+        self._loaded = ok
+        tracer = active_tracer()
+        if tracer is not None and self._load_started is not None:
+            tracer.record("render.webengine_load", self._load_started, now_us(), {"ok": ok})
+        self._load_started = None
+        if not ok:
+            # Następne show() wczyta stronę od nowa zamiast czekać w kolejce.
+            print(f"❌ Nie udało się wczytać strony mapy {self.page_name}")
+            self._published = False
+            self._pending = None
+            return
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            self._apply(frame)
+
+    def _apply(self, frame: MapFrame):
+        script = self.update_script(frame)
+        tracer = active_tracer()
+        if tracer is None:
+            self.web_view.page().runJavaScript(script)
+            return
+        started = now_us()
+        self.web_view.page().runJavaScript(
+            script, lambda _result: tracer.record("render.plotly_update", started, now_us())
+        )
+
+
+def warm_map_model(model):
+    # Bez strony: na wątku roboczym przygotowuje to, czego użyje wybrany backend.
+    from common.config import Config
+
+    if Config().map_backend == "static":
+        model.static_paths()
+    else:
+        model.topology()
+
+
+def create_map_page(model, layout):
+    from common.config import Config
+
+    if Config().map_backend == "static":
+        from gui.map_view.static_map_page import StaticMapPage
+
+        page = StaticMapPage(model.static_paths(), **model.figure_style)
+        layout.addWidget(page.canvas)
+        return page
+
+    from PyQt5.QtWebEngineWidgets import QWebEngineView
+
+    web_view = QWebEngineView()
+    web_view.setMinimumSize(1200, 800)
+    layout.addWidget(web_view)
+    return ChoroplethMapPage(web_view, model, **model.figure_style)
@@ -0,0 +1,74 @@
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QUrl
+from PyQt5.QtWebEngineCore import (
+    QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+)
+
+MAP_SCHEME = b"evmap"
+PLOTLY_JS_URL = "evmap:/plotly.min.js"
+TOPOLOGY_JS_URL = "evmap:/topology.js"
+
+
+def register_map_scheme():
+    scheme = QWebEngineUrlScheme(MAP_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    scheme.setFlags(
+        QWebEngineUrlScheme.SecureScheme
+        | QWebEngineUrlScheme.LocalScheme
+        | QWebEngineUrlScheme.LocalAccessAllowed
+        | QWebEngineUrlScheme.ContentSecurityPolicyIgnored
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class MapPageSchemeHandler(QWebEngineUrlSchemeHandler):
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self._pages = {}
+        self._plotly_js = None
+
+    @classmethod
+    def instance(cls) -> "MapPageSchemeHandler":
+        if cls._instance is None:
+            from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+
+            cls._instance = cls()
+            QWebEngineProfile.defaultProfile().installUrlSchemeHandler(MAP_SCHEME, cls._instance)
+        return cls._instance
+
+    def plotly_js(self) -> bytes:
+        if self._plotly_js is None:
+            from plotly.offline import get_plotlyjs
+            self._plotly_js = get_plotlyjs().encode("utf-8")
+        return self._plotly_js
+
+    def publish(self, name: str, html: str) -> QUrl:
+        self._pages[name] = html.encode("utf-8")
+        return QUrl(f"evmap:/pages/{name}.html")
+
+    def discard(self, name: str):
+        self._pages.pop(name, None)
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        path = job.requestUrl().path()
+        if path == "/plotly.min.js":
+            self._reply(job, b"application/javascript", self.plotly_js())
+            return
+        if path == "/topology.js":
+            from gui.map_view.map_figure import topology_script
+            self._reply(job, b"application/javascript", topology_script().encode("utf-8"))
+            return
+        if path.startswith("/pages/") and path.endswith(".html"):
+            body = self._pages.get(path[len("/pages/"):-len(".html")])
+            if body is not None:
+                self._reply(job, b"text/html", body)
+                return
+        job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+
+    @staticmethod
+    def _reply(job: QWebEngineUrlRequestJob, mime: bytes, body: bytes):
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(body))
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(mime, buffer)
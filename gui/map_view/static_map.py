@@ -0,0 +1,152 @@
+import numpy as np
+import shapely
+from matplotlib import colormaps
+from matplotlib.collections import PathCollection
+from matplotlib.colors import Normalize
+from matplotlib.path import Path
+from matplotlib.ticker import FuncFormatter
+from common.config import Config
+from core.tracing import traced
+from gui.map_view.map_figure import MapFrame
+
+MPL_COLORMAPS = {"Viridis": "viridis", "RdPu": "RdPu"}
+BACKGROUND_COLOR = "#e6e6e6"
+EDGE_COLOR = "#444444"
+MAX_LATITUDE = 85.0
+
+
+def mercator_y(lat) -> np.ndarray:
+    lat = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    return np.degrees(np.log(np.tan(np.pi / 4 + lat / 2)))
+
+
+def _project(coords: np.ndarray) -> np.ndarray:
+    return np.column_stack([coords[:, 0], mercator_y(coords[:, 1])])
+
+
+def _ring_path(rings) -> Path:
+    vertices = []
+    codes = []
+    for ring in rings:
+        coords = shapely.get_coordinates(ring)
+        if len(coords) < 4:
+            continue
+        ring_codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+        ring_codes[0] = Path.MOVETO
+        ring_codes[-1] = Path.CLOSEPOLY
+        vertices.append(coords)
+        codes.append(ring_codes)
+    if not vertices:
+        return Path(np.empty((0, 2)))
+    return Path(np.concatenate(vertices), np.concatenate(codes))
+
+
+class ProjectedPaths:
+    def __init__(self, geos: list, paths: list):
+        self.geos = geos
+        self.paths = paths
+        self.index = {geo: i for i, geo in enumerate(geos)}
+
+    @classmethod
+    @traced("render.static_paths")
+    def from_frame(cls, map_data, tolerance: float = None) -> "ProjectedPaths":
+        if tolerance is None:
+            tolerance = Config().static_map_tolerance
+        data = map_data[map_data.geometry.notna()]
+        geometries = shapely.transform(data.geometry.values, _project)
+        if tolerance:
+            geometries = shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+        paths = []
+        for geometry in geometries:
+            polygons = getattr(geometry, "geoms", [geometry])
+            rings = []
+            for polygon in polygons:
+                if polygon.geom_type != "Polygon" or polygon.is_empty:
+                    continue
+                rings.append(polygon.exterior)
+                rings.extend(polygon.interiors)
+            paths.append(_ring_path(rings))
+        return cls(data["geo"].tolist(), paths)
+
+    def select(self, locations) -> tuple:
+        rows = [(i, self.index[geo]) for i, geo in enumerate(locations) if geo in self.index]
+        return [i for i, _ in rows], [self.paths[j] for _, j in rows]
+
+
+def _tick_formatter(colorbar: dict):
+    suffix = colorbar.get("ticksuffix", "")
+    return FuncFormatter(lambda value, _pos: f"{value:,.{2 if suffix else 0}f}{suffix}")
+
+
+class StaticChoropleth:
+    def __init__(self, figure, paths: ProjectedPaths, colorscale: str, colorbar: dict = None, **_):
+        self.figure = figure
+        self.paths = paths
+        self.cmap = colormaps[MPL_COLORMAPS.get(colorscale, colorscale)]
+        self.colorbar_style = colorbar or {}
+        self.ax = None
+        self.collection = None
+        self.colorbar = None
+        self._locations = None
+
+    def set_paths(self, paths: ProjectedPaths):
+        self.paths = paths
+        self._locations = None
+
+    @traced("render.static_map")
+    def draw(self, frame: MapFrame):
+        z = np.asarray(frame.z, dtype=float)
+        norm = Normalize(*self._limits(z))
+        if self._locations == tuple(frame.locations):
+            self.collection.set_array(z[self._rows])
+            self.collection.set_norm(norm)
+        else:
+            self._build(frame, z, norm)
+        self.colorbar.update_normal(self.collection)
+        self.colorbar.set_label(frame.colorbar_title)
+        self.ax.set_title(frame.title)
+        self.ax.set_xlim(*frame.lon_range)
+        self.ax.set_ylim(*mercator_y(np.asarray(frame.lat_range, dtype=float)))
+
+    @staticmethod
+    def _limits(z: np.ndarray) -> tuple:
+        finite = z[np.isfinite(z)]
+        if not len(finite):
+            return 0.0, 1.0
+        low, high = float(finite.min()), float(finite.max())
+        return (low, high) if high > low else (low, low + 1.0)
+
+    def _build(self, frame: MapFrame, z: np.ndarray, norm: Normalize):
+        self.figure.clear()
+        self.ax = self.figure.add_axes([0.0, 0.0, 0.88, 0.93])
+        self.ax.set_axis_off()
+        self.ax.set_aspect("equal")
+        self.ax.add_collection(PathCollection(
+            self.paths.paths, facecolors=BACKGROUND_COLOR, edgecolors="white", linewidths=0.3,
+        ))
+
+        self._rows, paths = self.paths.select(frame.locations)
+        self.collection = PathCollection(
+            paths, cmap=self.cmap, norm=norm, edgecolors=EDGE_COLOR, linewidths=0.3,
+        )
+        self.collection.set_array(z[self._rows])
+        self.ax.add_collection(self.collection)
+
+        length = self.colorbar_style.get("len", 0.75)
+        cax = self.figure.add_axes([0.9, 0.5 - length / 2, 0.02, length * 0.93])
+        self.colorbar = self.figure.colorbar(self.collection, cax=cax)
+        self.colorbar.formatter = _tick_formatter(self.colorbar_style)
+        self._locations = tuple(frame.locations)
+
+
+def render_static_map(frame: MapFrame, paths: ProjectedPaths, style: dict,
+                      figsize=(12, 8), figure=None):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if figure is None:
+        figure = Figure(figsize=figsize)
+        FigureCanvasAgg(figure)
+    StaticChoropleth(figure, paths, **style).draw(frame)
+    return figure
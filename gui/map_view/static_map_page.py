@@ -0,0 +1,25 @@
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from gui.map_view.map_figure import MapFrame
+from gui.map_view.static_map import ProjectedPaths, StaticChoropleth
+
+
+class StaticMapPage:
+    def __init__(self, paths: ProjectedPaths, colorscale: str, hovertemplate: str = None,
+                 colorbar: dict = None, height: int = 800, width: int = 1200):
+        self.figure = Figure(figsize=(width / 100, height / 100))
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMinimumSize(width, height)
+        self.choropleth = StaticChoropleth(self.figure, paths, colorscale, colorbar)
+
+    def show(self, frame: MapFrame):
+        self.choropleth.draw(frame)
+        self.canvas.draw_idle()
+
+    def warm(self, model):
+        model.static_paths()
+
+    def set_model(self, model):
+        paths = model.static_paths()
+        if paths is not self.choropleth.paths:
+            self.choropleth.set_paths(paths)
@@ -0,0 +1,44 @@
+function topologyFeatures(topology, name) {
+  var transform = topology.transform;
+  var sx = transform.scale[0], sy = transform.scale[1];
+  var tx = transform.translate[0], ty = transform.translate[1];
+  var arcs = topology.arcs.map(function (arc) {
+    var x = 0, y = 0;
+    return arc.map(function (delta) {
+      x += delta[0];
+      y += delta[1];
+      return [x * sx + tx, y * sy + ty];
+    });
+  });
+
+  function ring(indices) {
+    var points = [];
+    indices.forEach(function (index) {
+      var arc = index < 0 ? arcs[~index].slice().reverse() : arcs[index];
+      points.push.apply(points, points.length ? arc.slice(1) : arc);
+    });
+    return points;
+  }
+
+  function polygon(rings) {
+    return rings.map(ring);
+  }
+
+  var collection = topology.objects[name || Object.keys(topology.objects)[0]];
+  return {
+    type: "FeatureCollection",
+    features: collection.geometries.map(function (geometry) {
+      var coordinates = null;
+      if (geometry.type === "Polygon") {
+        coordinates = polygon(geometry.arcs);
+      } else if (geometry.type === "MultiPolygon") {
+        coordinates = geometry.arcs.map(polygon);
+      }
+      return {
+        type: "Feature",
+        properties: geometry.properties,
+        geometry: coordinates && {type: geometry.type, coordinates: coordinates}
+      };
+    })
+  };
+}
@@ -0,0 +1,107 @@
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QLabel
+)
+from PyQt5.QtCore import Qt, QTimer
+from core.tracing import active_tracer, enable_tracing, disable_tracing
+
+COLUMNS = ["Etap", "Liczba", "p50 [ms]", "p90 [ms]", "p99 [ms]", "max [ms]"]
+STAT_KEYS = ["count", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+
+class PerformancePanel(QDockWidget):
+    def __init__(self, parent=None, refresh_ms: int = 1000):
+        super().__init__("Wydajność", parent)
+        self.setObjectName("performance_panel")
+
+        content = QWidget()
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+        self.enabled_box = QCheckBox("Zbieraj pomiary")
+        self.enabled_box.setChecked(active_tracer() is not None)
+        self.enabled_box.toggled.connect(self.set_tracing)
+        self.clear_button = QPushButton("Wyczyść")
+        self.clear_button.clicked.connect(self.clear)
+        self.export_button = QPushButton("Eksportuj trace…")
+        self.export_button.clicked.connect(self.export_trace)
+        controls.addWidget(self.enabled_box)
+        controls.addStretch()
+        controls.addWidget(self.clear_button)
+        controls.addWidget(self.export_button)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        content.setLayout(layout)
+        self.setWidget(content)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+        self.refresh()
+
+    def on_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def set_tracing(self, enabled: bool):
+        if enabled:
+            enable_tracing()
+        else:
+            disable_tracing()
+        self.refresh()
+
+    def clear(self):
+        tracer = active_tracer()
+        if tracer is not None:
+            tracer.clear()
+        self.refresh()
+
+    def refresh(self):
+        tracer = active_tracer()
+        self.export_button.setEnabled(tracer is not None)
+        if tracer is None:
+            self.table.setRowCount(0)
+            self.status_label.setText("Pomiary wyłączone")
+            return
+
+        stats = tracer.stats()
+        self.table.setRowCount(len(stats))
+        for row, name in enumerate(sorted(stats)):
+            entry = stats[name]
+            cells = [name, str(entry["count"])] + [f"{entry[key]:.2f}" for key in STAT_KEYS[1:]]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+        self.status_label.setText(f"Zdarzeń w buforze: {len(tracer.events)}")
+
+    def export_trace(self):
+        tracer = active_tracer()
+        if tracer is None:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Zapisz trace", "trace.json", "Chrome trace (*.json)"
+        )
+        if file_name:
+            try:
+                tracer.export(file_name)
+                self.status_label.setText(f"✅ Zapisano {file_name}")
+            except OSError as e:
+                self.status_label.setText(f"❌ Nie udało się zapisać trace: {e}")
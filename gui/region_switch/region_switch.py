@@ -1,23 +1,77 @@
-from PyQt5.QtWidgets import QWidget, QHBoxLayout, QRadioButton, QLabel, QButtonGroup
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QRadioButton, QLabel, QButtonGroup, QComboBox
+from common.countries import COUNTRY_NAMES
+from data.geometry import EUROPE
+from gui.country_list_widget.search_index import normalize_text
 
 class RegionSwitch(QWidget):
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, countries=None):
         super().__init__()
+        self.callback = callback
 
         layout = QHBoxLayout()
         layout.addWidget(QLabel("Region:"))
 
         self.group = QButtonGroup(self)
         self.eu_btn = QRadioButton("Europa")
-        self.pl_btn = QRadioButton("Polska")
+        self.country_btn = QRadioButton("Kraj:")
         self.eu_btn.setChecked(True)
         self.group.addButton(self.eu_btn)
-        self.group.addButton(self.pl_btn)
+        self.group.addButton(self.country_btn)
 
-        if callback:
-            self.eu_btn.toggled.connect(lambda: callback("EU"))
-            self.pl_btn.toggled.connect(lambda: callback("PL"))
+        self.country_combo = QComboBox()
+        self.country_combo.setEnabled(False)
+        self.set_countries(countries or [])
+
+        self.group.buttonToggled.connect(self.on_toggled)
+        self.country_combo.currentIndexChanged.connect(self.on_country_changed)
 
         layout.addWidget(self.eu_btn)
-        layout.addWidget(self.pl_btn)
+        layout.addWidget(self.country_btn)
+        layout.addWidget(self.country_combo)
+        layout.addStretch()
         self.setLayout(layout)
+
+    @property
+    def region(self) -> str:
+        if self.eu_btn.isChecked() or self.country_combo.currentIndex() < 0:
+            return EUROPE
+        return self.country_combo.currentData()
+
+    def set_countries(self, countries):
+        current = self.country_combo.currentData()
+        entries = sorted(
+            ((COUNTRY_NAMES.get(code, code), code) for code in countries),
+            key=lambda entry: normalize_text(entry[0]),
+        )
+        self.country_combo.blockSignals(True)
+        self.country_combo.clear()
+        for label, code in entries:
+            self.country_combo.addItem(label, code)
+        index = self.country_combo.findData(current if current is not None else "PL")
+        self.country_combo.setCurrentIndex(max(index, 0) if entries else -1)
+        self.country_combo.blockSignals(False)
+        self.country_btn.setEnabled(bool(entries))
+        if not entries or (current is not None and index < 0):
+            self.set_region(EUROPE)
+
+    def set_region(self, code: str):
+        index = self.country_combo.findData(code)
+        if code == EUROPE or index < 0:
+            self.eu_btn.setChecked(True)
+        else:
+            self.country_combo.setCurrentIndex(index)
+            self.country_btn.setChecked(True)
+        self.notify()
+
+    def on_toggled(self, button, checked: bool):
+        if checked:
+            self.country_combo.setEnabled(button is self.country_btn)
+            self.notify()
+
+    def on_country_changed(self, _index: int):
+        if self.country_btn.isChecked():
+            self.notify()
+
+    def notify(self):
+        if self.callback:
+            self.callback(self.region)
@@ -1,26 +1,83 @@
-from PyQt5.QtWidgets import QApplication
-from config.config import Config
-from data.repository import ExcelVehicleDataRepository
-from data.data_service import VehicleDataService
-from export.pdf_exporter import PDFExportStrategy
-from gui.main_window.main_window import MainWindow
+import argparse
 import sys, os
 
+def load_repository():
+    from data.repository import load_repository
+    return load_repository()
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="startup_profile.json",
+        default=None,
+        metavar="PLIK",
+    )
+    parser.add_argument("--startup-budget-ms", type=float, default=None)
+    parser.add_argument("--batch", default=None, metavar="MANIFEST")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="trace.json",
+        default=None,
+        metavar="PLIK",
+    )
+    return parser.parse_known_args(argv[1:])
+
 def main():
-    os.environ["QTWEBENGINE_DISABLE_SANDBOX"] = "1"
-    os.environ["QTWEBENGINE_DISABLE_GPU"] = "1"
-    os.environ["QT_QUICK_BACKEND"] = "software"
+    args, qt_args = parse_args(sys.argv)
+
+    if args.batch:
+        from export.batch import run_manifest
+        sys.exit(run_manifest(args.batch, args.workers))
+
+    profiler = None
+    if args.profile_startup:
+        from core.startup_profile import StartupProfiler
+        profiler = StartupProfiler.install(args.profile_startup, args.startup_budget_ms)
+
+    from core.startup_profile import mark
+    if args.trace:
+        from core.tracing import enable_tracing
+        tracer = enable_tracing()
+    from PyQt5.QtCore import Qt, QCoreApplication
+    from PyQt5.QtWidgets import QApplication
+    from common.config import Config
+    mark("qt_imported")
 
-    app = QApplication(sys.argv)
+    # Backend "static" rysuje mapy matplotlibem i nie może wymagać Chromium.
+    if Config().map_backend != "static":
+        from gui.map_view.page_scheme import register_map_scheme
 
-    config = Config()
+        os.environ["QTWEBENGINE_DISABLE_SANDBOX"] = "1"
+        os.environ["QTWEBENGINE_DISABLE_GPU"] = "1"
+        os.environ["QT_QUICK_BACKEND"] = "software"
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        register_map_scheme()
 
-    repository = ExcelVehicleDataRepository(config.ev_data_path, config.env_data_path)
-    service = VehicleDataService(repository)
+    app = QApplication(sys.argv[:1] + qt_args)
+    mark("qapplication")
+
+    from export.pdf_exporter import PDFExportStrategy
+    from gui.main_window.main_window import MainWindow
+
+    if profiler is not None and profiler.budget_ms is None:
+        profiler.budget_ms = Config().startup_budget_ms
     exporter = PDFExportStrategy()
 
-    window = MainWindow(service, exporter)
+    window = MainWindow(exporter=exporter, repository_loader=load_repository)
+    mark("main_window")
     window.show()
+    mark("window_shown")
+
+    if profiler is not None:
+        app.aboutToQuit.connect(profiler.dump)
+        window.firstTabReady.connect(profiler.dump)
+
+    if args.trace:
+        app.aboutToQuit.connect(lambda: tracer.export(args.trace))
 
     sys.exit(app.exec())
 
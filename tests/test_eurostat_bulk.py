@@ -0,0 +1,129 @@
+import gzip
+
+import numpy as np
+import pytest
+from data.catalog import ENV, EV_COUNTS, EV_SHARE, SnapshotCatalog
+from data.eurostat_bulk import BulkDataCatalog, detect_format, read_bulk
+from data.repository import ExcelVehicleDataRepository
+
+TSV = (
+    "freq,unit,geo\\TIME_PERIOD\t2020 \t2021 \n"
+    "A,NR,PL\t10 \t12 p\n"
+    "A,NR,PL9\t3 \t:\n"
+    "A,NR,PL91\t1 e\t2 \n"
+    "A,PC,PL\t0.5 \t0.7 \n"
+    "A,NR,DE\t: c\t30 \n"
+)
+
+SDMX = (
+    "DATAFLOW,freq,unit,geo,TIME_PERIOD,OBS_VALUE,OBS_FLAG\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,PL:Poland,2020,10,\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,PL:Poland,2021,12,p\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,PL9:Makroregion,2020,3,\n"
+    "ESTAT:X(1.0),A:Annual,PC:Percentage,PL:Poland,2020,0.5,\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,DE:Germany,2020,,c\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,DE:Germany,2021,30,\n"
+    "ESTAT:X(1.0),A:Annual,NR:Number,DE:Germany,2021-Q1,99,\n"
+)
+
+
+@pytest.fixture
+def tsv_path(tmp_path):
+    path = tmp_path / "ev.tsv.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(TSV)
+    return str(path)
+
+
+@pytest.fixture
+def sdmx_path(tmp_path):
+    path = tmp_path / "ev.csv"
+    path.write_text(SDMX, encoding="utf-8")
+    return str(path)
+
+
+def _rows(frame):
+    return {
+        (geo, year): (value, flag)
+        for geo, year, value, flag in frame[["geo", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]].itertuples(index=False)
+    }
+
+
+def test_detect_format(tsv_path, sdmx_path, tmp_path):
+    assert detect_format(tsv_path) == "tsv"
+    assert detect_format(sdmx_path) == "sdmx-csv"
+    other = tmp_path / "other.csv"
+    other.write_text("a,b\n1,2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        detect_format(str(other))
+
+
+def test_read_tsv_filters_flags_and_missing_marker(tsv_path):
+    long = read_bulk(tsv_path, {"unit": "NR"}, chunk_rows=2)
+    assert list(long.columns) == ["geo", "name", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
+    # ":" bez wartości odpada, także z flagą ("c" dla DE 2020).
+    assert _rows(long) == {
+        ("PL", 2020): (10.0, ""), ("PL", 2021): (12.0, "p"),
+        ("PL9", 2020): (3.0, ""),
+        ("PL91", 2020): (1.0, "e"), ("PL91", 2021): (2.0, ""),
+        ("DE", 2021): (30.0, ""),
+    }
+    # Bez etykiet w TSV nazwą jest kod.
+    assert long.loc[long["geo"] == "PL", "name"].unique().tolist() == ["PL"]
+
+
+def test_read_tsv_geo_levels_labels_and_keep_dims(tsv_path):
+    long = read_bulk(tsv_path, {"unit": ["NR", "PC"]}, geo_levels=(0,), labels={"PL": "Poland"},
+                     keep_dims=["unit"])
+    assert set(long["geo"]) == {"PL", "DE"}
+    pl_2020 = long[(long["geo"] == "PL") & (long["TIME_PERIOD"] == 2020)]
+    assert dict(zip(pl_2020["unit"], pl_2020["OBS_VALUE"])) == {"NR": 10.0, "PC": 0.5}
+    assert set(long.loc[long["geo"] == "PL", "name"]) == {"Poland"}
+
+
+def test_read_sdmx_csv_matches_tsv(tsv_path, sdmx_path):
+    long = read_bulk(sdmx_path, {"unit": "NR"}, geo_levels=(0, 1), chunk_rows=3)
+    assert _rows(long) == {
+        ("PL", 2020): (10.0, ""), ("PL", 2021): (12.0, "p"),
+        ("PL9", 2020): (3.0, ""), ("DE", 2021): (30.0, ""),
+    }
+    assert long.set_index("geo")["name"].to_dict() == {"PL": "Poland", "PL9": "Makroregion", "DE": "Germany"}
+    np.testing.assert_array_equal(long["TIME_PERIOD"], sorted(long["TIME_PERIOD"]))
+
+
+def test_unknown_dimension_and_empty_result(tsv_path, sdmx_path):
+    for path in (tsv_path, sdmx_path):
+        with pytest.raises(ValueError):
+            read_bulk(path, {"vehicle": "CAR"})
+    empty = read_bulk(tsv_path, {"unit": "XX"})
+    assert empty.empty and list(empty.columns) == ["geo", "name", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
+
+
+def test_bulk_catalog_keeps_env_codes_for_unlabelled_tsv(tsv_path, tmp_path):
+    env_path = tmp_path / "env.tsv"
+    env_path.write_text(
+        "freq,unit,geo\\TIME_PERIOD\t2020 \t2021 \n"
+        "A,NR,PL\t100 \t110 \n"
+        "A,NR,EU27_2020\t900 \t950 \n",
+        encoding="utf-8",
+    )
+    catalog = BulkDataCatalog(
+        tsv_path, str(env_path), cache_dir="", ev_filters={"freq": "A"},
+        ev_units={EV_COUNTS: "NR", EV_SHARE: "PC"}, env_filters={"unit": "NR"},
+    )
+    assert catalog.table(EV_SHARE)["OBS_VALUE"].tolist() == [0.5, 0.7]
+    env = catalog.table(ENV)
+    assert set(env["geo"]) == {"PL", "EU27_2020"}
+
+    repository = ExcelVehicleDataRepository(None, None, catalog=catalog)
+    assert repository.env_index.geos.tolist() == ["PL"]
+    assert repository.get_env_data("PL", 2021) == 110.0
+
+
+def test_snapshot_catalog_requires_parsers():
+    class Incomplete(SnapshotCatalog):
+        def _parse_ev(self) -> dict:
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete(cache_dir="")
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.indexed_store import GeoYearMatrix
+
+
+@pytest.fixture
+def matrix():
+    df = pd.DataFrame({
+        "geo": ["PL", "PL", "PL", "DE", "DE", "PL"],
+        "TIME_PERIOD": [2019, 2020, 2021, 2019, 2021, 2020],
+        "OBS_VALUE": [1.0, 2.0, 4.0, 10.0, np.nan, 99.0],
+    })
+    return GeoYearMatrix.from_long(df)
+
+
+def test_from_long_layout_and_first_duplicate_wins(matrix):
+    assert matrix.geos.tolist() == ["DE", "PL"]
+    assert matrix.years.tolist() == [2019, 2020, 2021]
+    assert matrix.get("PL", 2020) == 2.0
+    assert matrix.get("DE", 2021) is None
+    assert matrix.get("XX", 2020, default=0) == 0
+    assert "PL" in matrix and "XX" not in matrix
+    assert matrix.geo_codes(["PL", "XX", "DE"]).tolist() == [1, -1, 0]
+
+
+def test_range_aggregates_match_direct_computation(matrix):
+    np.testing.assert_array_equal(matrix.range_sum(2020, 2021), [0.0, 6.0])
+    np.testing.assert_array_equal(matrix.range_count(2019, 2021), [1, 3])
+    np.testing.assert_array_equal(matrix.range_mean(2020, 2021), [np.nan, 3.0])
+    np.testing.assert_array_equal(matrix.range_sum(rows=[1]), [7.0])
+    np.testing.assert_array_equal(matrix.range_sum(2030, 2040), [0.0, 0.0])
+
+
+def test_arrays_are_read_only(matrix):
+    with pytest.raises(ValueError):
+        matrix.values[0, 0] = 1.0
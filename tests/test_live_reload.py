@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+from core.state import AppState, DATA
+from data.live_reload import DataReloader, ReloadResult
+
+
+class _Service:
+    def __init__(self, repository):
+        self.repository = repository
+        self.state = AppState()
+
+    def set_repository(self, repository):
+        self.repository = repository
+        self.state.touch(DATA)
+
+
+class _Consumer:
+    def __init__(self, payload, fail_on=None):
+        self.payload = payload
+        self.fail_on = fail_on
+
+    def prepare_reload(self, repository, geometry=None):
+        return f"{repository.name}-payload"
+
+    def reload_payload(self):
+        return self.payload
+
+    def apply_reload(self, payload):
+        if payload == self.fail_on:
+            raise RuntimeError("zepsuty widok")
+        self.payload = payload
+
+
+def _repository(name):
+    catalog = SimpleNamespace(sources=lambda: {"ev": f"/tmp/{name}-ev", "env": f"/tmp/{name}-env"})
+    return SimpleNamespace(name=name, catalog=catalog)
+
+
+@pytest.fixture
+def reloader(qapp):
+    service = _Service(_repository("old"))
+    return DataReloader(service, debounce_ms=0)
+
+
+def test_reload_swaps_every_consumer(reloader):
+    first, second = _Consumer("old-payload"), _Consumer("old-payload")
+    for consumer in (first, second):
+        reloader.register(consumer)
+    new = _repository("new")
+    reloader._on_reloaded(ReloadResult(["ev"], new, None, [(first, "prepared")]))
+    assert reloader.service.repository is new
+    assert (first.payload, second.payload) == ("prepared", "new-payload")
+    assert reloader.service.state.version_of(DATA) == 1
+
+
+def test_failed_apply_restores_all_consumers(reloader):
+    first = _Consumer("old-payload")
+    second = _Consumer("old-payload", fail_on="new-payload")
+    for consumer in (first, second):
+        reloader.register(consumer)
+    failures = []
+    reloader.reloadFailed.connect(failures.append)
+    old = reloader.service.repository
+
+    reloader._on_reloaded(ReloadResult(["ev"], _repository("new"), None, []))
+    assert reloader.service.repository is old
+    assert (first.payload, second.payload) == ("old-payload", "old-payload")
+    assert reloader.service.state.version_of(DATA) == 0
+    assert failures == ["zepsuty widok"]
+
+
+def test_country_list_repopulates_and_keeps_selection(qapp):
+    from gui.country_list_widget.country_list_widget import CountryListWidget
+
+    service = SimpleNamespace(
+        countries=["PL", "DE", "FR"],
+        get_countries=lambda: list(service.countries),
+        get_country_names=lambda: {"PL": "Polska", "DE": "Niemcy", "FR": "Francja", "LV": "Łotwa"},
+        get_country_labels=lambda: {},
+    )
+    widget = CountryListWidget(service, filter_delay_ms=0)
+    widget.list_view.selectAll()
+    assert widget.get_selected_country_codes() == ["PL", "DE", "FR"]
+
+    service.countries = ["PL", "LV"]
+    widget.repopulate()
+    assert widget.model.codes == ["PL", "LV"]
+    assert widget.get_selected_country_codes() == ["PL"]
+    assert widget.model.search_index.search("lotwa") == [1]
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_BLOCK_WEBENGINE = """
+import sys
+for name in ("PyQt5.QtWebEngineCore", "PyQt5.QtWebEngineWidgets"):
+    sys.modules[name] = None
+import gui.map_view.map_page
+import gui.map_view.electric_vehicles_map_tab
+import gui.map_view.electric_vehicles_countries_tab
+"""
+
+
+def test_map_tabs_import_without_webengine():
+    # Backend "static" musi działać bez Chromium, więc import kart nie może go wymagać.
+    result = subprocess.run(
+        [sys.executable, "-c", _BLOCK_WEBENGINE], cwd=ROOT,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+class _Signal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+
+class _WebView:
+    def __init__(self):
+        self.loadFinished = _Signal()
+        self.loads = []
+        self.scripts = []
+
+    def load(self, url):
+        self.loads.append(url)
+
+    def page(self):
+        return self
+
+    def runJavaScript(self, script, *_callback):
+        self.scripts.append(script)
+
+
+def test_failed_load_reloads_page_on_next_frame(monkeypatch):
+    from gui.map_view import map_page
+    from gui.map_view.map_figure import MapFrame
+
+    class _Handler:
+        @classmethod
+        def instance(cls):
+            return cls()
+
+        def publish(self, name, html):
+            return f"evmap:/pages/{name}.html"
+
+    # Prawdziwy page_scheme wymaga QtWebEngine, którego może nie być.
+    monkeypatch.setitem(sys.modules, "gui.map_view.page_scheme", SimpleNamespace(MapPageSchemeHandler=_Handler))
+    monkeypatch.setattr(map_page.ChoroplethMapPage, "render_html", lambda self, frame: "<html></html>")
+    monkeypatch.setattr(map_page.ChoroplethMapPage, "update_script", lambda self, frame: frame.title)
+    model = type("Model", (), {"level": 2})()
+    view = _WebView()
+    page = map_page.ChoroplethMapPage(view, model, "Viridis", "")
+    frame = MapFrame(["PL"], [1.0], ["PL"], "", "pierwsza", [0, 1], [0, 1])
+
+    page.show(frame)
+    page.show(frame._replace(title="w kolejce"))
+    view.loadFinished.emit(False)
+    assert page._pending is None
+
+    page.show(frame._replace(title="druga"))
+    assert len(view.loads) == 2
+    view.loadFinished.emit(True)
+    page.show(frame._replace(title="trzecia"))
+    assert view.scripts == ["trzecia"]
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from data.nuts_hierarchy import NutsHierarchy
+
+CODES = [
+    "PL", "DE", "PL1", "PL2", "DE1", "PL11", "PL12", "PL21", "DE11",
+    "PL111", "PL112", "PL121", "PL211", "DE111", "DE112",
+]
+
+
+@pytest.fixture
+def hierarchy():
+    return NutsHierarchy(CODES, [len(code) - 2 for code in CODES], CODES)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "geo": ["PL", "DE", "PL11", "PL12", "PL1", "DE111", "DE112", "PL211", "PL211"],
+        "year": [2020] * 8 + [2021],
+        "value": [10, 20, 1, 2, 5, 7, 9, 3, 4],
+    })
+
+
+def _values(frame):
+    return {(geo, year): value for geo, year, value in frame[["geo", "year", "value"]].itertuples(index=False)}
+
+
+def test_ancestors(hierarchy):
+    nodes = hierarchy.nodes(["PL112", "DE11", "XX"])
+    assert hierarchy.codes[hierarchy.ancestor(nodes[:2], 1)].tolist() == ["PL1", "DE1"]
+    assert hierarchy.ancestor(nodes, 0)[2] == -1
+    assert hierarchy.available_levels() == [0, 1, 2, 3]
+
+
+def test_rollup_uses_disjoint_cover(hierarchy, df):
+    rolled = hierarchy.rollup(df, 0, how="sum")
+    # PL 2020: PL1 (5) ma już wartość, więc PL11 i PL12 się nie liczą; do tego PL211 (3).
+    assert _values(rolled) == {("PL", 2020): 8.0, ("PL", 2021): 4.0, ("DE", 2020): 16.0}
+    assert rolled.set_index(["geo", "year"]).loc[("PL", 2020), "source_level"] == 1
+
+
+def test_complete_prefers_own_then_rollup_then_parent(hierarchy, df):
+    level1 = _values(hierarchy.complete(df, 1, how="mean"))
+    assert level1 == {
+        ("PL1", 2020): 5.0, ("PL2", 2020): 3.0, ("PL2", 2021): 4.0, ("DE1", 2020): 8.0,
+    }
+
+    level3 = hierarchy.complete(df, 3)
+    values = _values(level3)
+    assert values[("PL111", 2020)] == 1.0
+    assert values[("PL112", 2020)] == 1.0
+    assert values[("PL121", 2020)] == 2.0
+    assert values[("PL211", 2021)] == 4.0
+    assert (values[("DE111", 2020)], values[("DE112", 2020)]) == (7.0, 9.0)
+    sources = level3.set_index(["geo", "year"])["source_level"]
+    assert sources[("PL112", 2020)] == 2
+    assert sources[("PL211", 2020)] == 3
+
+
+def test_fill_down_takes_nearest_ancestor(hierarchy, df):
+    filled = _values(hierarchy.fill_down(df, 2))
+    assert filled[("PL11", 2020)] == 5.0
+    assert filled[("PL21", 2020)] == 10.0
+    assert filled[("DE11", 2020)] == 20.0
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from data.data_service import VehicleDataService
+from data.indexed_store import GeoYearMatrix
+from data.query_cache import QueryCache, estimate_size
+
+
+def _counter():
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    return calls, compute
+
+
+def test_hit_and_miss_counters():
+    cache = QueryCache(max_entries=4)
+    calls, compute = _counter()
+    assert cache.get_or_compute("a", lambda: compute(1)) == 1
+    assert cache.get_or_compute("a", lambda: compute(2)) == 1
+    assert calls == [1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction_by_entry_count():
+    cache = QueryCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.evictions == 1
+    calls, compute = _counter()
+    cache.get_or_compute("a", lambda: compute("a"))
+    cache.get_or_compute("b", lambda: compute("b"))
+    # "b" był najdawniej używany, więc to on wypadł.
+    assert calls == ["b"]
+
+
+def test_eviction_by_bytes_and_oversized_values():
+    block = np.zeros(100)
+    cache = QueryCache(max_entries=10, max_bytes=2 * estimate_size(block))
+    for key in "abc":
+        cache.get_or_compute(key, lambda: np.zeros(100))
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 1
+    cache.get_or_compute("big", lambda: np.zeros(1000))
+    assert "big" not in cache._entries
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_data_version_change_invalidates():
+    cache = QueryCache()
+    cache.get_or_compute("a", lambda: 1, data_version=1)
+    assert cache.get_or_compute("a", lambda: 2, data_version=2) == 2
+    assert cache.invalidations == 1
+    assert cache.get_or_compute("a", lambda: 3, data_version=2) == 2
+
+
+def test_service_query_shares_cache_across_geo_order(qapp):
+    index = GeoYearMatrix.from_long(pd.DataFrame({
+        "geo": ["PL", "PL", "DE"],
+        "TIME_PERIOD": [2020, 2021, 2021],
+        "OBS_VALUE": [1.0, 2.0, 5.0],
+    }))
+    service = VehicleDataService(SimpleNamespace(ev_index=index))
+    first = service.query(["PL", "DE", "XX"], mode="TOTAL", year=2021)
+    second = service.query(["XX", "PL", "DE", "PL"], mode="TOTAL", year=2021)
+    assert first.codes.tolist() == ["PL", "DE", "XX"]
+    np.testing.assert_array_equal(first.values, [2.0, 5.0, np.nan])
+    assert second.codes.tolist() == ["XX", "PL", "DE", "PL"]
+    assert second.mask.tolist() == [False, True, True, True]
+    assert service.cache_stats()["hits"] == 1
+
+    ev = service.query(["DE", "PL"], mode="EV", year=2021)
+    np.testing.assert_array_equal(ev.values, [5.0, 3.0])
+    assert service.cache_stats()["misses"] == 2
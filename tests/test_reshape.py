@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from data.reshape import parse_cells, wide_to_long
+
+
+def _raw():
+    return pd.DataFrame({
+        "geo": [" PL", "DE "],
+        "name": ["Polska", "Niemcy"],
+        "2020": [1.0, "2 345 p"],
+        "Unnamed: 3": ["e", None],
+        "2021": [":", "7"],
+    })
+
+
+def test_parse_cells_splits_numbers_and_flags():
+    values, flags = parse_cells(pd.Series(["12", "1,5 e", ":", "3 b", None, 4.0, "1,234,5"]))
+    np.testing.assert_array_equal(values.to_numpy(), [12.0, 1.5, np.nan, 3.0, np.nan, 4.0, np.nan])
+    assert flags.fillna("").tolist() == ["", "e", ":", "b", "", "", ""]
+
+
+def test_wide_to_long_drops_missing_and_reads_side_flags():
+    long = wide_to_long(_raw(), ["geo", "name"])
+    assert list(long.columns) == ["geo", "name", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
+    assert list(zip(long["geo"], long["TIME_PERIOD"])) == [("PL", 2020), ("DE", 2020), ("DE", 2021)]
+    assert long["OBS_VALUE"].tolist() == [1.0, 2345.0, 7.0]
+    # Flaga z kolumny "Unnamed" obok roku uzupełnia komórki bez własnej flagi.
+    assert long["OBS_FLAG"].tolist() == ["e", "p", ""]
+
+
+def test_wide_to_long_keep_missing():
+    long = wide_to_long(_raw(), ["geo", "name"], keep_missing=True)
+    assert len(long) == 4
+    missing = long[long["OBS_VALUE"].isna()]
+    assert missing[["geo", "TIME_PERIOD", "OBS_FLAG"]].values.tolist() == [["PL", 2021, ":"]]
@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from core.scheduler import CancelToken, RenderCancelled, RenderScheduler
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Przekroczono czas oczekiwania")
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler(qapp):
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield RenderScheduler(delay_ms=20, executor=executor)
+    executor.shutdown(wait=True)
+
+
+def test_cancel_token():
+    token = CancelToken()
+    token.check()
+    token.cancel()
+    with pytest.raises(RenderCancelled):
+        token.check()
+
+
+def test_debounce_coalesces_bursts(scheduler):
+    computed, applied = [], []
+    for value in range(5):
+        scheduler.schedule(
+            "view", lambda token, value=value: computed.append(value) or value, applied.append
+        )
+    _wait_for(lambda: applied)
+    time.sleep(0.05)
+    QCoreApplication.processEvents()
+    assert computed == [4]
+    assert applied == [4]
+
+
+def test_stale_result_is_dropped_after_reschedule(scheduler):
+    started, release = threading.Event(), threading.Event()
+    seen_tokens, applied = [], []
+
+    def slow(token):
+        seen_tokens.append(token)
+        started.set()
+        release.wait(5)
+        return "stary"
+
+    scheduler.schedule("view", slow, applied.append)
+    _wait_for(started.is_set)
+    scheduler.schedule("view", lambda token: "nowy", applied.append)
+    assert seen_tokens[0].cancelled
+    release.set()
+    _wait_for(lambda: applied)
+    time.sleep(0.05)
+    QCoreApplication.processEvents()
+    assert applied == ["nowy"]
+
+
+def test_cancel_drops_pending_job(scheduler):
+    applied = []
+    scheduler.schedule("view", lambda token: 1, applied.append)
+    scheduler.cancel("view")
+    time.sleep(0.06)
+    QCoreApplication.processEvents()
+    assert applied == []
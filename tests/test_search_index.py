@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+from PyQt5.QtCore import QItemSelectionModel
+from gui.country_list_widget.search_index import SearchIndex, normalize_text
+
+DOCUMENTS = [
+    ("LV", "Łotwa", "Latvia"),
+    ("PL", "Polska", "Poland"),
+    ("DE", "Niemcy", "Germany"),
+    ("CZ", "Czechy", "Czechia"),
+]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(DOCUMENTS)
+
+
+def test_normalize_folds_diacritics_and_punctuation():
+    assert normalize_text("Łotwa") == "lotwa"
+    assert normalize_text("Österreich – Ąę") == "osterreich ae"
+
+
+def test_diacritics_match_both_ways(index):
+    assert index.search("lotwa") == [0]
+    assert index.search("ŁOT") == [0]
+
+
+def test_short_terms_match_word_prefixes(index):
+    assert index.search("cz") == [3]
+    assert index.search("po") == [1]
+    # Krótki fragment w środku słowa nie wystarcza.
+    assert index.search("ls") == []
+
+
+def test_longer_terms_match_anywhere_via_trigrams(index):
+    assert index.search("lska") == [1]
+    assert index.search("many") == [2]
+    assert index.search("xyz") == []
+
+
+def test_all_terms_must_match(index):
+    assert index.search("pol land") == [1]
+    assert index.search("niem land") == []
+    assert index.search("  ") == [0, 1, 2, 3]
+
+
+def test_selection_survives_filter_reset(qapp):
+    from gui.country_list_widget.country_list_widget import CountryListWidget
+
+    service = SimpleNamespace(
+        get_countries=lambda: ["LV", "PL", "DE"],
+        get_country_names=lambda: {"LV": "Łotwa", "PL": "Polska", "DE": "Niemcy"},
+        get_country_labels=lambda: {},
+    )
+    widget = CountryListWidget(service, filter_delay_ms=0)
+    widget.list_view.selectionModel().select(widget.model.index(1), QItemSelectionModel.Select)
+    assert widget.get_selected_country_codes() == ["PL"]
+
+    widget.filter_list("lotwa")
+    assert [widget.model.code_at(row) for row in range(widget.model.rowCount())] == ["LV"]
+    widget.filter_list("")
+    selected = [widget.model.code_at(index.row()) for index in widget.list_view.selectionModel().selectedIndexes()]
+    assert selected == ["PL"]
+    assert widget.get_selected_country_codes() == ["PL"]
@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from data.snapshot import SnapshotCache
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.xlsx"
+    path.write_bytes(b"pierwsza wersja")
+    return path
+
+
+@pytest.fixture
+def tables():
+    return {
+        "ev": pd.DataFrame({
+            "geo": ["PL", "DE"],
+            "TIME_PERIOD": np.array([2020, 2021], dtype=np.int64),
+            "OBS_VALUE": [1.5, np.nan],
+            "OBS_FLAG": ["e", ""],
+        }),
+    }
+
+
+def _memmap_base(array):
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array
+
+
+def test_key_follows_source_fingerprint(tmp_path, source):
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    key = cache.make_key("catalog_ev", [str(source)])
+    assert key == cache.make_key("catalog_ev", [str(source)])
+    assert key.startswith("catalog_ev-")
+
+    source.write_bytes(b"druga wersja")
+    assert cache.make_key("catalog_ev", [str(source)]) != key
+
+
+def test_round_trip_maps_numeric_columns(tmp_path, source, tables):
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    key = cache.make_key("catalog_ev", [str(source)])
+    assert cache.load(key) is None
+
+    cache.store(key, tables, extra={"name_to_code": {"Poland": "PL"}})
+    loaded, extra = cache.load(key)
+    frame = loaded["ev"]
+    assert extra == {"name_to_code": {"Poland": "PL"}}
+    assert list(frame.columns) == list(tables["ev"].columns)
+    pd.testing.assert_frame_equal(frame, tables["ev"], check_dtype=False)
+    for column in ("TIME_PERIOD", "OBS_VALUE"):
+        assert _memmap_base(frame[column].to_numpy()) is not None
+
+
+def test_changed_source_invalidates_and_prunes(tmp_path, source, tables):
+    cache_dir = tmp_path / "cache"
+    cache = SnapshotCache(str(cache_dir))
+    old_key = cache.make_key("catalog_ev", [str(source)])
+    cache.store(old_key, tables)
+
+    source.write_bytes(b"druga wersja")
+    new_key = cache.make_key("catalog_ev", [str(source)])
+    assert cache.load(new_key) is None
+    cache.store(new_key, tables)
+    assert sorted(os.listdir(cache_dir)) == [new_key]
+
+
+def test_version_mismatch_is_ignored(tmp_path, source, tables):
+    cache = SnapshotCache(str(tmp_path / "cache"))
+    key = cache.make_key("catalog_ev", [str(source)])
+    cache.store(key, tables)
+    meta_path = tmp_path / "cache" / key / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["version"] = -1
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    assert cache.load(key) is None
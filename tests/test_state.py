@@ -0,0 +1,58 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from core.state import AppState, DATA, MODE, YEAR
+
+
+def test_batch_commits_once_with_a_single_version(qapp):
+    state = AppState(year=2020, mode="TOTAL")
+    with state.batch():
+        state.set(YEAR, 2021)
+        state.set(MODE, "EV")
+    assert state.version == 1
+    assert state.versions([YEAR, MODE]) == (1, 1)
+    state.set(YEAR, 2021)
+    assert state.version == 1
+
+
+def test_batch_rolls_back_on_exception(qapp):
+    state = AppState(year=2020)
+    with pytest.raises(RuntimeError):
+        with state.batch():
+            state.set(YEAR, 2021)
+            state.set(MODE, "EV")
+            raise RuntimeError("przerwane")
+    assert state.snapshot() == {YEAR: 2020}
+    assert state.version == 0
+
+
+def test_touch_bumps_version_without_value(qapp):
+    state = AppState()
+    state.touch(DATA)
+    assert state.version_of(DATA) == 1
+    assert DATA not in state.snapshot()
+
+
+def test_flush_refreshes_only_stale_bindings(qapp):
+    state = AppState(year=2020, mode="TOTAL")
+    calls = []
+    state.bind([YEAR], lambda: calls.append("year"))
+    state.bind([MODE], lambda: calls.append("mode"))
+    emitted = []
+    state.changed.connect(emitted.append)
+
+    state.set(YEAR, 2021)
+    state.set(YEAR, 2022)
+    assert calls == []
+    QCoreApplication.processEvents()
+    assert calls == ["year"]
+    assert emitted == [frozenset({YEAR})]
+
+
+def test_unbound_binding_is_not_refreshed(qapp):
+    state = AppState(year=2020)
+    calls = []
+    binding = state.bind([YEAR], lambda: calls.append(state.get(YEAR)))
+    binding.dispose()
+    state.set(YEAR, 2021)
+    state.flush()
+    assert calls == []
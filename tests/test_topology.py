@@ -0,0 +1,84 @@
+from collections import Counter
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, box
+from data.topology import OBJECT_NAME, encode_topology
+
+
+def _decode(topology):
+    # Odpowiednik topologyFeatures z gui/map_view/topology.js.
+    scale = np.array(topology["transform"]["scale"])
+    translate = np.array(topology["transform"]["translate"])
+    arcs = [np.cumsum(np.array(arc), axis=0) * scale + translate for arc in topology["arcs"]]
+
+    def ring(indices):
+        points = []
+        for index in indices:
+            arc = arcs[~index][::-1] if index < 0 else arcs[index]
+            points.extend(arc[1:] if points else arc)
+        return points
+
+    def polygon(rings):
+        return Polygon(ring(rings[0]), [ring(r) for r in rings[1:]])
+
+    shapes = {}
+    for geometry in topology["objects"][OBJECT_NAME]["geometries"]:
+        geo = geometry["properties"]["geo"]
+        if geometry["type"] == "Polygon":
+            shapes[geo] = polygon(geometry["arcs"])
+        elif geometry["type"] == "MultiPolygon":
+            shapes[geo] = MultiPolygon([polygon(p) for p in geometry["arcs"]])
+        else:
+            shapes[geo] = None
+    return shapes
+
+
+def _regions():
+    ids, geometries = [], []
+    for i in range(3):
+        for j in range(3):
+            ids.append(f"R{i}{j}")
+            geometries.append(box(i, j, i + 1, j + 1))
+    ids.append("HOLE")
+    geometries.append(Polygon(box(4, 0, 6, 2).exterior.coords, [box(4.5, 0.5, 5.5, 1.5).exterior.coords]))
+    ids.append("ISLANDS")
+    geometries.append(MultiPolygon([box(4.5, 0.5, 5.5, 1.5), box(4, 2.5, 5, 3)]))
+    return ids, geometries
+
+
+def test_round_trip_preserves_ids_and_areas():
+    ids, geometries = _regions()
+    decoded = _decode(encode_topology(ids, geometries))
+    assert list(decoded) == ids
+    for geo, original in zip(ids, geometries):
+        shape = decoded[geo]
+        assert shapely.is_valid(shape)
+        assert shape.geom_type == original.geom_type
+        assert np.isclose(shape.area, original.area, rtol=1e-3)
+        assert shapely.symmetric_difference(shape, original).area < 1e-3 * original.area
+
+
+def test_shared_borders_are_stored_once():
+    ids, geometries = _regions()
+    topology = encode_topology(ids, geometries)
+
+    def rings(arcs, depth):
+        return [arcs] if depth == 0 else [r for part in arcs for r in rings(part, depth - 1)]
+
+    uses = Counter()
+    for geometry in topology["objects"][OBJECT_NAME]["geometries"]:
+        depth = 1 if geometry["type"] == "Polygon" else 2
+        for ring in rings(geometry["arcs"], depth):
+            uses.update(~index if index < 0 else index for index in ring)
+    assert set(uses) == set(range(len(topology["arcs"])))
+    # 12 wewnętrznych krawędzi siatki 3x3 i brzeg otworu wspólny z wyspą.
+    assert max(uses.values()) == 2
+    assert sum(count == 2 for count in uses.values()) == 13
+
+
+def test_empty_geometry_keeps_its_slot():
+    topology = encode_topology(["A", "EMPTY"], [box(0, 0, 1, 1), Polygon()])
+    geometries = topology["objects"][OBJECT_NAME]["geometries"]
+    assert [g["properties"]["geo"] for g in geometries] == ["A", "EMPTY"]
+    assert geometries[1]["type"] is None